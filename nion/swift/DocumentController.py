@@ -1,6 +1,8 @@
 from __future__ import annotations
 
 # standard libraries
+import collections
+import concurrent.futures
 import copy
 import functools
 import gettext
@@ -72,6 +74,11 @@ _Processing3Fn = typing.Callable[[DisplayItem.DisplayItem, DataItem.DataItem, Di
 
 _ = gettext.gettext
 
+# when receiving files in the background, files are read on up to IMPORT_WORKER_COUNT threads and the imported data
+# items are inserted into the document IMPORT_BATCH_SIZE at a time.
+IMPORT_WORKER_COUNT = min(4, os.cpu_count() or 1)
+IMPORT_BATCH_SIZE = 32
+
 
 def is_graphic_valid_crop_for_data_item(data_item: typing.Optional[DataItem.DataItem], graphic: typing.Optional[Graphics.Graphic]) -> bool:
     if data_item and graphic:
@@ -144,6 +151,8 @@ class DocumentController(Window.Window):
         self.__tool_mode = "pointer"
         self.__weak_periodic_listeners: typing.List[_PeriodicListenerWeakRef] = list()
         self.__weak_periodic_listeners_mutex = threading.RLock()
+        self.__cancellable_task_threads: typing.List[typing.Tuple[Task.Task, threading.Thread]] = list()
+        self.__cancellable_task_threads_lock = threading.RLock()
 
         self.selection = Selection.IndexedSelection()
         self.selection.expanded_changed_event = True
@@ -225,6 +234,13 @@ class DocumentController(Window.Window):
         assert self.__closed == False
         self.__closed = True
         self._finish_periodic()  # required to finish periodic operations during tests
+        # cancel cancellable tasks and wait for them to finish, since they use the document model.
+        with self.__cancellable_task_threads_lock:
+            cancellable_task_threads = list(self.__cancellable_task_threads)
+        for task, thread in cancellable_task_threads:
+            task.request_cancel()
+        for task, thread in cancellable_task_threads:
+            thread.join()
         # dialogs
         self._close_dialogs()
         if self.__workspace_controller:
@@ -371,7 +387,7 @@ class DocumentController(Window.Window):
                     traceback.print_stack()
                 periodic_listener.next_scheduled_time = current_time + periodic_listener.interval
         super().periodic()
-        self.document_model.perform_data_item_updates()
+        self.document_model.perform_data_item_updates(DocumentModel.DocumentModel.data_item_updates_time_budget)
         if self.workspace_controller:
             self.workspace_controller.periodic()
         if self.__last_activity is not None and time.time() - self.__last_activity > 60 * 60:
@@ -814,12 +830,38 @@ class DocumentController(Window.Window):
                 fp.write(svg)
 
     # this method creates a task. it is thread safe.
-    def create_task_context_manager(self, title: str, task_type: str, logging: bool = True) -> Task.TaskContextManager:
-        task = Task.Task(title, task_type)  # NOTE: currently, tasks don't get deleted since they are displayed until exit.
+    def create_task_context_manager(self, title: str, task_type: str, logging: bool = True, *, is_cancellable: bool = False) -> Task.TaskContextManager:
+        task = Task.Task(title, task_type, is_cancellable=is_cancellable)  # NOTE: currently, tasks don't get deleted since they are displayed until exit.
         task_context_manager = Task.TaskContextManager(self, task, logging)
         self.task_created_event.fire(task)
         return task_context_manager
 
+    def start_cancellable_task(self, title: str, task_type: str, fn: typing.Callable[[Task.TaskContextManager], None]) -> None:
+        """Create a cancellable task and call fn with its task context manager on a thread.
+
+        Closing the document controller requests cancelling the task and waits for fn to return, so fn should check
+        is_cancel_requested regularly.
+        """
+        task = Task.Task(title, task_type, is_cancellable=True)
+        task_context_manager = Task.TaskContextManager(self, task, True)
+        self.task_created_event.fire(task)
+
+        def run_task() -> None:
+            try:
+                with task_context_manager:
+                    fn(task_context_manager)
+            except Exception:
+                import traceback
+                traceback.print_exc()
+            finally:
+                with self.__cancellable_task_threads_lock:
+                    self.__cancellable_task_threads.remove((task, thread))
+
+        thread = threading.Thread(target=run_task)
+        with self.__cancellable_task_threads_lock:
+            self.__cancellable_task_threads.append((task, thread))
+        thread.start()
+
     def open_preferences(self) -> None:
         if not self.is_dialog_type_open(PreferencesDialog.PreferencesDialog) and self.app:
             preferences_dialog = PreferencesDialog.PreferencesDialog(self.ui, self.app)
@@ -983,8 +1025,9 @@ class DocumentController(Window.Window):
         return DocumentController.InsertDataGroupDisplayItemsCommand(self.document_model, data_group, before_index, display_items)
 
     class InsertDataGroupDataItemsCommand(Undo.UndoableCommand):
-        def __init__(self, document_controller: DocumentController, data_group: DataGroup.DataGroup, data_items: typing.Sequence[DataItem.DataItem], index: int) -> None:
-            super().__init__("Insert Data Items")
+        def __init__(self, document_controller: DocumentController, data_group: DataGroup.DataGroup, data_items: typing.Sequence[DataItem.DataItem], index: int, *,
+                     command_id: typing.Optional[str] = None) -> None:
+            super().__init__("Insert Data Items", command_id=command_id, is_mergeable=command_id is not None)
             self.__document_controller = document_controller
             self.__data_group_proxy = data_group.create_proxy()
             self.__data_group_indexes: typing.List[int] = list()
@@ -1026,9 +1069,9 @@ class DocumentController(Window.Window):
             display_items: typing.List[DisplayItem.DisplayItem] = list()
             for data_item in self.__data_items:
                 document_model.append_data_item(data_item)
-                self.__display_item_indexes.append(len(document_model.display_items))
                 maybe_display_item = document_model.get_display_item_for_data_item(data_item)
                 if maybe_display_item:
+                    self.__display_item_indexes.append(document_model.display_items.index(maybe_display_item))
                     display_items.append(maybe_display_item)
             for display_item in display_items:
                 if not display_item in data_group.display_items:
@@ -1064,6 +1107,17 @@ class DocumentController(Window.Window):
                 if display_item and not display_item in data_group.display_items:
                     data_group.insert_display_item(index, display_item)
 
+        def can_merge(self, command: Undo.UndoableCommand) -> bool:
+            return isinstance(command, DocumentController.InsertDataGroupDataItemsCommand) and bool(self.command_id) and self.command_id == command.command_id
+
+        def _merge(self, command: Undo.UndoableCommand) -> None:
+            # take over the items inserted by the command being merged; its proxies are now owned by this command.
+            assert isinstance(command, DocumentController.InsertDataGroupDataItemsCommand)
+            self.__data_group_indexes.extend(command.__data_group_indexes)
+            self.__data_group_display_item_proxies.extend(command.__data_group_display_item_proxies)
+            command.__data_group_display_item_proxies.clear()
+            self.__display_item_indexes.extend(command.__display_item_indexes)
+
     class RemoveDataGroupDisplayItemsCommand(Undo.UndoableCommand):
         def __init__(self, document_model: DocumentModel.DocumentModel, data_group: DataGroup.DataGroup, display_items: typing.Sequence[DisplayItem.DisplayItem]) -> None:
             super().__init__("Remove Data Item")
@@ -2240,8 +2294,8 @@ class DocumentController(Window.Window):
 
         def __init__(self, document_controller: DocumentController, data_items: typing.Sequence[DataItem.DataItem],
                      index: int, display_panel: typing.Optional[DisplayPanel.DisplayPanel] = None, *,
-                     project: typing.Optional[Project.Project] = None) -> None:
-            super().__init__(_("Insert Data Items"))
+                     project: typing.Optional[Project.Project] = None, command_id: typing.Optional[str] = None) -> None:
+            super().__init__(_("Insert Data Items"), command_id=command_id, is_mergeable=command_id is not None)
             self.__document_controller = document_controller
             workspace_controller = self.__document_controller.workspace_controller
             self.__old_workspace_layout: typing.Optional[Persistence.PersistentDictType] = workspace_controller.deconstruct() if workspace_controller else None
@@ -2307,6 +2361,14 @@ class DocumentController(Window.Window):
             assert self.__old_workspace_layout is not None
             workspace_controller.reconstruct(self.__old_workspace_layout)
 
+        def can_merge(self, command: Undo.UndoableCommand) -> bool:
+            return isinstance(command, DocumentController.InsertDataItemsCommand) and bool(self.command_id) and self.command_id == command.command_id
+
+        def _merge(self, command: Undo.UndoableCommand) -> None:
+            # the workspace layout before the first insertion is kept; the layout after is recorded when undone.
+            assert isinstance(command, DocumentController.InsertDataItemsCommand)
+            self.__data_item_indexes.extend(command.__data_item_indexes)
+
     def receive_project_files(self, file_paths: typing.Sequence[pathlib.Path], project: Project.Project, index: int = -1, threaded: bool = True) -> None:
         def receive_files_complete(received_data_items: typing.Sequence[DataItem.DataItem]) -> None:
             def select_library_all() -> None:
@@ -2341,31 +2403,58 @@ class DocumentController(Window.Window):
                         project: typing.Optional[Project.Project] = None) -> typing.Optional[typing.Sequence[DataItem.DataItem]]:
         assert index is not None
 
-        # this function will be called on a thread to receive files in the background.
+        # this function will be called on a thread to receive files in the background. files are read on a bounded
+        # pool of worker threads. if batch_fn is specified, it is called with each batch of data items as it is read
+        # and whether it is the last batch.
         def receive_files_on_thread(file_paths: typing.Sequence[pathlib.Path],
                                     data_group: typing.Optional[DataGroup.DataGroup], index: int,
-                                    completion_fn: typing.Optional[typing.Callable[[typing.Sequence[DataItem.DataItem]], None]]) -> typing.Sequence[DataItem.DataItem]:
+                                    completion_fn: typing.Optional[typing.Callable[[typing.Sequence[DataItem.DataItem]], None]],
+                                    batch_fn: typing.Optional[typing.Callable[[typing.Sequence[DataItem.DataItem], bool], None]] = None) -> typing.Sequence[DataItem.DataItem]:
 
             received_data_items: typing.List[DataItem.DataItem] = list()
 
+            def read_file(file_path: pathlib.Path) -> typing.Sequence[DataItem.DataItem]:
+                try:
+                    return ImportExportManager.ImportExportManager().read_data_items(file_path) or list()
+                except Exception as e:
+                    logging.debug(f"Could not read image {file_path} / {e}")
+                    traceback.print_exc()
+                    traceback.print_stack()
+                return list()
+
             with self.create_task_context_manager(_("Import Data Items"), "table", logging=threaded) as task:
                 task.update_progress(_("Starting import."), (0, len(file_paths)))
                 task_data: typing.Dict[str, typing.Any] = {"headers": ["Number", "File"]}
 
-                for file_index, file_path in enumerate(file_paths):
+                batch: typing.List[DataItem.DataItem] = list()
+
+                def receive_file(file_index: int, file_path: pathlib.Path, data_items: typing.Sequence[DataItem.DataItem]) -> None:
+                    nonlocal batch
                     data: typing.List[typing.List[str]] = task_data.setdefault("data", list())
-                    file_name = file_path.name
-                    task_data_entry = [str(file_index + 1), file_name]
-                    data.append(task_data_entry)
+                    data.append([str(file_index + 1), file_path.name])
                     task.update_progress(_("Importing item {}.").format(file_index + 1), (file_index + 1, len(file_paths)), task_data)
-                    try:
-                        data_items = ImportExportManager.ImportExportManager().read_data_items(file_path)
-                        if data_items:
-                            received_data_items.extend(data_items)
-                    except Exception as e:
-                        logging.debug(f"Could not read image {file_path} / {e}")
-                        traceback.print_exc()
-                        traceback.print_stack()
+                    received_data_items.extend(data_items)
+                    # a full batch is held until more items arrive so that the last batch can be identified.
+                    if batch_fn and data_items and len(batch) >= IMPORT_BATCH_SIZE:
+                        batch_fn(batch, False)
+                        batch = list()
+                    batch.extend(data_items)
+
+                # only read a limited number of files ahead of the ones received so that the data of every file is
+                # not held in memory at once; files are received in order.
+                pending: typing.Deque[typing.Tuple[int, pathlib.Path, concurrent.futures.Future[typing.Sequence[DataItem.DataItem]]]] = collections.deque()
+                with concurrent.futures.ThreadPoolExecutor(max_workers=IMPORT_WORKER_COUNT) as executor:
+                    for file_index, file_path in enumerate(file_paths):
+                        pending.append((file_index, file_path, executor.submit(read_file, file_path)))
+                        if len(pending) >= IMPORT_WORKER_COUNT * 2:
+                            pending_file_index, pending_file_path, future = pending.popleft()
+                            receive_file(pending_file_index, pending_file_path, future.result())
+                    while pending:
+                        pending_file_index, pending_file_path, future = pending.popleft()
+                        receive_file(pending_file_index, pending_file_path, future.result())
+
+                if batch_fn and batch:
+                    batch_fn(batch, True)
 
                 task.update_progress(_("Finishing importing."), (len(file_paths), len(file_paths)))
 
@@ -2374,25 +2463,46 @@ class DocumentController(Window.Window):
 
                 return received_data_items
 
-        def receive_files_complete(index: int, data_items: typing.Sequence[DataItem.DataItem]) -> None:
+        def insert_data_items(index: int, data_items: typing.Sequence[DataItem.DataItem],
+                              display_panel: typing.Optional[DisplayPanel.DisplayPanel] = None,
+                              command_id: typing.Optional[str] = None) -> None:
             command: Undo.UndoableCommand
             if data_group and isinstance(data_group, DataGroup.DataGroup):
-                command = DocumentController.InsertDataGroupDataItemsCommand(self, data_group, data_items, index)
+                command = DocumentController.InsertDataGroupDataItemsCommand(self, data_group, data_items, index, command_id=command_id)
                 command.perform()
                 self.push_undo_command(command)
             else:
                 index = index if index >= 0 else len(self.document_model.data_items)
-                command = DocumentController.InsertDataItemsCommand(self, data_items, index, display_panel, project=project)
+                command = DocumentController.InsertDataItemsCommand(self, data_items, index, display_panel, project=project, command_id=command_id)
                 command.perform()
                 self.push_undo_command(command)
+
+        def receive_files_complete(index: int, data_items: typing.Sequence[DataItem.DataItem]) -> None:
+            insert_data_items(index, data_items, display_panel)
             if callable(completion_fn):
                 completion_fn(data_items)
 
         if threaded:
-            def threaded_receive_files_complete(index: int, data_items: typing.Sequence[DataItem.DataItem]) -> None:
-                self.queue_task(functools.partial(receive_files_complete, index, data_items))
-
-            threading.Thread(target=receive_files_on_thread, args=(file_paths, data_group, index, functools.partial(threaded_receive_files_complete, index))).start()
+            # batches are inserted on the main thread as they arrive. the insertion index follows the previous batch.
+            # the batches share a command id so that they merge into a single undo command. the display panel is
+            # only passed with the last batch so that it is set once, to the last item.
+            insert_index = index
+            insert_command_id = f"insert_data_items_{uuid.uuid4()}"
+
+            def insert_batch(data_items: typing.Sequence[DataItem.DataItem], is_last_batch: bool) -> None:
+                nonlocal insert_index
+                insert_data_items(insert_index, data_items, display_panel if is_last_batch else None, insert_command_id)
+                if insert_index >= 0:
+                    insert_index += len(data_items)
+
+            def threaded_receive_batch(data_items: typing.Sequence[DataItem.DataItem], is_last_batch: bool) -> None:
+                self.queue_task(functools.partial(insert_batch, list(data_items), is_last_batch))
+
+            def threaded_receive_files_complete(data_items: typing.Sequence[DataItem.DataItem]) -> None:
+                if callable(completion_fn):
+                    self.queue_task(functools.partial(completion_fn, data_items))
+
+            threading.Thread(target=receive_files_on_thread, args=(file_paths, data_group, index, threaded_receive_files_complete, threaded_receive_batch)).start()
             return None
         else:
             return receive_files_on_thread(file_paths, data_group, index, functools.partial(receive_files_complete, index))
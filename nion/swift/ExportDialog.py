@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 # standard libraries
+import concurrent.futures
 import functools
 import gettext
 import logging
@@ -16,16 +17,68 @@ import unicodedata
 # None
 
 # local libraries
+from nion.swift import Task
 from nion.swift.model import ImportExportManager
 from nion.ui import Dialog
 from nion.ui import UserInterface
 from nion.ui import Window
 
 if typing.TYPE_CHECKING:
+    from nion.swift import DocumentController
     from nion.swift.model import DisplayItem
 
 _ = gettext.gettext
 
+# the number of display items written concurrently during an export.
+EXPORT_WORKER_COUNT = min(4, os.cpu_count() or 1)
+
+
+def export_display_items(document_controller: DocumentController.DocumentController,
+                         writer: ImportExportManager.ImportExportHandler,
+                         display_item_paths: typing.Sequence[typing.Tuple[DisplayItem.DisplayItem, pathlib.Path]],
+                         threaded: bool = True) -> None:
+    """Write the display items to their paths using the writer.
+
+    The files are written on a pool of worker threads and the progress is reported as a cancellable task of the
+    document controller. Cancelling finishes the files being written and skips the remaining display items. If threaded
+    is False, this function returns once the export is finished. Otherwise, the export runs as a task of the document
+    controller, which cancels it and waits for it when closing.
+    """
+
+    def write_display_item(task: Task.TaskContextManager, display_item: DisplayItem.DisplayItem, path: pathlib.Path) -> str:
+        if task.is_cancel_requested:
+            return _("Cancelled")
+        try:
+            if ImportExportManager.ImportExportManager().write_display_item_with_writer(writer, display_item, path):
+                return _("Exported")
+            return _("Skipped")
+        except Exception as e:
+            logging.debug("Could not export image %s / %s", str(display_item), str(e))
+            traceback.print_exc()
+            return _("Failed")
+
+    def export_files(task: Task.TaskContextManager) -> None:
+        count = len(display_item_paths)
+        task_data: typing.Dict[str, typing.Any] = {"headers": ["Number", "File", "Status"], "data": list()}
+        task.update_progress(_("Starting export."), (0, count), task_data)
+        finished_count = 0
+        with concurrent.futures.ThreadPoolExecutor(max_workers=EXPORT_WORKER_COUNT) as executor:
+            futures = {executor.submit(write_display_item, task, display_item, path): path for display_item, path in display_item_paths}
+            for future in concurrent.futures.as_completed(futures):
+                finished_count += 1
+                task_data["data"].append([str(finished_count), futures[future].name, future.result()])
+                task.update_progress(_("Exported {0} of {1}.").format(finished_count, count), (finished_count, count), task_data)
+        if task.is_cancel_requested:
+            task.update_progress(_("Export cancelled."), (count, count), task_data)
+        else:
+            task.update_progress(_("Finished export."), (count, count), task_data)
+
+    if threaded:
+        document_controller.start_cancellable_task(_("Export Data Items"), "table", export_files)
+    else:
+        with document_controller.create_task_context_manager(_("Export Data Items"), "table", logging=False, is_cancellable=True) as task:
+            export_files(task)
+
 
 class ExportDialog(Dialog.OkCancelDialog):
     def __init__(self, ui: UserInterface.UserInterface, parent_window: Window.Window):
@@ -160,6 +213,8 @@ class ExportDialog(Dialog.OkCancelDialog):
         directory = self.directory
         writer = self.writer
         if directory and writer:
+            # build the paths here since the dialog widgets are only valid until the dialog closes.
+            display_item_paths: typing.List[typing.Tuple[DisplayItem.DisplayItem, pathlib.Path]] = list()
             for index, display_item in enumerate(display_items):
                 data_item = display_item.data_item
                 if data_item:
@@ -182,8 +237,9 @@ class ExportDialog(Dialog.OkCancelDialog):
                         filename = "_".join(components)
                         extension = writer.extensions[0]
                         path = os.path.join(directory, "{0}.{1}".format(filename, extension))
-                        ImportExportManager.ImportExportManager().write_display_item_with_writer(writer, display_item, pathlib.Path(path))
+                        display_item_paths.append((display_item, pathlib.Path(path)))
                     except Exception as e:
                         logging.debug("Could not export image %s / %s", str(data_item), str(e))
                         traceback.print_exc()
                         traceback.print_stack()
+            export_display_items(typing.cast("DocumentController.DocumentController", self.parent_window), writer, display_item_paths)
@@ -32,6 +32,95 @@ if typing.TYPE_CHECKING:
 
 
 
+# display values for data with at least this many pixels per frame are prepared on a render thread, so that
+# preparing them does not block painting. smaller data is prepared directly during paint.
+BACKGROUND_DISPLAY_THRESHOLD = 1024 * 1024
+
+
+def _get_frame_size(display_values: DisplayItem.DisplayValues) -> int:
+    data_and_metadata = display_values.data_and_metadata
+    if not data_and_metadata:
+        return 0
+    data_shape = data_and_metadata.data_shape
+    if data_and_metadata.is_sequence:
+        data_shape = data_shape[1:]
+    return int(numpy.prod(data_shape, dtype=numpy.int64))
+
+
+class DisplayValuesPreparer:
+    """Prepare display values on a thread, keeping only the most recent display values.
+
+    Display values submitted while others are being prepared replace any display values still waiting, so stale
+    frames are dropped. Preparation is cancelled when the preparer is closed. The on_prepared callback is invoked on
+    the thread after display values are prepared.
+    """
+
+    def __init__(self) -> None:
+        self.__condition = threading.Condition()
+        self.__pending_display_values: typing.Optional[DisplayItem.DisplayValues] = None
+        self.__preparing_display_values: typing.Optional[DisplayItem.DisplayValues] = None
+        self.__thread: typing.Optional[threading.Thread] = None
+        self.__closed = False
+        self.on_prepared: typing.Optional[typing.Callable[[DisplayItem.DisplayValues], None]] = None
+
+    def close(self) -> None:
+        with self.__condition:
+            self.__closed = True
+            self.__pending_display_values = None
+            thread = self.__thread
+            self.__condition.notify_all()
+        if thread and thread is not threading.current_thread():
+            thread.join()
+        self.on_prepared = None
+
+    def submit(self, display_values: DisplayItem.DisplayValues) -> None:
+        with self.__condition:
+            if self.__closed:
+                return
+            self.__pending_display_values = display_values
+            if not self.__thread:
+                self.__thread = threading.Thread(target=self.__prepare_loop, daemon=True)
+                self.__thread.start()
+            self.__condition.notify_all()
+
+    def is_preparing(self, display_values: DisplayItem.DisplayValues) -> bool:
+        """Return whether the display values are waiting for or in preparation."""
+        with self.__condition:
+            return display_values is self.__pending_display_values or display_values is self.__preparing_display_values
+
+    def wait(self, timeout: typing.Optional[float] = None) -> bool:
+        """Wait until no display values are waiting for or in preparation. Used for testing."""
+        with self.__condition:
+            return self.__condition.wait_for(lambda: not self.__pending_display_values and not self.__preparing_display_values, timeout)
+
+    def __is_cancelled(self) -> bool:
+        return self.__closed
+
+    def __prepare_loop(self) -> None:
+        while True:
+            with self.__condition:
+                display_values = self.__pending_display_values
+                self.__pending_display_values = None
+                self.__preparing_display_values = display_values
+                if self.__closed or not display_values:
+                    self.__preparing_display_values = None
+                    self.__thread = None
+                    self.__condition.notify_all()
+                    return
+            try:
+                is_prepared = display_values.prepare_display(self.__is_cancelled)
+            except Exception:
+                import traceback
+                traceback.print_exc()
+                is_prepared = False
+            with self.__condition:
+                self.__preparing_display_values = None
+                self.__condition.notify_all()
+            on_prepared = self.on_prepared
+            if is_prepared and callable(on_prepared):
+                on_prepared(display_values)
+
+
 def _is_valid_data_shape(data_shape: typing.Optional[DataAndMetadata.ShapeType], canvas_rect: typing.Optional[Geometry.IntRect]) -> bool:
     if not data_shape or len(data_shape) != 2:
         return False
@@ -412,6 +501,16 @@ class ImageCanvasItem(DisplayCanvasItem.DisplayCanvasItem):
 
         self.__display_values_dirty = False
         self.__display_values: typing.Optional[DisplayItem.DisplayValues] = None
+        self.__has_bitmap = False
+
+        # large display values are prepared on a thread; repaint with them once they are prepared.
+        self.__display_values_preparer = DisplayValuesPreparer()
+
+        def display_values_prepared(display_values: DisplayItem.DisplayValues) -> None:
+            if display_values is self.__display_values:
+                self.__bitmap_canvas_item.update()
+
+        self.__display_values_preparer.on_prepared = display_values_prepared
         self.__data_shape: typing.Optional[DataAndMetadata.Shape2dType] = None
         self.__coordinate_system: typing.List[Calibration.Calibration] = list()
         self.__graphics: typing.List[Graphics.Graphic] = list()
@@ -436,6 +535,8 @@ class ImageCanvasItem(DisplayCanvasItem.DisplayCanvasItem):
         self.__display_latency = False
 
     def close(self) -> None:
+        self.__display_values_preparer.close()
+        self.__display_values_preparer = typing.cast(typing.Any, None)
         self.__screen_pixel_per_image_pixel_stream.remove_ref()
         self.__screen_pixel_per_image_pixel_stream = typing.cast(typing.Any, None)
         if self.__undo_command:
@@ -462,8 +563,11 @@ class ImageCanvasItem(DisplayCanvasItem.DisplayCanvasItem):
         self.__overlay_canvas_item.add_canvas_item(display_control_canvas_item)
 
     def update_display_values(self, display_values_list: typing.Sequence[typing.Optional[DisplayItem.DisplayValues]]) -> None:
-        self.__display_values = display_values_list[0] if display_values_list else None
+        display_values = display_values_list[0] if display_values_list else None
+        self.__display_values = display_values
         self.__display_values_dirty = True
+        if display_values and _get_frame_size(display_values) >= BACKGROUND_DISPLAY_THRESHOLD:
+            self.__display_values_preparer.submit(display_values)
 
     def update_display_properties_and_layers(self, display_calibration_info: DisplayItem.DisplayCalibrationInfo, display_properties: Persistence.PersistentDictType, display_layers: typing.Sequence[Persistence.PersistentDictType]) -> None:
         # threadsafe
@@ -1155,6 +1259,10 @@ class ImageCanvasItem(DisplayCanvasItem.DisplayCanvasItem):
             # configure the bitmap canvas item
             display_values = self.__display_values
             if display_values:
+                # while large display values are being prepared on a thread, keep painting the previous bitmap so
+                # that painting (pan, zoom, graphics) is not blocked. the preparer triggers an update when done.
+                if self.__has_bitmap and self.__display_values_preparer.is_preparing(display_values):
+                    return
                 display_data = display_values.adjusted_data_and_metadata
                 if display_data and display_data.data_dtype == numpy.float32:
                     display_range = display_values.transformed_display_range
@@ -1168,11 +1276,14 @@ class ImageCanvasItem(DisplayCanvasItem.DisplayCanvasItem):
                         color_map_rgba = color_map_rgba.view(numpy.uint32).reshape(color_map_rgba.shape[:-1])
                     else:
                         color_map_rgba = None
-                    self.__bitmap_canvas_item.set_data(display_data.data, display_range, color_map_rgba, trigger_update=False)
+                    # copy, since the display values reuse the array for later frames once released, while the
+                    # bitmap may still be painted, here or in another display panel, until it is replaced.
+                    self.__bitmap_canvas_item.set_data(numpy.copy(display_data.data), display_range, color_map_rgba, trigger_update=False)
                 else:
                     data_rgba = display_values.display_rgba
                     display_values.finalize()
-                    self.__bitmap_canvas_item.set_rgba_bitmap_data(data_rgba, trigger_update=False)
+                    self.__bitmap_canvas_item.set_rgba_bitmap_data(numpy.copy(data_rgba) if data_rgba is not None else None, trigger_update=False)
+                self.__has_bitmap = True
                 self.__timestamp_canvas_item.timestamp = display_values.display_rgba_timestamp if self.__display_latency else None
 
     @property
@@ -1191,6 +1302,10 @@ class ImageCanvasItem(DisplayCanvasItem.DisplayCanvasItem):
     def _display_values_dirty(self) -> bool:
         return self.__display_values_dirty
 
+    @property
+    def _display_values_preparer(self) -> DisplayValuesPreparer:
+        return self.__display_values_preparer
+
     def __apply_display_properties_command(self, display_properties: Persistence.PersistentDictType) -> None:
         delegate = self.delegate
         if delegate:
@@ -1203,11 +1203,11 @@ class SessionInspectorSection(InspectorSection):
 
         def fields_changed(key: str) -> None:
             if key == 'session_metadata':
-                widget.add_task("update_fields", functools.partial(update_fields, data_item.session_metadata))
+                widget.add_task("update_fields", functools.partial(update_fields, data_item.session_metadata_view))
         self.__property_changed_listener = data_item.property_changed_event.listen(fields_changed) if data_item else None
 
         if data_item:
-            update_fields(data_item.session_metadata)
+            update_fields(data_item.session_metadata_view)
 
         self.add_widget_to_content(widget)
         self.finish_widget_content()
@@ -72,9 +72,11 @@ class MetadataModel:
         return self.__metadata
 
     def __metadata_changed(self, data_item: typing.Optional[DataItem.DataItem]) -> None:
-        metadata = data_item.metadata if data_item else dict()
-        assert isinstance(metadata, dict)
-        if self.__metadata != metadata:
+        # compare against the read-only view so the metadata is only copied when it has changed.
+        metadata_view = data_item.metadata_view if data_item else dict()
+        if self.__metadata != metadata_view:
+            metadata = data_item.metadata if data_item else dict()
+            assert isinstance(metadata, dict)
             self.__metadata = metadata if metadata is not None else dict()
             self.metadata_changed_event.fire(self.__metadata)
 
@@ -165,6 +165,15 @@ class TaskSectionController:
         if self.task_ui_controller:
             task_spacer_row_col.add(self.task_ui_controller.widget)
 
+        # add a cancel button for tasks which support cancelling.
+        self.cancel_button = self.ui.create_push_button_widget(_("Cancel"))
+        def cancel() -> None:
+            self.task.request_cancel()
+        self.cancel_button.on_clicked = cancel
+        self.task_progress_row.add_spacing(8)
+        self.task_progress_row.add(self.cancel_button)
+        self.task_progress_row.add_stretch()
+
         widget.add(task_header)
         widget.add(task_spacer_row)
 
@@ -205,8 +214,10 @@ class TaskSectionController:
         else:
             self.task_progress_label.visible = False
 
+        self.cancel_button.visible = in_progress and self.task.is_cancellable and not self.task.is_cancel_requested
+
         # update the state text
-        task_state_str = _("In Progress") if in_progress else _("Done")
+        task_state_str = (_("Cancelling") if self.task.is_cancel_requested else _("In Progress")) if in_progress else (_("Cancelled") if self.task.is_cancel_requested else _("Done"))
         task_time_str = time.strftime("%c", time.localtime(self.task.start_time if in_progress else self.task.finish_time))
         progress_state_text = "{} {}".format(task_state_str, task_time_str)
         self.task_progress_state.text = progress_state_text
@@ -219,9 +230,11 @@ class TaskSectionController:
 
 class Task(Observable.Observable):
 
-    def __init__(self, title: str, task_type: str) -> None:
+    def __init__(self, title: str, task_type: str, *, is_cancellable: bool = False) -> None:
         super().__init__()
         self.__title = title
+        self.__is_cancellable = is_cancellable
+        self.__is_cancel_requested = False
         self.__start_time: typing.Optional[float] = None
         self.__finish_time: typing.Optional[float] = None
         self.__task_type = task_type
@@ -289,6 +302,20 @@ class Task(Observable.Observable):
         self.__progress_text = value
         self.task_changed_event.fire()
 
+    # cancel
+    @property
+    def is_cancellable(self) -> bool:
+        return self.__is_cancellable
+
+    @property
+    def is_cancel_requested(self) -> bool:
+        return self.__is_cancel_requested
+
+    def request_cancel(self) -> None:
+        if self.__is_cancellable:
+            self.__is_cancel_requested = True
+            self.task_changed_event.fire()
+
     # task type
     @property
     def task_type(self) -> str:
@@ -328,6 +355,11 @@ class TaskContextManager:
             logging.debug("%s: finished", self.__task.title)
         return None
 
+    @property
+    def is_cancel_requested(self) -> bool:
+        """Return whether the user requested to cancel the task. Long running cancellable tasks should check this."""
+        return self.__task.is_cancel_requested
+
     def update_progress(self, progress_text: str, progress: typing.Optional[typing.Tuple[int, int]] = None, task_data: typing.Any = None) -> None:
         self.__task.progress_text = progress_text
         self.__task.progress = progress
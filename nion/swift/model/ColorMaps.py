@@ -17,9 +17,12 @@ import math
 import os
 import pkgutil
 import re
+import threading
 import typing
 import xml.etree.ElementTree as ET
 
+from nion.data import Image
+
 _ = gettext.gettext
 
 _LookupDataArray = numpy.typing.NDArray[typing.Any]
@@ -202,3 +205,42 @@ load_color_map_resource("resources/color_maps/kindlmann.json")
 
 def get_color_map_data_by_id(color_map_id: str) -> _RGBA8ImageDataType:
     return color_maps.get(color_map_id, color_maps["grayscale"]).data
+
+
+# integer data of these types is mapped to rgba through a lookup table indexed by value.
+INTEGER_LOOKUP_TABLE_DTYPES = (numpy.dtype(numpy.uint8), numpy.dtype(numpy.uint16))
+
+# the number of integer lookup tables kept for reuse by subsequent frames.
+INTEGER_LOOKUP_TABLE_CACHE_SIZE = 8
+
+_integer_lookup_table_cache: typing.List[typing.Tuple[typing.Tuple[str, float, float], typing.Optional[_RGBA8ImageDataType], _LookupDataArray]] = list()
+_integer_lookup_table_cache_lock = threading.RLock()
+
+
+def create_rgba_lookup_table(values: _LookupDataArray, display_range: typing.Tuple[float, float], color_map_data: typing.Optional[_RGBA8ImageDataType]) -> _LookupDataArray:
+    """Return the uint32 rgba for each of the values, scaled to the display range and mapped through the color map.
+
+    The rgba matches the rgba produced by the display pipeline for the same values.
+    """
+    return Image.create_rgba_image_from_array(values.reshape(1, -1), display_limits=display_range, lookup=color_map_data).reshape(-1)
+
+
+def get_integer_rgba_lookup_table(dtype: numpy.typing.DTypeLike, display_range: typing.Tuple[float, float], color_map_data: typing.Optional[_RGBA8ImageDataType]) -> _LookupDataArray:
+    """Return the uint32 rgba lookup table, indexed by value, for integer data of the dtype.
+
+    Recently used lookup tables are reused, so consecutive frames with the same display range and color map only
+    calculate the lookup table once. Thread safe.
+    """
+    dtype = numpy.dtype(dtype)
+    assert dtype in INTEGER_LOOKUP_TABLE_DTYPES
+    key = (dtype.str, float(display_range[0]), float(display_range[1]))
+    with _integer_lookup_table_cache_lock:
+        for index, (cached_key, cached_color_map_data, lookup_table) in enumerate(_integer_lookup_table_cache):
+            if cached_key == key and cached_color_map_data is color_map_data:
+                _integer_lookup_table_cache.insert(0, _integer_lookup_table_cache.pop(index))
+                return lookup_table
+    lookup_table = create_rgba_lookup_table(numpy.arange(numpy.iinfo(dtype).max + 1, dtype=dtype), display_range, color_map_data)
+    with _integer_lookup_table_cache_lock:
+        _integer_lookup_table_cache.insert(0, (key, color_map_data, lookup_table))
+        del _integer_lookup_table_cache[INTEGER_LOOKUP_TABLE_CACHE_SIZE:]
+    return lookup_table
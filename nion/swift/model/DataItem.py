@@ -46,6 +46,16 @@ _ = gettext.gettext
 UNTITLED_STR = _("Untitled")
 
 
+def write_data_chunks(data: _ImageDataType, chunks: typing.Iterable[_ImageDataType]) -> None:
+    """Write the consecutive chunks along the first axis of data into data."""
+    index = 0
+    for chunk in chunks:
+        data[index:index + chunk.shape[0]] = chunk
+        index += chunk.shape[0]
+    if index != data.shape[0]:
+        raise ValueError(f"Data chunks have {index} rows; expected {data.shape[0]}.")
+
+
 class CalibrationList:
 
     def __init__(self, calibrations: typing.Optional[DataAndMetadata.CalibrationListType] = None) -> None:
@@ -185,10 +195,11 @@ class DataItem(Persistence.PersistentObject):
     writer_version = 13
 
     def __init__(self, data: typing.Optional[_ImageDataType] = None, item_uuid: typing.Optional[uuid.UUID] = None,
-                 large_format: bool = False) -> None:
+                 large_format: bool = False, compress_data: bool = False) -> None:
         super().__init__()
         self.uuid = item_uuid if item_uuid else self.uuid
         self.large_format = large_format
+        self.compress_data = compress_data  # store the data compressed if the storage supports it; used when first stored
         self._document_model: typing.Optional[DocumentModel.DocumentModel] = None  # used only for Facade
         self.define_type("data-item")
         self.define_property("created", self.utcnow(), hidden=True, converter=DatetimeToStringConverter(), changed=self.__description_property_changed)
@@ -215,8 +226,13 @@ class DataItem(Persistence.PersistentObject):
         self.define_property("session_id", validate=self.__validate_session_id, changed=self.__property_changed, hidden=True)
         self.define_property("session", dict(), changed=self.__property_changed, hidden=True)
         self.define_property("category", "persistent", changed=self.__property_changed, hidden=True)
-        self.__data_and_metadata: typing.Optional[DataAndMetadata.DataAndMetadata] = None
+        self.__loaded_data_and_metadata: typing.Optional[DataAndMetadata.DataAndMetadata] = None
+        self.__pending_data_and_metadata_fn: typing.Optional[typing.Callable[[], DataAndMetadata.DataAndMetadata]] = None
+        self.__pending_data_metadata: typing.Optional[DataAndMetadata.DataMetadata] = None
+        self.__pending_data_chunks: typing.Optional[typing.Iterator[_ImageDataType]] = None
         self.__data_and_metadata_lock = threading.RLock()
+        self.__is_data_owned = False  # data array was allocated or loaded by this item, not passed in by the caller
+        self.__is_data_shared = False  # data array is shared with a copy; copy before writing in place
         self.__intensity_calibration: typing.Optional[Calibration.Calibration] = None
         self.__dimensional_calibrations: typing.List[Calibration.Calibration] = list()
         self.__metadata: DataAndMetadata.MetadataType = dict()
@@ -269,6 +285,7 @@ class DataItem(Persistence.PersistentObject):
         data_item_copy = self.__class__()
         # data format (temporary until moved to buffered data source)
         data_item_copy.large_format = self.large_format
+        data_item_copy.compress_data = self.compress_data
         # metadata
         data_item_copy.created = self.created
         data_item_copy.timezone = self.timezone
@@ -281,7 +298,7 @@ class DataItem(Persistence.PersistentObject):
         data_item_copy.session_data = copy.deepcopy(self.session_data)
         data_item_copy.category = self.category
         # data and metadata
-        data_item_copy.set_data_and_metadata(copy.deepcopy(self.data_and_metadata), self.data_modified)
+        self.__copy_data_and_metadata_to(data_item_copy)
         memo[id(self)] = data_item_copy
         return data_item_copy
 
@@ -375,7 +392,8 @@ class DataItem(Persistence.PersistentObject):
         data_item = self.__class__()
         # data format (temporary until moved to buffered data source)
         data_item.large_format = self.large_format
-        data_item.set_data_and_metadata(copy.deepcopy(self.data_and_metadata), self.data_modified)
+        data_item.compress_data = self.compress_data
+        self.__copy_data_and_metadata_to(data_item)
         # metadata
         data_item.created = self.created
         data_item.timezone = self.timezone
@@ -428,6 +446,7 @@ class DataItem(Persistence.PersistentObject):
             self._finish_pending_write()
 
     def write_to_dict(self) -> Persistence.PersistentDictType:
+        self.__load_pending_data_and_metadata()  # the metadata property is only valid once loaded
         properties = super().write_to_dict()
         properties["version"] = DataItem.writer_version
         return properties
@@ -441,9 +460,31 @@ class DataItem(Persistence.PersistentObject):
             self.__pending_write = False
 
     def __write_data(self) -> None:
-        if self.__data_and_metadata:
+        if self.__pending_data_chunks is not None:
+            self.__write_pending_data_chunks()
+        elif self.__data_and_metadata:
             self.write_external_data("data", self.__data_and_metadata.data)
 
+    def __take_pending_data_chunks(self) -> typing.Optional[typing.Iterator[_ImageDataType]]:
+        with self.__data_ref_count_mutex:
+            chunks = self.__pending_data_chunks
+            self.__pending_data_chunks = None
+            return chunks
+
+    def __write_pending_data_chunks(self) -> None:
+        # reserve the data in storage and write the pending chunks into it. the stored data may be a lazily allocated
+        # data set, in which case the chunks are written straight to the file.
+        chunks = self.__take_pending_data_chunks()
+        data_and_metadata = self.__data_and_metadata
+        if chunks is not None and data_and_metadata:
+            data_shape, data_dtype = data_and_metadata.data_shape, data_and_metadata.data_dtype
+            self.reserve_external_data("data", data_shape, data_dtype)
+            data = self.read_external_data("data")
+            if data is None:
+                data = numpy.zeros(data_shape, data_dtype)
+            write_data_chunks(data, chunks)
+            self.write_external_data("data", data)
+
     def _finish_pending_write(self) -> None:
         if self.__pending_write:
             self.write_data_if_not_delayed()
@@ -496,6 +537,8 @@ class DataItem(Persistence.PersistentObject):
 
         if self.__in_transaction_state:
             self.__enter_write_delay_state()
+        elif self.__pending_data_and_metadata_fn:
+            pass  # unloadable will be configured when the data and metadata is loaded
         elif self.__data_and_metadata:
             self.__data_and_metadata.unloadable = self.persistent_object_context is not None and not self.is_write_delayed
 
@@ -505,6 +548,10 @@ class DataItem(Persistence.PersistentObject):
 
     def read_from_dict(self, properties: Persistence.PersistentDictType) -> None:
         self.large_format = properties.get("__large_format", self.large_format)
+        # the metadata may be large and copying it dominates reading. leave it out while reading the other
+        # properties and only copy it when the data and metadata is first used. see __data_and_metadata.
+        raw_metadata = properties.get("metadata")
+        properties = {k: v for k, v in properties.items() if k != "metadata"}
         # when reading, handle changes specially. first, put everything into a change
         # block; then make sure that no change notifications actually occur. this makes
         # sure things like cached values are preserved after reading.
@@ -524,7 +571,6 @@ class DataItem(Persistence.PersistentObject):
                         dimensional_calibrations.append(Calibration.Calibration())
                     while len(dimensional_shape) < len(dimensional_calibrations):
                         dimensional_calibrations.pop(-1)
-                metadata = self._get_persistent_property_value("metadata")
                 timestamp = self._get_persistent_property_value("data_modified")
                 if timestamp is None:  # invalid timestamp -- set property to now but don't trigger change
                     timestamp = self.created or datetime.datetime.now()
@@ -543,17 +589,27 @@ class DataItem(Persistence.PersistentObject):
                     # doesn't trigger a write to disk or a change modification.
                     self._get_persistent_property("datum_dimension_count").set_value(datum_dimension_count)
                 data_descriptor = DataAndMetadata.DataDescriptor(is_sequence, collection_dimension_count, datum_dimension_count)
-                self.__data_and_metadata = DataAndMetadata.DataAndMetadata(self.__load_data, data_shape_and_dtype,
-                                                                           intensity_calibration,
-                                                                           dimensional_calibrations, metadata,
-                                                                           timestamp,
-                                                                           data_descriptor=data_descriptor,
-                                                                           timezone=self.timezone,
-                                                                           timezone_offset=self.timezone_offset)
-                with self.__data_ref_count_mutex:
-                    self.__data_and_metadata._add_data_ref_count(self.__data_ref_count)
-                self.__data_and_metadata.unloadable = self.persistent_object_context is not None
+                timezone = self.timezone
+                timezone_offset = self.timezone_offset
+
+                def load_data_and_metadata() -> DataAndMetadata.DataAndMetadata:
+                    metadata = copy.deepcopy(raw_metadata) if raw_metadata else dict()
+                    # set the property directly to avoid change notifications.
+                    self._get_persistent_property("metadata").value = metadata
+                    return DataAndMetadata.DataAndMetadata(self.__load_data, data_shape_and_dtype,
+                                                           intensity_calibration, dimensional_calibrations, metadata,
+                                                           timestamp, data_descriptor=data_descriptor,
+                                                           timezone=timezone, timezone_offset=timezone_offset)
+
+                self.__loaded_data_and_metadata = None
+                self.__pending_data_and_metadata_fn = load_data_and_metadata
+                self.__pending_data_metadata = DataAndMetadata.DataMetadata(data_shape_and_dtype, intensity_calibration,
+                                                                            dimensional_calibrations, None, timestamp,
+                                                                            data_descriptor=data_descriptor,
+                                                                            timezone=timezone,
+                                                                            timezone_offset=timezone_offset)
             else:
+                self._get_persistent_property("metadata").set_value(raw_metadata if raw_metadata else dict())
                 metadata = self._get_persistent_property_value("metadata")
                 self.__metadata = copy.deepcopy(metadata) if metadata else dict()
             self.__pending_write = False
@@ -562,6 +618,34 @@ class DataItem(Persistence.PersistentObject):
             self.__content_changed = False
         self.__pending_write = False
 
+    def __load_pending_data_and_metadata(self) -> None:
+        # items read from storage construct their data and metadata (including the metadata) when first used.
+        if self.__pending_data_and_metadata_fn:
+            with self.__data_ref_count_mutex:
+                pending_data_and_metadata_fn = self.__pending_data_and_metadata_fn
+                if pending_data_and_metadata_fn:
+                    self.__pending_data_and_metadata_fn = None
+                    self.__pending_data_metadata = None
+                    data_and_metadata = pending_data_and_metadata_fn()
+                    data_and_metadata._add_data_ref_count(self.__data_ref_count)
+                    data_and_metadata.unloadable = self.persistent_object_context is not None and not self.is_write_delayed
+                    self.__loaded_data_and_metadata = data_and_metadata
+
+    @property
+    def __data_and_metadata(self) -> typing.Optional[DataAndMetadata.DataAndMetadata]:
+        self.__load_pending_data_and_metadata()
+        return self.__loaded_data_and_metadata
+
+    @__data_and_metadata.setter
+    def __data_and_metadata(self, data_and_metadata: typing.Optional[DataAndMetadata.DataAndMetadata]) -> None:
+        self.__pending_data_and_metadata_fn = None
+        self.__pending_data_metadata = None
+        self.__loaded_data_and_metadata = data_and_metadata
+
+    @property
+    def _is_data_and_metadata_loaded(self) -> bool:
+        return self.__pending_data_and_metadata_fn is None
+
     @property
     def properties(self) -> typing.Optional[Persistence.PersistentDictType]:
         """ Used for debugging. """
@@ -591,7 +675,7 @@ class DataItem(Persistence.PersistentObject):
         if self.session_id != session_id:
             self.session_id = session_id
         session_metadata = ApplicationData.get_session_metadata_dict()
-        if self.session_metadata != session_metadata:
+        if self.session_metadata_view != session_metadata:
             self.session_metadata = session_metadata
 
     class DataItemChangeContextManager:
@@ -779,10 +863,11 @@ class DataItem(Persistence.PersistentObject):
 
     def increment_data_ref_count(self) -> int:
         with self.__data_ref_count_mutex:
+            data_and_metadata = self.__data_and_metadata  # load any pending data and metadata before counting
             initial_count = self.__data_ref_count
             self.__data_ref_count += 1
-            if self.__data_and_metadata:
-                self.__data_and_metadata.increment_data_ref_count()
+            if data_and_metadata:
+                data_and_metadata.increment_data_ref_count()
         return initial_count + 1
 
     def decrement_data_ref_count(self) -> int:
@@ -835,6 +920,11 @@ class DataItem(Persistence.PersistentObject):
     def session_metadata(self) -> DataAndMetadata.MetadataType:
         return copy.deepcopy(self._get_persistent_property_value("session"))
 
+    @property
+    def session_metadata_view(self) -> typing.Mapping[str, typing.Any]:
+        """Return a read-only view of the session metadata without copying it."""
+        return typing.cast(typing.Mapping[str, typing.Any], self._get_persistent_property_value_view("session", dict()))
+
     @session_metadata.setter
     def session_metadata(self, value: DataAndMetadata.MetadataType) -> None:
         self._set_persistent_property_value("session", copy.deepcopy(value))
@@ -909,11 +999,46 @@ class DataItem(Persistence.PersistentObject):
     # should use the data property. writing data (if allowed) should
     # assign to the data property.
     def data_ref(self) -> contextlib.AbstractContextManager[DataItem.DataAccessor]:
-        return DataItem.DataAccessor(self, self.__get_data, self.__set_data)
+        return DataItem.DataAccessor(self, self.__get_data_for_write, self.__set_data)
 
     def __get_data(self) -> typing.Optional[_ImageDataType]:
         return self.__data_and_metadata.data if self.__data_and_metadata else None
 
+    def __get_data_for_write(self) -> typing.Optional[_ImageDataType]:
+        # the data ref allows the caller to modify the data in place.
+        self.__ensure_data_not_shared()
+        return self.__get_data()
+
+    def __copy_data_and_metadata_to(self, data_item: DataItem) -> None:
+        # share the data array with the copy instead of duplicating it. both items copy the array before their next
+        # in-place write (copy-on-write). arrays passed in by the caller may still be modified by the caller and
+        # arrays that are not plain in-memory arrays (memory mapped files, h5py datasets) may change underneath the
+        # copy, so those are still copied immediately.
+        self.increment_data_ref_count()
+        try:
+            data_and_metadata = self.data_and_metadata
+            if data_and_metadata and self.__is_data_owned and type(data_and_metadata.data) is numpy.ndarray:
+                data_item.set_data_and_metadata(data_and_metadata, self.data_modified)
+                self.__is_data_shared = True
+                data_item.__is_data_owned = True
+                data_item.__is_data_shared = True
+            else:
+                data_item.set_data_and_metadata(copy.deepcopy(data_and_metadata), self.data_modified)
+        finally:
+            self.decrement_data_ref_count()
+
+    def __ensure_data_not_shared(self) -> None:
+        with self.__data_ref_count_mutex:
+            if self.__is_data_shared:
+                self.__is_data_shared = False
+                if self.__data_and_metadata and self.__data_and_metadata.data is not None:
+                    self.__data_and_metadata._set_data(numpy.copy(self.__data_and_metadata.data))
+                    self.__is_data_owned = True
+
+    @property
+    def _is_data_shared(self) -> bool:
+        return self.__is_data_shared
+
     def __set_data(self, data: typing.Optional[_ImageDataType], data_modified: typing.Optional[datetime.datetime] = None) -> None:
         with self.data_source_changes():
             if data is not None:
@@ -1016,6 +1141,15 @@ class DataItem(Persistence.PersistentObject):
         data_and_metadata = self.__data_and_metadata
         return copy.deepcopy(dict(data_and_metadata.metadata)) if data_and_metadata else self.__metadata
 
+    @property
+    def metadata_view(self) -> typing.Mapping[str, typing.Any]:
+        """Return a read-only view of the metadata without copying it.
+
+        Use this instead of metadata when only reading; use metadata to get a copy which can be modified.
+        """
+        data_and_metadata = self.__data_and_metadata
+        return Utility.ReadOnlyDictView(data_and_metadata.metadata if data_and_metadata else self.__metadata)
+
     @metadata.setter
     def metadata(self, metadata: DataAndMetadata.MetadataType) -> None:
         with self.data_source_changes():
@@ -1039,13 +1173,24 @@ class DataItem(Persistence.PersistentObject):
         data_and_metadata = self.__data_and_metadata
         return data_and_metadata.data_metadata if data_and_metadata else None
 
+    def _get_data_metadata_without_metadata(self) -> typing.Optional[DataAndMetadata.DataMetadata]:
+        # return the data shape, descriptor, and calibrations without loading the metadata of an item which has not
+        # been used since reading. the metadata of the returned value may be empty.
+        pending_data_metadata = self.__pending_data_metadata
+        return pending_data_metadata if pending_data_metadata else self.data_metadata
+
     @property
     def data_and_metadata(self) -> typing.Optional[DataAndMetadata.DataAndMetadata]:
         return self.__data_and_metadata
 
     def __load_data(self) -> typing.Optional[_ImageDataType]:
         if self.persistent_object_context:
-            return typing.cast(typing.Optional[_ImageDataType], self.read_external_data("data"))
+            data = typing.cast(typing.Optional[_ImageDataType], self.read_external_data("data"))
+            with self.__data_ref_count_mutex:
+                # freshly loaded data is not shared with any other item.
+                self.__is_data_owned = True
+                self.__is_data_shared = False
+            return data
         return None
 
     def __set_data_metadata_direct(self, data_metadata: DataAndMetadata.DataMetadata,
@@ -1079,6 +1224,9 @@ class DataItem(Persistence.PersistentObject):
             if self.__data_and_metadata:
                 self.__data_and_metadata._subtract_data_ref_count(self.__data_ref_count)
             self.__data_and_metadata = data_and_metadata
+            self.__pending_data_chunks = None
+            self.__is_data_owned = False
+            self.__is_data_shared = False
             if self.__data_and_metadata:
                 self.__data_and_metadata._add_data_ref_count(self.__data_ref_count)
         if self.__data_and_metadata:
@@ -1120,24 +1268,84 @@ class DataItem(Persistence.PersistentObject):
 
     def reserve_data(self, *, data_shape: DataAndMetadata.ShapeType, data_dtype: numpy.typing.DTypeLike, data_descriptor: DataAndMetadata.DataDescriptor, data_modified: typing.Optional[datetime.datetime] = None) -> None:
         """Reserves the underlying data without necessarily allocating memory. Useful for memory mapped files.
+
+        If the data item is stored, the reserved data is left unloaded and is read from storage when first used. If the
+        data item is not stored yet, the data is reserved in memory as zeros, which the operating system allocates as
+        the data is written.
         """
+
+        def load_reserved_data() -> _ImageDataType:
+            data = self.__load_data()
+            return data if data is not None else numpy.zeros(data_shape, data_dtype)
+
         self.increment_data_ref_count()
         try:
+            data: typing.Optional[_ImageDataType] = None
             if self.persistent_object_context:
                 self.reserve_external_data("data", data_shape, data_dtype)
-                data = self.__load_data()
-                if data is None:
-                    data = numpy.zeros(data_shape, data_dtype)
-                data_shape_and_dtype = data_shape, data_dtype
-                timezone = Utility.get_local_timezone()
-                timezone_offset = Utility.TimezoneMinutesToStringConverter().convert(Utility.local_utcoffset_minutes())
-                new_data_and_metadata = DataAndMetadata.DataAndMetadata(self.__load_data, data_shape_and_dtype, None, None, None, None, data, data_descriptor, timezone, timezone_offset)
-                self.__set_data_and_metadata_direct(new_data_and_metadata, data_modified)
-                if self.__data_and_metadata:
-                    self.__data_and_metadata.unloadable = True
+                # the storage reserves the data without writing it. leave it unloaded unless the data is in use by
+                # someone other than this method, in which case it must be loaded to stay valid for them.
+                if self.__data_ref_count > 1:
+                    data = load_reserved_data()
+            else:
+                data = numpy.zeros(data_shape, data_dtype)
+            data_shape_and_dtype = data_shape, data_dtype
+            timezone = Utility.get_local_timezone()
+            timezone_offset = Utility.TimezoneMinutesToStringConverter().convert(Utility.local_utcoffset_minutes())
+            new_data_and_metadata = DataAndMetadata.DataAndMetadata(load_reserved_data, data_shape_and_dtype, None, None, None, None, data, data_descriptor, timezone, timezone_offset)
+            self.__set_data_and_metadata_direct(new_data_and_metadata, data_modified)
+            self.__is_data_owned = True
+            if self.__data_and_metadata and self.persistent_object_context:
+                self.__data_and_metadata.unloadable = True
         finally:
             self.decrement_data_ref_count()
 
+    def set_data_chunks(self, *, data_shape: DataAndMetadata.ShapeType, data_dtype: numpy.typing.DTypeLike,
+                        data_descriptor: DataAndMetadata.DataDescriptor, chunks: typing.Iterable[_ImageDataType],
+                        data_modified: typing.Optional[datetime.datetime] = None) -> None:
+        """Sets the underlying data from consecutive chunks along the first axis without assembling it in memory.
+
+        If the data item is stored, the data is reserved in storage and the chunks are written into it. Otherwise, the
+        chunks are kept until the data item is stored and are written into its reserved storage then. If the data is
+        used before that, the chunks are assembled in memory.
+        """
+        if self.persistent_object_context:
+            self.reserve_data(data_shape=data_shape, data_dtype=data_dtype, data_descriptor=data_descriptor, data_modified=data_modified)
+            with self.data_ref() as data_ref:
+                master_data = data_ref.master_data
+                assert master_data is not None
+                write_data_chunks(master_data, chunks)
+                data_ref.data_updated()  # trigger change notifications
+            return
+
+        def load_data_chunks() -> typing.Optional[_ImageDataType]:
+            chunks = self.__take_pending_data_chunks()
+            if chunks is not None:
+                if self.persistent_object_context and not self.is_write_delayed:
+                    # stored since the chunks were set; write them into the storage and use the stored data.
+                    self.__pending_data_chunks = chunks
+                    self.__write_pending_data_chunks()
+                else:
+                    data = numpy.empty(data_shape, data_dtype)
+                    write_data_chunks(data, chunks)
+                    return data
+            return self.__load_data()
+
+        with self.data_source_changes():
+            data_shape_and_dtype = data_shape, data_dtype
+            timezone = Utility.get_local_timezone()
+            timezone_offset = Utility.TimezoneMinutesToStringConverter().convert(Utility.local_utcoffset_minutes())
+            new_data_and_metadata = DataAndMetadata.DataAndMetadata(load_data_chunks, data_shape_and_dtype, None, None, None, None, None, data_descriptor, timezone, timezone_offset)
+            with self.__data_ref_count_mutex:
+                self.__set_data_and_metadata_direct(new_data_and_metadata, data_modified)
+                self.__pending_data_chunks = iter(chunks)
+                self.__is_data_owned = True
+                if self.__data_ref_count > 0:
+                    # the data is already in use and must stay loaded.
+                    data = load_data_chunks()
+                    if data is not None:
+                        new_data_and_metadata._set_data(data)
+
     def set_data_and_metadata_partial(self, data_metadata: DataAndMetadata.DataMetadata,
                                       data_and_metadata: DataAndMetadata.DataAndMetadata, src: typing.Sequence[slice],
                                       dst: typing.Sequence[slice], update_metadata: bool = False,
@@ -1163,6 +1371,7 @@ class DataItem(Persistence.PersistentObject):
                                                                             timestamp, data, data_descriptor, timezone,
                                                                             timezone_offset)
                     self.__set_data_and_metadata_direct(new_data_and_metadata, data_modified)
+                    self.__is_data_owned = True
                 if self.__data_and_metadata is not None:
                     if update_metadata:
                         self.__data_and_metadata._set_data_descriptor(data_metadata.data_descriptor)
@@ -1176,6 +1385,7 @@ class DataItem(Persistence.PersistentObject):
                     assert self.__data_and_metadata.data_shape == data_metadata.data_shape
                     assert self.__data_and_metadata.data_dtype == data_metadata.data_dtype
                     assert self.__data_and_metadata.data_dtype == data_and_metadata.data_dtype
+                    self.__ensure_data_not_shared()
                     self.__data_and_metadata._data_ex[tuple(dst)] = data_and_metadata._data_ex[tuple(src)]
                     # mark changes and update session
                     self.__change_changed = True
@@ -1388,8 +1598,9 @@ class DataSource:
             else:
                 display_values = display_data_channel.get_calculated_display_values()
                 if display_values:
+                    # copy, since the display values reuse the array for later frames once released.
                     display_rgba = display_values.display_rgba
-                    return DataAndMetadata.new_data_and_metadata(Image.get_byte_view(display_rgba)) if display_rgba is not None else None
+                    return DataAndMetadata.new_data_and_metadata(Image.get_byte_view(numpy.copy(display_rgba))) if display_rgba is not None else None
         return None
 
     @property
@@ -1405,7 +1616,9 @@ class DataSource:
             else:
                 display_values = display_data_channel.get_calculated_display_values()
                 if display_values:
-                    return display_values.normalized_data_and_metadata
+                    # copy, since the display values reuse the array for later frames once released.
+                    normalized_xdata = display_values.normalized_data_and_metadata
+                    return copy.deepcopy(normalized_xdata) if normalized_xdata else None
         return None
 
     @property
@@ -1417,7 +1630,9 @@ class DataSource:
             else:
                 display_values = display_data_channel.get_calculated_display_values()
                 if display_values:
-                    return display_values.adjusted_data_and_metadata
+                    # copy, since the display values reuse the array for later frames once released.
+                    adjusted_xdata = display_values.adjusted_data_and_metadata
+                    return copy.deepcopy(adjusted_xdata) if adjusted_xdata else None
         return None
 
     @property
@@ -10,6 +10,7 @@ import gettext
 import math
 import numbers
 import numpy
+import numpy.typing
 import operator
 import threading
 import types
@@ -240,8 +241,22 @@ class CalibrationStyleFractionalCenter(CalibrationStyle):
         return [Calibration.Calibration(scale=2.0/display_dimension, offset=-1.0) for display_dimension in dimensional_shape]
 
 
+# adjustments are applied through a lookup table indexed by the normalized display data.
+ADJUSTMENT_LOOKUP_TABLE_SIZE = 16384
+
+# the histogram used by adjustments is calculated from a strided sample of about this many display data values.
+ADJUSTMENT_HISTOGRAM_SAMPLE_COUNT = 256 * 256
+ADJUSTMENT_HISTOGRAM_BINS = 256
+
+
 class AdjustmentType(typing.Protocol):
-    def transform(self, data: _ImageDataType, display_limits: typing.Tuple[float, float]) -> _ImageDataType: ...
+    def transform(self, data: _ImageDataType, display_limits: typing.Tuple[float, float], histogram: _ImageDataType) -> _ImageDataType:
+        """Return the transformed data. The data and the result are normalized to [0, 1].
+
+        The histogram is the histogram of the values to which the transform is applied, with uniform bins over
+        [0, 1]. Since the data passed may be a lookup table, the histogram must be used for any statistics.
+        """
+        ...
 
 
 def adjustment_factory(adjustment_d: Persistence.PersistentDictType) -> typing.Optional[AdjustmentType]:
@@ -250,13 +265,13 @@ def adjustment_factory(adjustment_d: Persistence.PersistentDictType) -> typing.O
             def __init__(self, gamma: float) -> None:
                 self.__gamma = gamma
 
-            def transform(self, data: _ImageDataType, display_limits: typing.Tuple[float, float]) -> _ImageDataType:
+            def transform(self, data: _ImageDataType, display_limits: typing.Tuple[float, float], histogram: _ImageDataType) -> _ImageDataType:
                 return numpy.power(numpy.clip(data, 0.0, 1.0), self.__gamma, dtype=numpy.float32)  # type: ignore
 
         return AdjustGamma(adjustment_d.get("gamma", 1.0))
     elif adjustment_d.get("type", None) == "log":
         class AdjustLog:
-            def transform(self, data: _ImageDataType, display_limits: typing.Tuple[float, float]) -> _ImageDataType:
+            def transform(self, data: _ImageDataType, display_limits: typing.Tuple[float, float], histogram: _ImageDataType) -> _ImageDataType:
                 range = display_limits[1] - display_limits[0]
                 c = 1.0 / (numpy.log2(1 + range))
                 return c * numpy.log2(1 + range * numpy.clip(data, 0.0, 1.0), dtype=numpy.float32)  # type: ignore
@@ -264,19 +279,146 @@ def adjustment_factory(adjustment_d: Persistence.PersistentDictType) -> typing.O
         return AdjustLog()
     elif adjustment_d.get("type", None) == "equalized":
         class AdjustEqualized:
-            def transform(self, data: _ImageDataType, display_limits: typing.Tuple[float, float]) -> _ImageDataType:
-                data = numpy.clip(data, 0.0, 1.0)
-                histogram, bins = numpy.histogram(data.flatten(), 256, density=True)  # type: ignore
-                histogram_cdf = histogram.cumsum()
-                histogram_cdf = histogram_cdf / histogram_cdf[-1]
-                equalized = numpy.interp(data.flatten(), bins[:-1], histogram_cdf)  # type: ignore
-                return equalized.reshape(data.shape)  # type: ignore
+            def transform(self, data: _ImageDataType, display_limits: typing.Tuple[float, float], histogram: _ImageDataType) -> _ImageDataType:
+                histogram_cdf = numpy.cumsum(histogram, dtype=numpy.float64)
+                if histogram_cdf[-1] > 0:
+                    histogram_cdf = histogram_cdf / histogram_cdf[-1]
+                bins = numpy.linspace(0.0, 1.0, histogram.shape[0] + 1)
+                return numpy.interp(numpy.clip(data, 0.0, 1.0), bins[:-1], histogram_cdf).astype(numpy.float32)  # type: ignore
 
         return AdjustEqualized()
     else:
         return None
 
 
+def get_strided_sample(data: _ImageDataType, sample_count: int) -> _ImageDataType:
+    """Return a strided view of data with roughly sample_count values, evenly spaced along each axis."""
+    if data.size <= sample_count or not data.shape:
+        return data
+    stride = max(1, int(math.ceil((data.size / sample_count) ** (1.0 / len(data.shape)))))
+    return data[(slice(None, None, stride),) * len(data.shape)]
+
+
+# display data with more values than this uses an estimated data range for the auto display range (if an estimate
+# mode is specified). the data range itself is always exact.
+DATA_RANGE_ESTIMATE_THRESHOLD = 16 * 1024 * 1024
+DATA_RANGE_ESTIMATE_SAMPLE_COUNT = 1024 * 1024
+
+# the number of values in the sorted sample used to determine display limits for complex data.
+DATA_SAMPLE_COUNT = 200
+
+
+def get_data_sample(data: _ImageDataType, sample_count: int, mode: str) -> _ImageDataType:
+    """Return a 1d sample of about sample_count values from data; or all values if data is not larger.
+
+    The 'strided' mode takes evenly spaced values along each axis. The 'random' mode takes a uniform random
+    sample without replacement (equivalent to reservoir sampling) using a fixed seed, so the sample is
+    deterministic for a given data shape.
+    """
+    if data.size <= sample_count:
+        return data.reshape(-1)
+    if mode == "random":
+        indexes = numpy.random.default_rng(0).choice(data.size, sample_count, replace=False)
+        indexes.sort()
+        return typing.cast(_ImageDataType, data[numpy.unravel_index(indexes, data.shape)])
+    return get_strided_sample(data, sample_count).reshape(-1)
+
+
+def calculate_data_range_error_bound(sample_count: int, confidence: float = 0.999) -> float:
+    """Return the error bound of a data range estimated from a sample of sample_count values.
+
+    The bound is the fraction of the data values that may lie outside the estimated range: with the given
+    confidence, at most this fraction of values are below the estimated minimum or above the estimated maximum.
+    The bound assumes the sample is uniform (random mode) or uncorrelated with the stride (strided mode).
+    """
+    return math.log(2 / (1 - confidence)) / sample_count
+
+
+def calculate_adjustment_lookup_table(adjustments: typing.Sequence[AdjustmentType], display_range: typing.Tuple[float, float], histogram: _ImageDataType) -> _ImageDataType:
+    """Return the lookup table mapping normalized data in [0, 1] through the sequence of adjustments.
+
+    The histogram is the histogram of the normalized data; it is mapped through each adjustment so that each
+    subsequent adjustment receives the histogram of its own input values.
+    """
+    lookup_table = numpy.linspace(0.0, 1.0, ADJUSTMENT_LOOKUP_TABLE_SIZE, dtype=numpy.float32)
+    bin_count = histogram.shape[0]
+    bin_centers = (numpy.arange(bin_count, dtype=numpy.float32) + 0.5) / bin_count
+    for adjustment in adjustments:
+        lookup_table = adjustment.transform(lookup_table, display_range, histogram)
+        bin_centers = adjustment.transform(bin_centers, display_range, histogram)
+        histogram = numpy.histogram(bin_centers, bin_count, range=(0.0, 1.0), weights=histogram)[0]
+    return lookup_table
+
+
+def apply_adjustment_lookup_table(data: _ImageDataType, display_range: typing.Tuple[float, float], lookup_table: _ImageDataType,
+                                  out: typing.Optional[_ImageDataType] = None, indexes_out: typing.Optional[_ImageDataType] = None) -> _ImageDataType:
+    """Normalize data to the display range and map it through the lookup table, without a float64 intermediate.
+
+    If specified, out (float32, same shape as data) receives the result and indexes_out (int32, same shape as data)
+    receives the lookup table indexes; otherwise they are allocated.
+    """
+    display_limit_low, display_limit_high = display_range
+    lookup_table = lookup_table.astype(numpy.float32, copy=False)
+    lookup_table_max = lookup_table.shape[0] - 1
+    m = lookup_table_max / (display_limit_high - display_limit_low) if display_limit_high != display_limit_low else 0.0
+    # the float indexes are calculated in the output, which is then overwritten by the lookup.
+    indexes = numpy.multiply(data, numpy.float32(m), dtype=numpy.float32, out=out)
+    numpy.add(indexes, numpy.float32(0.5 - display_limit_low * m), out=indexes)
+    numpy.clip(indexes, 0, lookup_table_max, out=indexes)
+    if numpy.issubdtype(data.dtype, numpy.inexact):
+        numpy.nan_to_num(indexes, copy=False)
+    if indexes_out is not None:
+        numpy.copyto(indexes_out, indexes, casting="unsafe")
+    else:
+        indexes_out = indexes.astype(numpy.int32)
+    return typing.cast(_ImageDataType, numpy.take(lookup_table, indexes_out, out=indexes, mode="clip"))
+
+
+# the number of released buffers kept for each intermediate display array.
+DISPLAY_BUFFER_COUNT = 4
+
+# the number of most recently finalized display values of a display data channel that keep their buffers. older
+# display values release their buffers for reuse; the last finalized ones may still be read by a thread. consumers
+# outside the display pipeline, including the canvas items that paint the display, copy the arrays they keep.
+DISPLAY_BUFFER_GENERATIONS = 2
+
+
+class DisplayBufferPool:
+    """Keep intermediate display arrays for reuse by the display values of subsequent frames.
+
+    Buffers are owned by the display values that got them until the display values explicitly release them. Only
+    released buffers are handed out again. Thread safe.
+    """
+
+    def __init__(self, buffer_count: int = DISPLAY_BUFFER_COUNT) -> None:
+        self.__lock = threading.RLock()
+        self.__buffer_count = buffer_count
+        self.__buffers: typing.Dict[str, typing.List[_ImageDataType]] = dict()
+
+    def get_buffer(self, name: str, shape: DataAndMetadata.ShapeType, dtype: numpy.typing.DTypeLike) -> _ImageDataType:
+        """Return an uninitialized array with the shape and dtype for the named intermediate display array.
+
+        The caller owns the array until it passes it to release_buffer.
+        """
+        dtype = numpy.dtype(dtype)
+        shape = tuple(shape)
+        with self.__lock:
+            buffers = self.__buffers.get(name, list())
+            for index, buffer in enumerate(buffers):
+                if buffer.shape == shape and buffer.dtype == dtype:
+                    return buffers.pop(index)
+        return numpy.empty(shape, dtype)
+
+    def release_buffer(self, name: str, buffer: _ImageDataType) -> None:
+        """Return a buffer for reuse. The caller must not use the buffer afterwards."""
+        with self.__lock:
+            buffers = self.__buffers.setdefault(name, list())
+            # discard released buffers of other shapes or dtypes; they are from frames that will not come again.
+            buffers[:] = [b for b in buffers if b.shape == buffer.shape and b.dtype == buffer.dtype]
+            if len(buffers) < self.__buffer_count:
+                buffers.append(buffer)
+
+
 class DisplayValues:
     """Calculate display data used to render the display.
 
@@ -298,8 +440,12 @@ class DisplayValues:
                  display_limits: typing.Optional[typing.Tuple[float, float]],
                  complex_display_type: typing.Optional[str],
                  color_map_data: typing.Optional[_RGBA32Type], brightness: float, contrast: float,
-                 adjustments: typing.Sequence[Persistence.PersistentDictType]) -> None:
+                 adjustments: typing.Sequence[Persistence.PersistentDictType], *,
+                 data_range_estimate_mode: typing.Optional[str] = None,
+                 buffer_pool: typing.Optional[DisplayBufferPool] = None) -> None:
         self.__lock = threading.RLock()
+        self.__buffer_pool = buffer_pool
+        self.__buffers: typing.List[typing.Tuple[str, _ImageDataType]] = list()
         self.__data_and_metadata = data_and_metadata
         self.__sequence_index = sequence_index
         self.__collection_index = collection_index
@@ -319,10 +465,16 @@ class DisplayValues:
         self.__normalized_data_and_metadata: typing.Optional[DataAndMetadata.DataAndMetadata] = None
         self.__adjusted_data_and_metadata_dirty = True
         self.__adjusted_data_and_metadata: typing.Optional[DataAndMetadata.DataAndMetadata] = None
+        self.__adjustment_histogram_dirty = True
+        self.__adjustment_histogram: typing.Optional[_ImageDataType] = None
         self.__transformed_data_and_metadata_dirty = True
         self.__transformed_data_and_metadata: typing.Optional[DataAndMetadata.DataAndMetadata] = None
+        self.__data_range_estimate_mode = data_range_estimate_mode
         self.__data_range_dirty = True
         self.__data_range: typing.Optional[typing.Tuple[float, float]] = None
+        self.__estimated_data_range_dirty = True
+        self.__estimated_data_range: typing.Optional[typing.Tuple[float, float]] = None
+        self.__estimated_data_range_error_bound = 0.0
         self.__data_sample_dirty = True
         self.__data_sample: typing.Optional[_ImageDataType] = None
         self.__display_range_dirty = True
@@ -339,6 +491,38 @@ class DisplayValues:
         if callable(self.on_finalize):
             self.on_finalize(self)
 
+    def release_buffers(self) -> None:
+        """Return the intermediate display arrays to the buffer pool for reuse by subsequent frames.
+
+        The intermediate display data is recalculated, without the buffer pool, if it is requested again. Arrays
+        previously returned from these display values must no longer be used.
+        """
+        with self.__lock:
+            buffer_pool = self.__buffer_pool
+            buffers = self.__buffers
+            self.__buffer_pool = None
+            self.__buffers = list()
+            self.__normalized_data_and_metadata_dirty = True
+            self.__normalized_data_and_metadata = None
+            self.__adjusted_data_and_metadata_dirty = True
+            self.__adjusted_data_and_metadata = None
+            self.__transformed_data_and_metadata_dirty = True
+            self.__transformed_data_and_metadata = None
+            self.__display_rgba_dirty = True
+            self.__display_rgba = None
+        if buffer_pool:
+            for name, buffer in buffers:
+                buffer_pool.release_buffer(name, buffer)
+
+    def __get_buffer(self, name: str, shape: DataAndMetadata.ShapeType, dtype: numpy.typing.DTypeLike) -> _ImageDataType:
+        # return an uninitialized array for an intermediate display array, reused from an earlier frame if possible.
+        # the buffer is owned by these display values until release_buffers.
+        if self.__buffer_pool:
+            buffer = self.__buffer_pool.get_buffer(name, shape, dtype)
+            self.__buffers.append((name, buffer))
+            return buffer
+        return numpy.empty(shape, dtype)
+
     @property
     def color_map_data(self) -> typing.Optional[_RGBA32Type]:
         return self.__color_map_data
@@ -380,8 +564,19 @@ class DisplayValues:
                     self.__display_data_and_metadata = data_and_metadata
             return self.__display_data_and_metadata
 
+    def __calculate_data_range(self, data: _ImageDataType) -> typing.Tuple[float, float]:
+        data_range: typing.Tuple[typing.Any, typing.Any] = (numpy.amin(data), numpy.amax(data))
+        if math.isnan(data_range[0]) or math.isnan(data_range[1]) or math.isinf(data_range[0]) or math.isinf(data_range[1]):
+            data_range = (0.0, 0.0)
+        if numpy.issubdtype(type(data_range[0]), numpy.bool_):
+            data_range = (int(data_range[0]), data_range[1])
+        if numpy.issubdtype(type(data_range[1]), numpy.bool_):
+            data_range = (data_range[0], int(data_range[1]))
+        return data_range
+
     @property
     def data_range(self) -> typing.Optional[typing.Tuple[float, float]]:
+        """Return the exact range of the display data."""
         with self.__lock:
             if self.__data_range_dirty:
                 self.__data_range_dirty = False
@@ -392,27 +587,53 @@ class DisplayValues:
                     data_dtype = self.__data_and_metadata.data_dtype
                     if Image.is_shape_and_dtype_rgb_type(data_shape, data_dtype):
                         self.__data_range = (0, 255)
-                    elif Image.is_shape_and_dtype_complex_type(data_shape, data_dtype):
-                        self.__data_range = (numpy.amin(display_data), numpy.amax(display_data))
                     else:
-                        self.__data_range = (numpy.amin(display_data), numpy.amax(display_data))
+                        self.__data_range = self.__calculate_data_range(display_data)
                 else:
                     self.__data_range = None
-                if self.__data_range is not None:
-                    if math.isnan(self.__data_range[0]) or math.isnan(self.__data_range[1]) or math.isinf(self.__data_range[0]) or math.isinf(self.__data_range[1]):
-                        self.__data_range = (0.0, 0.0)
-                    if numpy.issubdtype(type(self.__data_range[0]), numpy.bool_):
-                        self.__data_range = (int(self.__data_range[0]), self.__data_range[1])
-                    if numpy.issubdtype(type(self.__data_range[1]), numpy.bool_):
-                        self.__data_range = (self.__data_range[0], int(self.__data_range[1]))
             return self.__data_range
 
+    @property
+    def estimated_data_range(self) -> typing.Optional[typing.Tuple[float, float]]:
+        """Return the data range used to calculate the auto display range.
+
+        If an estimate mode is specified and the display data has more than DATA_RANGE_ESTIMATE_THRESHOLD values,
+        the range is calculated from a sample of the display data. The estimate may miss sparse extremes such as a
+        few hot pixels, which is acceptable for auto display limits but not for statistics, so it is only used for
+        the display range. Otherwise, this is the exact data range.
+        """
+        with self.__lock:
+            if self.__estimated_data_range_dirty:
+                self.__estimated_data_range_dirty = False
+                display_data_and_metadata = self.display_data_and_metadata
+                display_data = display_data_and_metadata.data if display_data_and_metadata else None
+                data_and_metadata = self.__data_and_metadata
+                if (display_data is not None and display_data.shape and data_and_metadata and self.__data_range_estimate_mode and
+                        display_data.size > DATA_RANGE_ESTIMATE_THRESHOLD and
+                        not Image.is_shape_and_dtype_rgb_type(data_and_metadata.data_shape, data_and_metadata.data_dtype)):
+                    data_sample = get_data_sample(display_data, DATA_RANGE_ESTIMATE_SAMPLE_COUNT, self.__data_range_estimate_mode)
+                    self.__estimated_data_range = self.__calculate_data_range(data_sample)
+                    self.__estimated_data_range_error_bound = calculate_data_range_error_bound(data_sample.shape[0])
+                else:
+                    self.__estimated_data_range = self.data_range
+                    self.__estimated_data_range_error_bound = 0.0
+            return self.__estimated_data_range
+
+    @property
+    def estimated_data_range_error_bound(self) -> float:
+        """Return the error bound of the estimated data range; zero if it is exact.
+
+        See calculate_data_range_error_bound.
+        """
+        with self.__lock:
+            return self.__estimated_data_range_error_bound if self.estimated_data_range is not None else 0.0
+
     @property
     def display_range(self) -> typing.Optional[typing.Tuple[float, float]]:
         with self.__lock:
             if self.__display_range_dirty:
                 self.__display_range_dirty = False
-                self.__display_range = calculate_display_range(self.__display_limits, self.data_range, self.data_sample, self.__data_and_metadata, self.__complex_display_type)
+                self.__display_range = calculate_display_range(self.__display_limits, self.estimated_data_range, self.data_sample, self.__data_and_metadata, self.__complex_display_type)
             return self.__display_range
 
     @property
@@ -428,7 +649,7 @@ class DisplayValues:
                     if Image.is_shape_and_dtype_rgb_type(data_shape, data_dtype):
                         self.__data_sample = None
                     elif Image.is_shape_and_dtype_complex_type(data_shape, data_dtype):
-                        self.__data_sample = numpy.sort(numpy.random.choice(display_data.reshape(numpy.product(display_data.shape, dtype=numpy.uint64)), 200))  # type: ignore
+                        self.__data_sample = numpy.sort(get_data_sample(display_data, DATA_SAMPLE_COUNT, "random"))
                     else:
                         self.__data_sample = None
                 else:
@@ -440,15 +661,75 @@ class DisplayValues:
         with self.__lock:
             if self.__display_rgba_dirty:
                 self.__display_rgba_dirty = False
+                display_rgba_data = self.__calculate_display_rgba_from_lookup_table()
+                if display_rgba_data is not None:
+                    self.__display_rgba = display_rgba_data
+                    return self.__display_rgba
                 display_data = self.adjusted_data_and_metadata
                 if display_data is not None and self.__data_and_metadata is not None:
-                    if self.data_range is not None:  # workaround until validating and retrieving data stats is an atomic operation
+                    if self.estimated_data_range is not None:  # workaround until validating and retrieving data stats is an atomic operation
                         # display_range is just display_limits but calculated if display_limits is None
                         display_range = self.transformed_display_range
                         display_rgba = Core.function_display_rgba(display_data, display_range, self.__color_map_data)
                         self.__display_rgba = display_rgba.data if display_rgba else None
             return self.__display_rgba
 
+    def __get_integer_display_data(self) -> typing.Optional[_ImageDataType]:
+        # return the display data if it is integer data large enough to be mapped through a lookup table.
+        display_xdata = self.display_data_and_metadata
+        display_data = display_xdata.data if display_xdata else None
+        if display_data is not None and display_data.dtype in ColorMaps.INTEGER_LOOKUP_TABLE_DTYPES and display_data.ndim in (1, 2):
+            if display_data.size >= numpy.iinfo(display_data.dtype).max + 1:
+                return display_data
+        return None
+
+    def __calculate_display_rgba_from_lookup_table(self) -> typing.Optional[_ImageDataType]:
+        # map integer display data directly to rgba through a lookup table indexed by value, combining the
+        # adjustments, display range, and color map; this skips the float normalized and adjusted data.
+        display_data = self.__get_integer_display_data()
+        if display_data is None or self.__data_and_metadata is None or self.estimated_data_range is None:
+            return None
+        transformed_display_range = self.transformed_display_range
+        if self.__adjustments:
+            display_range = self.display_range
+            histogram = self.adjustment_histogram
+            if display_range is None or histogram is None:
+                return None
+            adjustments = [adjustment for adjustment in map(adjustment_factory, self.__adjustments) if adjustment]
+            adjustment_lookup_table = calculate_adjustment_lookup_table(adjustments, display_range, histogram)
+            values = apply_adjustment_lookup_table(numpy.arange(numpy.iinfo(display_data.dtype).max + 1, dtype=display_data.dtype), display_range, adjustment_lookup_table)
+            lookup_table = ColorMaps.create_rgba_lookup_table(values, transformed_display_range, self.__color_map_data)
+        else:
+            lookup_table = ColorMaps.get_integer_rgba_lookup_table(display_data.dtype, transformed_display_range, self.__color_map_data)
+        if display_data.ndim == 1:
+            display_data = display_data.reshape(1, -1)
+        display_rgba = self.__get_buffer("display_rgba", display_data.shape, lookup_table.dtype)
+        return typing.cast(_ImageDataType, numpy.take(lookup_table, display_data, out=display_rgba, mode="clip"))
+
+    def prepare_display(self, is_cancelled: typing.Optional[typing.Callable[[], bool]] = None) -> bool:
+        """Calculate the display data required by a renderer, stage by stage.
+
+        The adjusted data and display range are always calculated; the display rgba is calculated too unless the adjusted data is float32, in which case the renderer applies the color map itself.
+
+        Stages already calculated are cached, so cancelling between stages does not lose work. Return True if all
+        stages were calculated, False if is_cancelled returned True before finishing.
+
+        Thread safe. Intended to be called from a render thread.
+        """
+        if is_cancelled and is_cancelled():
+            return False
+        display_xdata = self.adjusted_data_and_metadata
+        if display_xdata is None or self.estimated_data_range is None:
+            return True
+        if is_cancelled and is_cancelled():
+            return False
+        self.display_range
+        if display_xdata.data_dtype != numpy.float32:
+            if is_cancelled and is_cancelled():
+                return False
+            self.display_rgba
+        return True
+
     @property
     def display_rgba_timestamp(self) -> typing.Optional[datetime.datetime]:
         return self.__display_rgba_timestamp
@@ -465,25 +746,59 @@ class DisplayValues:
                     # normalize the data to [0, 1].
                     m = 1 / (display_limit_high - display_limit_low) if display_limit_high != display_limit_low else 0.0
                     b = -display_limit_low
-                    self.__normalized_data_and_metadata = float(m) * (display_data_and_metadata + float(b))
+                    display_data = display_data_and_metadata.data
+                    normalized_data = self.__get_buffer("normalized", display_data.shape, numpy.result_type(display_data, float(b)))
+                    if self.__get_integer_display_data() is not None:
+                        # integer data is normalized through a lookup table indexed by value.
+                        lookup_table = float(m) * (numpy.arange(numpy.iinfo(display_data.dtype).max + 1, dtype=display_data.dtype) + float(b))
+                        numpy.take(lookup_table, display_data, out=normalized_data, mode="clip")
+                    else:
+                        numpy.add(display_data, float(b), out=normalized_data)
+                        numpy.multiply(normalized_data, float(m), out=normalized_data)
+                    self.__normalized_data_and_metadata = DataAndMetadata.new_data_and_metadata(normalized_data,
+                                                                                               intensity_calibration=display_data_and_metadata.intensity_calibration,
+                                                                                               dimensional_calibrations=display_data_and_metadata.dimensional_calibrations,
+                                                                                               data_descriptor=display_data_and_metadata.data_descriptor)
             return self.__normalized_data_and_metadata
 
+    @property
+    def adjustment_histogram(self) -> typing.Optional[_ImageDataType]:
+        """Return the histogram of the normalized display data, calculated from a strided sample of the data."""
+        with self.__lock:
+            if self.__adjustment_histogram_dirty:
+                self.__adjustment_histogram_dirty = False
+                display_data_and_metadata = self.display_data_and_metadata
+                display_data = display_data_and_metadata.data if display_data_and_metadata else None
+                display_range = self.display_range
+                if display_data is not None and display_range is not None:
+                    display_limit_low, display_limit_high = display_range
+                    m = 1 / (display_limit_high - display_limit_low) if display_limit_high != display_limit_low else 0.0
+                    sample = (get_strided_sample(display_data, ADJUSTMENT_HISTOGRAM_SAMPLE_COUNT) - display_limit_low) * m
+                    sample = numpy.clip(sample[numpy.isfinite(sample)], 0.0, 1.0)
+                    self.__adjustment_histogram = numpy.histogram(sample, ADJUSTMENT_HISTOGRAM_BINS, range=(0.0, 1.0))[0].astype(numpy.float64)
+                else:
+                    self.__adjustment_histogram = None
+            return self.__adjustment_histogram
+
     @property
     def adjusted_data_and_metadata(self) -> typing.Optional[DataAndMetadata.DataAndMetadata]:
         with self.__lock:
             if self.__adjusted_data_and_metadata_dirty:
                 self.__adjusted_data_and_metadata_dirty = False
                 if self.__adjustments:
-                    display_xdata = self.normalized_data_and_metadata
-                    for adjustment_d in self.__adjustments:
-                        adjustment = adjustment_factory(adjustment_d)
-                        if adjustment:
-                            display_range = self.display_range
-                            if display_xdata and display_range is not None:
-                                display_data = display_xdata.data
-                                if display_data is not None:
-                                    display_xdata = DataAndMetadata.new_data_and_metadata(adjustment.transform(display_data, display_range))
-                    self.__adjusted_data_and_metadata = display_xdata
+                    # the adjustments are combined into a single lookup table, calculated from the histogram of
+                    # the display data, and applied directly to the display data.
+                    display_xdata = self.display_data_and_metadata
+                    display_data = display_xdata.data if display_xdata else None
+                    display_range = self.display_range
+                    histogram = self.adjustment_histogram
+                    self.__adjusted_data_and_metadata = None
+                    if display_data is not None and display_range is not None and histogram is not None:
+                        adjustments = [adjustment for adjustment in map(adjustment_factory, self.__adjustments) if adjustment]
+                        lookup_table = calculate_adjustment_lookup_table(adjustments, display_range, histogram)
+                        adjusted_data = self.__get_buffer("adjusted", display_data.shape, numpy.float32)
+                        indexes = self.__get_buffer("adjusted_indexes", display_data.shape, numpy.int32)
+                        self.__adjusted_data_and_metadata = DataAndMetadata.new_data_and_metadata(apply_adjustment_lookup_table(display_data, display_range, lookup_table, adjusted_data, indexes))
                 else:
                     self.__adjusted_data_and_metadata = self.display_data_and_metadata
             return self.__adjusted_data_and_metadata
@@ -523,6 +838,10 @@ class DisplayValues:
 
 
 class DisplayDataChannel(Persistence.PersistentObject):
+    # the sampling mode used to estimate the data range for the auto display range of very large display data
+    # ('strided' or 'random'), or None to always use the exact data range. see DATA_RANGE_ESTIMATE_THRESHOLD.
+    data_range_estimate_mode: typing.Optional[str] = "strided"
+
     def __init__(self, data_item: typing.Optional[DataItem.DataItem] = None) -> None:
         super().__init__()
 
@@ -562,6 +881,12 @@ class DisplayDataChannel(Persistence.PersistentObject):
         self.__color_map_data: typing.Optional[_RGBA32Type] = None
         self.modified_state = 0
 
+        # intermediate display arrays are reused by the display values of subsequent frames. the most recently
+        # finalized display values keep their buffers; older ones release them. see DISPLAY_BUFFER_GENERATIONS.
+        self.__display_buffer_pool = DisplayBufferPool()
+        self.__finalized_display_values: typing.List[DisplayValues] = list()
+        self.__finalized_display_values_lock = threading.RLock()
+
         self.display_values_changed_event = Event.Event()
         self.display_data_will_change_event = Event.Event()
         self.data_item_proxy_changed_event = Event.Event()
@@ -959,7 +1284,7 @@ class DisplayDataChannel(Persistence.PersistentObject):
         return self.__data_item.get_data_value(pos) if self.__data_item else None
 
     def _get_data_metadata(self) -> typing.Optional[DataAndMetadata.DataMetadata]:
-        return self.__data_item.data_metadata if self.__data_item else None
+        return self.__data_item._get_data_metadata_without_metadata() if self.__data_item else None
 
     def __validate_display_limits(self, value: typing.Any) -> typing.Any:
         if value is not None:
@@ -1167,16 +1492,28 @@ class DisplayDataChannel(Persistence.PersistentObject):
             if not self.__current_display_values and self.__data_item:
                 self.__current_data_item = self.__data_item
                 self.__current_data_item_modified_count = self.__data_item.modified_count if self.__data_item else 0
-                self.__current_display_values = DisplayValues(self.__data_item.xdata, self.sequence_index, self.collection_index, self.slice_center, self.slice_width, self.display_limits, self.complex_display_type, self.__color_map_data, self.brightness, self.contrast, self.adjustments)
+                self.__current_display_values = DisplayValues(self.__data_item.xdata, self.sequence_index, self.collection_index, self.slice_center, self.slice_width, self.display_limits, self.complex_display_type, self.__color_map_data, self.brightness, self.contrast, self.adjustments, data_range_estimate_mode=DisplayDataChannel.data_range_estimate_mode, buffer_pool=self.__display_buffer_pool)
 
                 def finalize(display_values: DisplayValues) -> None:
                     self.__last_display_values = display_values
+                    self.__release_finalized_display_values_buffers(display_values)
                     self.display_values_changed_event.fire()
 
                 self.__current_display_values.on_finalize = finalize
             return self.__current_display_values
         return self.__last_display_values
 
+    def __release_finalized_display_values_buffers(self, display_values: DisplayValues) -> None:
+        # display values may be finalized by more than one display; only track each one once.
+        with self.__finalized_display_values_lock:
+            if display_values in self.__finalized_display_values:
+                return
+            self.__finalized_display_values.append(display_values)
+            released_display_values_list = self.__finalized_display_values[:-DISPLAY_BUFFER_GENERATIONS]
+            del self.__finalized_display_values[:-DISPLAY_BUFFER_GENERATIONS]
+        for released_display_values in released_display_values_list:
+            released_display_values.release_buffers()
+
     def increment_display_ref_count(self, amount: int = 1) -> None:
         """Increment display reference count to indicate this library item is currently displayed."""
         display_ref_count = self.__display_ref_count
@@ -1848,7 +2185,8 @@ class DisplayItem(Persistence.PersistentObject):
     def __update_displays(self) -> None:
         for display_data_channel in self.display_data_channels:
             display_data_channel.update_display_data()
-        xdata_list = [data_item.xdata if data_item else None for data_item in self.data_items]
+        # only the shape and calibrations are used here, so avoid loading the metadata of unused data items.
+        xdata_list = [data_item._get_data_metadata_without_metadata() if data_item else None for data_item in self.data_items]
         dimensional_calibrations: typing.Optional[DataAndMetadata.CalibrationListType] = None
         intensity_calibration: typing.Optional[Calibration.Calibration] = None
         scales: typing.Tuple[float, float] = 0.0, 1.0
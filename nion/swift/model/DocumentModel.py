@@ -130,6 +130,17 @@ class ComputationQueueItem:
                 activity.state = "merging"
             return activity
 
+    def get_ready_time(self, backlog: int) -> float:
+        # return the earliest time (perf_counter) at which the computation should be evaluated again.
+        # the interval since the last evaluation is proportional to the measured duration of the last evaluation,
+        # so that slow computations do not monopolize the computation thread, and grows with the number of other
+        # pending computations (backlog). the minimum period only applies when other computations are waiting.
+        computation = self.computation
+        interval = computation.last_evaluate_duration * DocumentModel.computation_min_factor * (1 + backlog)
+        if backlog > 0:
+            interval = max(interval, DocumentModel.computation_min_period)
+        return computation.last_evaluate_data_time + min(interval, DocumentModel.computation_max_period)
+
     def recompute(self) -> typing.Optional[ComputationMerge]:
         # evaluate the computation in a thread safe manner
         # returns a list of functions that must be called on the main thread to finish the recompute action
@@ -145,31 +156,23 @@ class ComputationQueueItem:
             try:
                 api = PlugInManager.api_broker_fn("~1.0", None)
                 if not data_item:
-                    start_time = time.perf_counter()
                     compute_obj, error_text = computation.evaluate(api)
-                    eval_time = time.perf_counter() - start_time
                     if error_text and computation.error_text != error_text:
                         def update_error_text(computation: Symbolic.Computation) -> None:
                             computation.error_text = error_text
 
                         pending_data_item_merge = ComputationMerge(computation, self.__release_activity(), functools.partial(update_error_text, computation))
                     else:
-                        throttle_time = max(DocumentModel.computation_min_period - (time.perf_counter() - computation.last_evaluate_data_time), 0)
-                        time.sleep(max(throttle_time, min(eval_time * DocumentModel.computation_min_factor, 1.0)))
                         if self.valid and compute_obj:  # TODO: race condition for 'valid'
                             pending_data_item_merge = ComputationMerge(computation, self.__release_activity(), functools.partial(compute_obj.commit))
                         else:
                             pending_data_item_merge = ComputationMerge(computation, self.__release_activity())
                 else:
-                    start_time = time.perf_counter()
                     data_item_clone = data_item.clone()
                     data_item_data_modified = data_item.data_modified or datetime.datetime.min
                     data_item_clone_recorder = Recorder.Recorder(data_item_clone)
                     api_data_item = api._new_api_object(data_item_clone)
                     error_text = computation.evaluate_with_target(api, api_data_item)
-                    eval_time = time.perf_counter() - start_time
-                    throttle_time = max(DocumentModel.computation_min_period - (time.perf_counter() - computation.last_evaluate_data_time), 0)
-                    time.sleep(max(throttle_time, min(eval_time * DocumentModel.computation_min_factor, 1.0)))
                     if self.valid:  # TODO: race condition for 'valid'
                         def data_item_merge(computation: Symbolic.Computation, data_item: DataItem.DataItem, data_item_clone: DataItem.DataItem, data_item_clone_recorder: Recorder.Recorder) -> None:
                             # merge the result item clones back into the document. this method is guaranteed to run at
@@ -697,6 +700,10 @@ class DocumentModel(Observable.Observable, ReferenceCounting.ReferenceCounted, D
 
     computation_min_period = 0.0
     computation_min_factor = 0.0
+    computation_max_period = 1.0
+
+    # the maximum time (seconds) spent applying pending data item updates during each periodic call.
+    data_item_updates_time_budget = 0.02
 
     def __init__(self, project: Project.Project, *, storage_cache: typing.Optional[Cache.CacheLike] = None) -> None:
         super().__init__()
@@ -747,6 +754,7 @@ class DocumentModel(Observable.Observable, ReferenceCounting.ReferenceCounted, D
         self.__computation_queue_lock = threading.RLock()
         self.__computation_pending_queue: typing.List[ComputationQueueItem] = list()
         self.__computation_active_item: typing.Optional[ComputationQueueItem] = None
+        self.__computation_queue_changed_event = threading.Event()
         self.__data_items: typing.List[DataItem.DataItem] = list()
         self.__display_items: typing.List[DisplayItem.DisplayItem] = list()
         self.__data_structures: typing.List[DataStructure.DataStructure] = list()
@@ -762,7 +770,8 @@ class DocumentModel(Observable.Observable, ReferenceCounting.ReferenceCounted, D
             data_group.connect_display_items(self.__resolve_display_item_specifier)
 
         self.__pending_data_item_updates_lock = threading.RLock()
-        self.__pending_data_item_updates: typing.List[DataItem.DataItem] = list()
+        # pending updates are keyed by data item and kept in insertion order (dicts are ordered).
+        self.__pending_data_item_updates: typing.Dict[DataItem.DataItem, None] = dict()
 
         self.__pending_data_item_merge_lock = threading.RLock()
         self.__pending_data_item_merge: typing.Optional[ComputationMerge] = None
@@ -846,6 +855,7 @@ class DocumentModel(Observable.Observable, ReferenceCounting.ReferenceCounted, D
             if self.__computation_active_item:
                 self.__computation_active_item.valid = False
                 self.__computation_active_item = None
+        self.__computation_queue_changed_event.set()
 
         with self.__pending_data_item_merge_lock:
             if self.__pending_data_item_merge:
@@ -1065,8 +1075,7 @@ class DocumentModel(Observable.Observable, ReferenceCounting.ReferenceCounted, D
             if self.__computation_active_item and library_computation is self.__computation_active_item.computation:
                 self.__computation_active_item.valid = False
         with self.__pending_data_item_updates_lock:
-            if data_item in self.__pending_data_item_updates:
-                self.__pending_data_item_updates.remove(data_item)
+            self.__pending_data_item_updates.pop(data_item, None)
         # remove data item from any selections
         self.data_item_will_be_removed_event.fire(data_item)
         # remove it from the persistent_storage
@@ -1504,6 +1513,7 @@ class DocumentModel(Observable.Observable, ReferenceCounting.ReferenceCounted, D
                     return
             computation_queue_item = ComputationQueueItem(computation=computation)
             self.__computation_pending_queue.append(computation_queue_item)
+        self.__computation_queue_changed_event.set()
         self.dispatch_task(self.__recompute)
 
     def __establish_computation_dependencies(self, old_inputs: typing.Set[Persistence.PersistentObject], new_inputs: typing.Set[Persistence.PersistentObject], old_outputs: typing.Set[Persistence.PersistentObject], new_outputs: typing.Set[Persistence.PersistentObject]) -> None:
@@ -1753,15 +1763,34 @@ class DocumentModel(Observable.Observable, ReferenceCounting.ReferenceCounted, D
     def start_dispatcher(self) -> None:
         self.__computation_thread_pool.start(1)
 
+    def __pop_ready_computation_queue_item(self) -> typing.Tuple[typing.Optional[ComputationQueueItem], float]:
+        # return the first pending computation queue item that is ready to be evaluated; or, if none are ready,
+        # None and the time to wait until the next one is ready. requests for a computation that arrive while its
+        # queue item is waiting are coalesced into the single queue item. call with the queue lock held.
+        current_time = time.perf_counter()
+        backlog = len(self.__computation_pending_queue) - 1
+        wait_time = DocumentModel.computation_max_period
+        for index, computation_queue_item in enumerate(self.__computation_pending_queue):
+            ready_time = computation_queue_item.get_ready_time(backlog)
+            if ready_time <= current_time:
+                return self.__computation_pending_queue.pop(index), 0.0
+            wait_time = min(wait_time, ready_time - current_time)
+        return None, wait_time
+
     def __recompute(self) -> None:
         while True:
             computation_queue_item = None
+            wait_time = 0.0
             with self.__computation_queue_lock:
                 if not self.__computation_active_item and self.__computation_pending_queue:
-                    computation_queue_item = self.__computation_pending_queue.pop(0)
+                    computation_queue_item, wait_time = self.__pop_ready_computation_queue_item()
                     self.__computation_active_item = computation_queue_item
+                    self.__computation_queue_changed_event.clear()
 
-            if computation_queue_item:
+            if wait_time > 0.0:
+                # nothing is ready yet; wait until something is ready or the queue changes, then check again.
+                self.__computation_queue_changed_event.wait(wait_time)
+            elif computation_queue_item:
                 # an item was put into the active queue, so compute it, then merge
                 pending_data_item_merge = computation_queue_item.recompute()
                 if pending_data_item_merge is not None:
@@ -1948,27 +1977,14 @@ class DocumentModel(Observable.Observable, ReferenceCounting.ReferenceCounted, D
             return None
 
     def _queue_data_item_update(self, data_item: DataItem.DataItem, data_and_metadata: DataAndMetadata.DataAndMetadata) -> None:
-        # put the data update to data_item into the pending_data_item_updates list.
+        # put the data update to data_item into the pending_data_item_updates map.
         # the pending_data_item_updates will be serviced when the main thread calls
-        # perform_data_item_updates.
+        # perform_data_item_updates. if the data item is already pending, the new data
+        # replaces the old data and the data item keeps its place in the queue.
         if data_item:
             with self.__pending_data_item_updates_lock:
-                found = False
-                pending_data_item_updates = list()
-                for data_item_ in self.__pending_data_item_updates:
-                    # does it match? if so and not yet found, put the new data into the matching
-                    # slot; but then filter the rest of the matches.
-                    if data_item_ == data_item:
-                        if not found:
-                            data_item.set_pending_xdata(data_and_metadata)
-                            pending_data_item_updates.append(data_item)
-                            found = True
-                    else:
-                        pending_data_item_updates.append(data_item_)
-                if not found:  # if not added yet, add it
-                    data_item.set_pending_xdata(data_and_metadata)
-                    pending_data_item_updates.append(data_item)
-                self.__pending_data_item_updates = pending_data_item_updates
+                data_item.set_pending_xdata(data_and_metadata)
+                self.__pending_data_item_updates.setdefault(data_item, None)
 
     def update_data_item_partial(self, data_item: DataItem.DataItem, data_metadata: DataAndMetadata.DataMetadata,
                                  data_and_metadata: DataAndMetadata.DataAndMetadata, src_slice: typing.Sequence[slice],
@@ -1978,15 +1994,31 @@ class DocumentModel(Observable.Observable, ReferenceCounting.ReferenceCounted, D
                 assert data_metadata
                 assert data_item.data_shape == data_metadata.data_shape
                 data_item.queue_partial_update(data_and_metadata, src_slice=src_slice, dst_slice=dst_slice, metadata=data_metadata)
-                self.__pending_data_item_updates.append(data_item)
+                self.__pending_data_item_updates.setdefault(data_item, None)
+
+    def perform_data_item_updates(self, time_budget: typing.Optional[float] = None) -> bool:
+        """Apply pending data item updates, oldest first.
 
-    def perform_data_item_updates(self) -> None:
+        Only updates pending at the start of the call are applied. If time_budget (seconds) is specified, stop once
+        the budget is used; the remaining updates stay pending for the next call. At least one update is applied per
+        call. Returns True if updates remain pending.
+        """
         assert threading.current_thread() == threading.main_thread()
+        end_time = time.perf_counter() + time_budget if time_budget is not None else None
         with self.__pending_data_item_updates_lock:
-            pending_data_item_updates = self.__pending_data_item_updates
-            self.__pending_data_item_updates = list()
-        for data_item in pending_data_item_updates:
+            pending_count = len(self.__pending_data_item_updates)
+        while pending_count > 0:
+            pending_count -= 1
+            with self.__pending_data_item_updates_lock:
+                if not self.__pending_data_item_updates:
+                    break
+                data_item = next(iter(self.__pending_data_item_updates))
+                self.__pending_data_item_updates.pop(data_item)
             data_item.update_to_pending_xdata()
+            if end_time is not None and time.perf_counter() >= end_time:
+                break
+        with self.__pending_data_item_updates_lock:
+            return bool(self.__pending_data_item_updates)
 
     # for testing
     def _get_pending_data_item_updates_count(self) -> int:
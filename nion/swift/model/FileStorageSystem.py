@@ -1,9 +1,12 @@
 from __future__ import annotations
 
 import abc
+import concurrent.futures
 import contextlib
 import copy
 import datetime
+import functools
+import hashlib
 import json
 import logging
 import numpy
@@ -11,6 +14,7 @@ import numpy.typing
 import os.path
 import pathlib
 import shutil
+import struct
 import threading
 import typing
 import uuid
@@ -84,6 +88,83 @@ class DataItemStorageAdapter:
         return self.__storage_handler.read_data()
 
 
+MIGRATION_WORKER_COUNT = min(8, os.cpu_count() or 1)
+
+_COPY_CHUNK_SIZE = 16 * 1024 * 1024
+_FICLONE = 0x40049409  # linux ioctl to make a copy-on-write clone (reflink) of a file.
+
+
+def _file_checksum(file_path: typing.Union[str, pathlib.Path]) -> str:
+    checksum = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(_COPY_CHUNK_SIZE), b""):
+            checksum.update(chunk)
+    return checksum.hexdigest()
+
+
+def _reflink_file(source_path: typing.Union[str, pathlib.Path], target_path: typing.Union[str, pathlib.Path]) -> bool:
+    """Make target a copy-on-write clone of source if the file system supports it. Return whether it succeeded."""
+    try:
+        import fcntl
+    except ImportError:
+        return False
+    try:
+        with open(source_path, "rb") as src, open(target_path, "wb") as dst:
+            fcntl.ioctl(dst.fileno(), _FICLONE, src.fileno())
+        return True
+    except OSError:
+        with contextlib.suppress(OSError):
+            os.remove(target_path)
+        return False
+
+
+def copy_file_durably(source_path: typing.Union[str, pathlib.Path], target_path: typing.Union[str, pathlib.Path]) -> None:
+    """Copy source to target, preferring a copy-on-write clone, and verify the copy.
+
+    A clone shares the data of the source, so it is only checked for its size. A plain copy is checksummed while it is
+    written and flushed to disk; its cached pages are then dropped where supported so that reading it back to verify
+    the checksum reads what was written to disk.
+
+    Hard links are not used since the migrated file gets its properties rewritten in place, which would also modify
+    the file in the old library. Raises IOError if the copy does not match the source; the target is removed in that
+    case.
+    """
+    if _reflink_file(source_path, target_path):
+        is_valid = os.path.getsize(target_path) == os.path.getsize(source_path)
+    else:
+        checksum = hashlib.sha256()
+        with open(source_path, "rb") as src, open(target_path, "wb") as dst:
+            for chunk in iter(lambda: src.read(_COPY_CHUNK_SIZE), b""):
+                checksum.update(chunk)
+                dst.write(chunk)
+            dst.flush()
+            os.fsync(dst.fileno())
+            if hasattr(os, "posix_fadvise"):
+                os.posix_fadvise(dst.fileno(), 0, 0, os.POSIX_FADV_DONTNEED)
+        is_valid = _file_checksum(target_path) == checksum.hexdigest()
+    shutil.copystat(source_path, target_path)
+    if not is_valid:
+        with contextlib.suppress(OSError):
+            os.remove(target_path)
+        raise IOError(f"Mismatch copying {source_path} to {target_path}")
+
+
+def _read_reader_info(source_project_storage_system: ProjectStorageSystem, storage_handler: StorageHandler.StorageHandler) -> typing.Optional[ReaderInfo]:
+    try:
+        large_format = source_project_storage_system._is_storage_handler_large_format(storage_handler)
+        storage_handler_properties = storage_handler.read_properties()
+        assert storage_handler_properties is not None
+        properties = Migration.transform_to_latest(storage_handler_properties)
+        return ReaderInfo(properties, [False], large_format, storage_handler, storage_handler.reference)
+    except Exception:
+        storage_handler.close()
+        logging.debug("Error reading %s", storage_handler.reference)
+        import traceback
+        traceback.print_exc()
+        traceback.print_stack()
+    return None
+
+
 def migrate_to_latest(source_project_storage_system: ProjectStorageSystem,
                       target_project_storage_system: typing.Optional[ProjectStorageSystem] = None) -> None:
     """Migrate the library data in source to target, upgrading them in the process.
@@ -112,21 +193,11 @@ def migrate_to_latest(source_project_storage_system: ProjectStorageSystem,
         # next, construct a list of ReaderInfo objects. ReaderInfo stores the properties portion of the data item,
         # whether it has been changed during migration, whether it is a large format file, its storage handler,
         # and an identifier key. this loop skips files that cannot be read but prints an error message.
-        preliminary_reader_info_list: typing.List[ReaderInfo] = list()
+        # reading the properties is mostly file i/o, so it is done on worker threads.
+        with concurrent.futures.ThreadPoolExecutor(max_workers=MIGRATION_WORKER_COUNT) as executor:
+            reader_infos = list(executor.map(functools.partial(_read_reader_info, source_project_storage_system), storage_handlers))
+        preliminary_reader_info_list: typing.List[ReaderInfo] = [reader_info for reader_info in reader_infos if reader_info]
         for storage_handler in storage_handlers:
-            try:
-                large_format = source_project_storage_system._is_storage_handler_large_format(storage_handler)
-                storage_handler_properties = storage_handler.read_properties()
-                assert storage_handler_properties is not None
-                properties = Migration.transform_to_latest(storage_handler_properties)
-                reader_info = ReaderInfo(properties, [False], large_format, storage_handler, storage_handler.reference)
-                preliminary_reader_info_list.append(reader_info)
-            except Exception:
-                storage_handler.close()
-                logging.debug("Error reading %s", storage_handler.reference)
-                import traceback
-                traceback.print_exc()
-                traceback.print_stack()
             storage_handler.prepare_move()
 
         # now read the library properties which contains the data item deletions. data item deletions exist to
@@ -150,30 +221,50 @@ def migrate_to_latest(source_project_storage_system: ProjectStorageSystem,
 
         # finally, for each item in the preliminary_reader_info_list, confirm that it is the latest version and then
         # check whether it has a unique UUID that hasn't been deleted, and, if so, try to copy the data item to its
-        # new location. if successful, mark the data item as having been added to the new library and add any
-        # preliminary library updates to the library updates list to be applied later.
-        count = len(preliminary_reader_info_list)
-        for index, reader_info in enumerate(preliminary_reader_info_list):
+        # new location. the copies are independent of each other and are done on worker threads. if successful, mark
+        # the data item as having been added to the new library and add any preliminary library updates to the
+        # library updates list to be applied later.
+        migration_candidates: typing.List[typing.Tuple[uuid.UUID, ReaderInfo]] = list()
+        candidate_uuids: typing.Set[uuid.UUID] = set()
+        for reader_info in preliminary_reader_info_list:
             properties = reader_info.properties
             try:
                 version = properties.get("version", 0)
                 if version == DataItem.DataItem.writer_version:
                     data_item_uuid = uuid.UUID(properties["uuid"])
-                    if data_item_uuid not in data_item_uuids:
+                    if data_item_uuid not in data_item_uuids and data_item_uuid not in candidate_uuids:
                         if not str(data_item_uuid) in deletions:
-                            new_reader_info = target_project_storage_system._migrate_data_item(reader_info, index, count)
-                            if new_reader_info:
-                                reader_info_list.append(new_reader_info)
-                                data_item_uuids.add(data_item_uuid)
-                                library_update = preliminary_library_updates.get(data_item_uuid)
-                                if library_update:
-                                    library_updates[data_item_uuid] = library_update
+                            migration_candidates.append((data_item_uuid, reader_info))
+                            candidate_uuids.add(data_item_uuid)
             except Exception:
                 logging.debug(f"Error reading {reader_info.storage_handler.reference}")
                 import traceback
                 traceback.print_exc()
                 traceback.print_stack()
 
+        count = len(migration_candidates)
+
+        def migrate_data_item(index: int, reader_info: ReaderInfo) -> typing.Optional[ReaderInfo]:
+            try:
+                return target_project_storage_system._migrate_data_item(reader_info, index, count)
+            except Exception:
+                logging.debug(f"Error reading {reader_info.storage_handler.reference}")
+                import traceback
+                traceback.print_exc()
+                traceback.print_stack()
+            return None
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=MIGRATION_WORKER_COUNT) as executor:
+            new_reader_infos = list(executor.map(migrate_data_item, range(len(migration_candidates)), [reader_info for _, reader_info in migration_candidates]))
+
+        for (data_item_uuid, reader_info), new_reader_info in zip(migration_candidates, new_reader_infos):
+            if new_reader_info:
+                reader_info_list.append(new_reader_info)
+                data_item_uuids.add(data_item_uuid)
+                library_update = preliminary_library_updates.get(data_item_uuid)
+                if library_update:
+                    library_updates[data_item_uuid] = library_update
+
         for storage_handler in storage_handlers:
             storage_handler.close()
 
@@ -250,6 +341,18 @@ class PersistentStorageSystem(Persistence.PersistentStorageInterface):
         with self.__properties_lock:
             self.__properties = self._read_properties()
 
+    def _load_deferred_properties(self) -> None:
+        """Load any properties that were deferred by load_properties into internal storage.
+
+        Subclasses that read some properties lazily override this. Called before items are inserted, removed, or
+        looked up in internal storage.
+        """
+        pass
+
+    def _item_properties_modified(self, item: Persistence.PersistentObject) -> None:
+        """Called when the properties of the item in internal storage are modified or the item is inserted."""
+        pass
+
     def get_storage_properties(self) -> PersistentDictType:
         """Return the internal properties. Callers should not modify and it is ok to not return a copy."""
         return self.__properties
@@ -275,6 +378,7 @@ class PersistentStorageSystem(Persistence.PersistentStorageInterface):
         assert storage_dict is not None
         with self.__properties_lock:
             storage_dict["modified"] = item.modified.isoformat()
+        self._item_properties_modified(item)
         persistent_object_parent = item.persistent_object_parent
         parent = persistent_object_parent.parent if persistent_object_parent else None
         if parent:
@@ -285,6 +389,7 @@ class PersistentStorageSystem(Persistence.PersistentStorageInterface):
         # insert item in internal storage
         item.persistent_dict = item.write_to_dict()
         item.persistent_storage = self
+        self._item_properties_modified(item)
         self._insert_item(parent, name, before_index, item)
 
     def remove_item(self, parent: Persistence.PersistentObject, name: str, index: int, item: Persistence.PersistentObject) -> None:
@@ -293,6 +398,7 @@ class PersistentStorageSystem(Persistence.PersistentStorageInterface):
         item.persistent_storage = typing.cast(Persistence.PersistentStorageInterface, None)
 
     def _insert_item(self, parent: Persistence.PersistentObject, name: str, before_index: int, item: Persistence.PersistentObject) -> None:
+        self._load_deferred_properties()
         storage_dict = self.__update_modified_and_get_storage_dict(parent)
         with self.__properties_lock:
             item_list = storage_dict.setdefault(name, list())
@@ -301,6 +407,7 @@ class PersistentStorageSystem(Persistence.PersistentStorageInterface):
 
     def _remove_item(self, parent: Persistence.PersistentObject, name: str, index: int, item: Persistence.PersistentObject) -> None:
         # remove item from internal storage
+        self._load_deferred_properties()
         storage_dict = self.__update_modified_and_get_storage_dict(parent)
         with self.__properties_lock:
             item_list = storage_dict[name]
@@ -308,6 +415,7 @@ class PersistentStorageSystem(Persistence.PersistentStorageInterface):
         self.__write_properties_if_not_delayed(parent)
 
     def set_item(self, parent: Persistence.PersistentObject, name: str, item: Persistence.PersistentObject) -> None:
+        self._load_deferred_properties()
         storage_dict = self.__update_modified_and_get_storage_dict(parent)
         if item:
             # set the item and update its persistent context
@@ -369,6 +477,7 @@ class PersistentStorageSystem(Persistence.PersistentStorageInterface):
         self.__write_properties_if_not_delayed(item)
 
     def read_properties(self) -> PersistentDictType:
+        self._load_deferred_properties()
         return self.get_storage_properties()
 
     def enter_transaction(self) -> None:
@@ -497,6 +606,7 @@ class ProjectStorageSystem(PersistentStorageSystem):
     def get_persistent_dict(self, name: str, item_uuid: uuid.UUID) -> PersistentDictType:
         if name == "data_items":
             return self._data_properties_map[item_uuid].properties
+        self._load_deferred_properties()
         for item_d in self.get_storage_properties()[name]:
             if uuid.UUID(item_d["uuid"]) == item_uuid:
                 return typing.cast(PersistentDictType, item_d)
@@ -536,6 +646,9 @@ class ProjectStorageSystem(PersistentStorageSystem):
                 old_storage_adapter.close()
             self.__storage_adapter_map[data_item_uuid] = storage_adapter
 
+        # the items are read from internal storage once the project is read.
+        self._load_deferred_properties()
+
         properties_copy = self._read_properties()
 
         # ensure unique connections
@@ -676,17 +789,133 @@ class ProjectStorageSystem(PersistentStorageSystem):
         return self._restore_item(data_item_uuid)
 
 
+# the compact binary project file starts with a fixed header (magic, version, header length) followed by a compact
+# json header holding the top level properties and the section lengths of each list of items. each item (display item,
+# computation, connection, etc.) is stored in its own section so that it can be decoded and encoded individually.
+BINARY_PROPERTIES_MAGIC = b"NSPROJB\x00"
+BINARY_PROPERTIES_VERSION = 1
+_BINARY_PROPERTIES_HEADER = struct.Struct("<8sII")  # magic, version, header length
+
+
+def _is_item_list(value: typing.Any) -> bool:
+    return isinstance(value, list) and all(isinstance(item, dict) for item in value)
+
+
+def encode_properties_section(item_properties: PersistentDictType) -> bytes:
+    """Return the section holding the item properties in the compact binary project format."""
+    return json.dumps(Utility.clean_dict(item_properties), separators=(",", ":")).encode("utf-8")
+
+
+def is_binary_properties_file(path: pathlib.Path) -> bool:
+    """Return whether the file at path uses the compact binary project format."""
+    try:
+        with path.open("rb") as fp:
+            return fp.read(len(BINARY_PROPERTIES_MAGIC)) == BINARY_PROPERTIES_MAGIC
+    except OSError:
+        return False
+
+
+def write_binary_properties(fp: typing.BinaryIO, properties: PersistentDictType, sections: typing.Mapping[str, typing.Sequence[bytes]]) -> None:
+    """Write the top level properties and the item sections for each list of items to fp.
+
+    The sections are made with encode_properties_section.
+    """
+    section_lengths = {key: [len(section) for section in key_sections] for key, key_sections in sections.items()}
+    header = json.dumps({"properties": Utility.clean_dict(properties), "sections": section_lengths}, separators=(",", ":")).encode("utf-8")
+    fp.write(_BINARY_PROPERTIES_HEADER.pack(BINARY_PROPERTIES_MAGIC, BINARY_PROPERTIES_VERSION, len(header)))
+    fp.write(header)
+    for key_sections in sections.values():
+        for section in key_sections:
+            fp.write(section)
+
+
+class BinaryPropertiesReader:
+    """Read properties from the compact binary project format.
+
+    Only the header is decoded initially. Items are decoded when requested.
+    """
+
+    def __init__(self, data: bytes) -> None:
+        magic, version, header_length = _BINARY_PROPERTIES_HEADER.unpack_from(data)
+        if magic != BINARY_PROPERTIES_MAGIC:
+            raise ValueError("Not a binary project file.")
+        if version > BINARY_PROPERTIES_VERSION:
+            raise ValueError(f"Unsupported binary project file version {version}.")
+        offset = _BINARY_PROPERTIES_HEADER.size
+        header = json.loads(data[offset:offset + header_length])
+        offset += header_length
+        self.__data = memoryview(data)
+        self.__properties: PersistentDictType = header["properties"]
+        self.__section_offsets: typing.Dict[str, typing.List[typing.Tuple[int, int]]] = dict()
+        for key, section_lengths in header["sections"].items():
+            offsets = list()
+            for section_length in section_lengths:
+                offsets.append((offset, section_length))
+                offset += section_length
+            self.__section_offsets[key] = offsets
+
+    @property
+    def properties(self) -> PersistentDictType:
+        """Return a copy of the top level properties, without the lists of items."""
+        return copy.deepcopy(self.__properties)
+
+    @property
+    def item_keys(self) -> typing.Sequence[str]:
+        return list(self.__section_offsets.keys())
+
+    def get_item_count(self, key: str) -> int:
+        return len(self.__section_offsets.get(key, list()))
+
+    def read_section(self, key: str, index: int) -> bytes:
+        offset, length = self.__section_offsets[key][index]
+        return self.__data[offset:offset + length].tobytes()
+
+    def read_item(self, key: str, index: int) -> PersistentDictType:
+        return typing.cast(PersistentDictType, json.loads(self.read_section(key, index)))
+
+    def read_properties(self) -> PersistentDictType:
+        properties = self.properties
+        for key in self.item_keys:
+            properties[key] = [self.read_item(key, index) for index in range(self.get_item_count(key))]
+        return properties
+
+
+def read_properties_file(path: pathlib.Path) -> PersistentDictType:
+    """Read the properties from a project or library file in either the json or the compact binary format."""
+    if is_binary_properties_file(path):
+        with path.open("rb") as fp:
+            return BinaryPropertiesReader(fp.read()).read_properties()
+    with path.open("r") as fp:
+        return typing.cast(PersistentDictType, json.load(fp))
+
+
 class FileProjectStorageSystem(ProjectStorageSystem):
 
     _file_handlers: typing.List[_CreateStorageHandlerFn] = [NDataHandler.NDataHandler, HDF5Handler.HDF5Handler]
 
+    # write project files in the compact binary format. project files already in the binary format stay binary.
+    binary_project_format = False
+
     def __init__(self, project_path: pathlib.Path, project_data_path: typing.Optional[pathlib.Path] = None) -> None:
         super().__init__()
         self.__project_path = project_path
         self.__project_data_path = project_data_path
+        self.__is_binary = False
+        self.__is_loading = False
+        # when loading a binary project file, only the top level properties are decoded. the reader is kept until the
+        # items are used; see _load_deferred_properties. the sections of the items as last read or written are kept
+        # by list key and item uuid; items that have not been modified since are written from their sections.
+        self.__sections_lock = threading.RLock()
+        self.__deferred_reader: typing.Optional[BinaryPropertiesReader] = None
+        self.__sections: typing.Dict[typing.Tuple[str, str], bytes] = dict()
+        self.__modified_item_uuids: typing.Set[str] = set()
 
     def load_properties(self) -> None:
-        super().load_properties()
+        self.__is_loading = True
+        try:
+            super().load_properties()
+        finally:
+            self.__is_loading = False
         project_data_folder_paths = list()
         for project_data_folder in self.get_storage_properties().get("project_data_folders", list()):
             project_data_folder_path = pathlib.Path(project_data_folder)
@@ -702,27 +931,102 @@ class FileProjectStorageSystem(ProjectStorageSystem):
     def _read_properties(self) -> PersistentDictType:
         properties = dict()
         if self.__project_path and self.__project_path.exists():
-            with self.__project_path.open("r") as fp:
-                properties = json.load(fp)
+            self.__is_binary = is_binary_properties_file(self.__project_path)
+            if self.__is_binary:
+                with self.__project_path.open("rb") as fp:
+                    reader = BinaryPropertiesReader(fp.read())
+                if self.__is_loading:
+                    # defer decoding the items until they are used.
+                    with self.__sections_lock:
+                        self.__deferred_reader = reader
+                        self.__sections = dict()
+                        self.__modified_item_uuids = set()
+                    return reader.properties
+                properties = reader.read_properties()
+            else:
+                with self.__project_path.open("r") as fp:
+                    properties = json.load(fp)
         return properties
 
+    def _load_deferred_properties(self) -> None:
+        with self.__sections_lock:
+            reader = self.__deferred_reader
+            self.__deferred_reader = None
+            if reader:
+                properties = self.get_storage_properties()
+                for key in reader.item_keys:
+                    items = list()
+                    for index in range(reader.get_item_count(key)):
+                        section = reader.read_section(key, index)
+                        item_properties = json.loads(section)
+                        item_uuid = item_properties.get("uuid")
+                        if isinstance(item_uuid, str):
+                            self.__sections[(key, item_uuid)] = section
+                        items.append(item_properties)
+                    properties[key] = items
+
+    def _item_properties_modified(self, item: Persistence.PersistentObject) -> None:
+        with self.__sections_lock:
+            self.__modified_item_uuids.add(str(item.uuid))
+
     def _write_properties(self) -> None:
         self.__write_properties_inner(Model.transform_backward(self.get_storage_properties()))
 
     def __write_properties_inner(self, properties: PersistentDictType) -> None:
         if self.__project_path:
-            # atomically overwrite
-            with Utility.AtomicFileWriter(self.__project_path) as fp:
-                properties = Utility.clean_dict(properties)
-                project_data_paths = list()
-                for project_data_path in [self.__project_data_path] if self.__project_data_path else []:
-                    if project_data_path.parent == self.__project_path.parent:
-                        project_data_path = project_data_path.relative_to(project_data_path.parent)
-                    project_data_paths.append(project_data_path)
-                project_uuid = uuid.uuid4()
-                properties.setdefault("uuid", str(project_uuid))
-                properties["project_data_folders"] = [str(project_data_path) for project_data_path in project_data_paths]
-                json.dump(properties, fp)
+            project_data_paths = list()
+            for project_data_path in [self.__project_data_path] if self.__project_data_path else []:
+                if project_data_path.parent == self.__project_path.parent:
+                    project_data_path = project_data_path.relative_to(project_data_path.parent)
+                project_data_paths.append(project_data_path)
+            project_uuid = uuid.uuid4()
+            if self.__is_binary or self.binary_project_format:
+                header_properties = {key: value for key, value in properties.items() if not _is_item_list(value)}
+                header_properties.setdefault("uuid", str(project_uuid))
+                header_properties["project_data_folders"] = [str(project_data_path) for project_data_path in project_data_paths]
+                sections = self.__get_sections(properties)
+                # atomically overwrite
+                with Utility.AtomicBinaryFileWriter(self.__project_path) as binary_fp:
+                    write_binary_properties(binary_fp, header_properties, sections)
+                self.__is_binary = True
+            else:
+                # atomically overwrite
+                with Utility.AtomicFileWriter(self.__project_path) as fp:
+                    properties = Utility.clean_dict(properties)
+                    properties.setdefault("uuid", str(project_uuid))
+                    properties["project_data_folders"] = [str(project_data_path) for project_data_path in project_data_paths]
+                    json.dump(properties, fp)
+                with self.__sections_lock:
+                    self.__modified_item_uuids = set()
+
+    def __get_sections(self, properties: PersistentDictType) -> typing.Dict[str, typing.List[bytes]]:
+        # return the sections for each list of items. only items modified since they were last read or written are
+        # encoded. items still deferred have not been used, so they are written from the sections as read.
+        with self.__sections_lock:
+            sections: typing.Dict[str, typing.List[bytes]] = dict()
+            reader = self.__deferred_reader
+            if reader:
+                for key in reader.item_keys:
+                    sections[key] = [reader.read_section(key, index) for index in range(reader.get_item_count(key))]
+            new_sections: typing.Dict[typing.Tuple[str, str], bytes] = dict()
+            for key, value in properties.items():
+                if _is_item_list(value):
+                    key_sections = list()
+                    for item_properties in value:
+                        item_uuid = item_properties.get("uuid")
+                        section = None
+                        if isinstance(item_uuid, str):
+                            if item_uuid not in self.__modified_item_uuids:
+                                section = self.__sections.get((key, item_uuid))
+                        if section is None:
+                            section = encode_properties_section(item_properties)
+                        if isinstance(item_uuid, str):
+                            new_sections[(key, item_uuid)] = section
+                        key_sections.append(section)
+                    sections[key] = key_sections
+            self.__sections = new_sections
+            self.__modified_item_uuids = set()
+            return sections
 
     def _get_identifier(self) -> str:
         return str(self.__project_path)
@@ -734,7 +1038,12 @@ class FileProjectStorageSystem(ProjectStorageSystem):
         large_format = hasattr(data_item, "large_format") and data_item.large_format
         file_handler = file_handler if file_handler else (self._file_handlers[-1] if large_format else self._file_handlers[0])
         assert self.__project_data_path is not None
-        return file_handler.make(self.__project_data_path / self.__get_base_path(data_item))
+        storage_handler = file_handler.make(self.__project_data_path / self.__get_base_path(data_item))
+        # the data of a data item which requests compression is deflated in ndata files. other handlers keep the
+        # compression of any existing data.
+        if getattr(data_item, "compress_data", False) and isinstance(storage_handler, NDataHandler.NDataHandler):
+            storage_handler.compression = NDataHandler.ZIP_DEFLATED
+        return storage_handler
 
     def _find_storage_handlers(self) -> typing.Sequence[StorageHandler.StorageHandler]:
         return self.__find_storage_handlers(self.__project_data_path)
@@ -818,8 +1127,7 @@ class FileProjectStorageSystem(ProjectStorageSystem):
                 if target_storage_handler and storage_handler.reference != target_storage_handler.reference:
                     os.makedirs(os.path.dirname(target_storage_handler.reference), exist_ok=True)
                     target_storage_handler.prepare_move()
-                    shutil.copyfile(storage_handler.reference, target_storage_handler.reference)
-                    shutil.copystat(storage_handler.reference, target_storage_handler.reference)
+                    copy_file_durably(storage_handler.reference, target_storage_handler.reference)
                     target_storage_handler.write_properties(Migration.transform_from_latest(copy.deepcopy(properties)), datetime.datetime.now())
                     logging.getLogger("migration").info(f"Copying data item ({index + 1}/{count}) {data_item_uuid} to new library.")
                     return ReaderInfo(properties, [False], self._is_storage_handler_large_format(target_storage_handler),
@@ -828,6 +1136,10 @@ class FileProjectStorageSystem(ProjectStorageSystem):
             return None
 
     def _migrate_library_properties(self, library_properties: PersistentDictType, reader_info_list: typing.List[ReaderInfo]) -> None:
+        # the migrated library properties replace the project properties; none of their sections can be reused.
+        with self.__sections_lock:
+            self.__deferred_reader = None
+            self.__sections = dict()
         self.__write_properties_inner(library_properties)
         for reader_info in reader_info_list:
             data_item_properties = Utility.clean_dict(reader_info.properties if reader_info.properties else dict())
@@ -861,8 +1173,7 @@ class FileProjectStorageSystem(ProjectStorageSystem):
         project_path = migration_stage[0]
         if project_path and os.path.exists(project_path):
             try:
-                with project_path.open("r") as fp:
-                    properties = json.load(fp)
+                properties = read_properties_file(project_path)
             except Exception:
                 os.replace(project_path, project_path.with_suffix(".bak"))
         return properties
@@ -965,7 +1276,7 @@ class MemoryStorageHandler(StorageHandler.StorageHandler):
         self.__data_properties_map[self.__uuid] = Utility.clean_dict(properties)
 
     def write_data(self, data: _NDArray, file_datetime: datetime.datetime) -> None:
-        self.__data_map[self.__uuid] = data.copy()
+        self.__data_map[self.__uuid] = numpy.array(data)  # copy; data may be array-like, such as an h5py dataset
 
     def reserve_data(self, data_shape: typing.Tuple[int, ...], data_dtype: numpy.typing.DTypeLike, file_datetime: datetime.datetime) -> None:
         self.__data_map[self.__uuid] = numpy.zeros(data_shape, data_dtype)
@@ -28,6 +28,10 @@ PersistentDictType = typing.Dict[str, typing.Any]
 _NDArray = numpy.typing.NDArray[typing.Any]
 
 
+# the approximate number of bytes copied at once when writing array-like data which is not in memory.
+COPY_BLOCK_SIZE = 64 * 1024 * 1024
+
+
 def make_directory_if_needed(directory_path: str) -> None:
     """
         Make the directory path, if needed.
@@ -212,7 +216,7 @@ class HDF5Handler(StorageHandler.StorageHandler):
                 self.__fp = None
                 os.remove(self.__file_path)
                 self.__ensure_open()
-            # reserve the data
+            # reserve the data. storage is allocated when first written; unwritten data reads as the fill value.
             chunks = get_write_chunk_shape_for_data(data_shape, data_dtype)
             self.__dataset = self.__fp.require_dataset("data", shape=data_shape, dtype=data_dtype, fillvalue=0, chunks=chunks)
             if json_properties is not None:
@@ -221,7 +225,13 @@ class HDF5Handler(StorageHandler.StorageHandler):
 
     def __copy_data(self, data: _NDArray) -> None:
         if id(data) != id(self.__dataset):
-            self.__dataset[:] = data
+            if isinstance(data, numpy.ndarray) or data.ndim == 0 or data.shape[0] == 0:
+                self.__dataset[:] = data
+            else:
+                # array-like data, such as an imported h5py dataset, is copied in blocks so it is never read in full.
+                rows_per_block = max(1, COPY_BLOCK_SIZE // max(1, numpy.dtype(data.dtype).itemsize * int(numpy.prod(data.shape[1:], dtype=numpy.int64))))
+                for i in range(0, data.shape[0], rows_per_block):
+                    self.__dataset[i:i + rows_per_block] = data[i:i + rows_per_block]
             self._write_count += 1
 
     def write_properties(self, properties: PersistentDictType, file_datetime: datetime.datetime) -> None:
@@ -1,31 +1,44 @@
 # standard libraries
 import copy
 import datetime
-import io
 import json
 import os
 import pathlib
+import struct
 import typing
 import uuid
+import weakref
 import zipfile
 import itertools
 
 # third party libraries
+import h5py
 import imageio
 import numpy
 
+try:
+    import tifffile
+except ImportError:
+    # imageio includes an older version of tifffile.
+    from imageio.plugins import _tifffile as tifffile  # type: ignore
+
 # local libraries
 from nion.data import Calibration
 from nion.data import DataAndMetadata
 from nion.data import Image
 from nion.swift.model import DataItem
 from nion.swift.model import DisplayItem
+from nion.swift.model import HDF5Handler
+from nion.swift.model import NDataHandler
 from nion.swift.model import Utility
 
 
 DataElementType = typing.Dict[str, typing.Any]
 _DataArrayType = typing.Any
 
+# number of rows to read or write at once for csv files.
+CSV_CHUNK_ROWS = 65536
+
 
 class ImportExportIncompatibleDataError(Exception):
     pass
@@ -166,7 +179,11 @@ class ImportExportManager(metaclass=Utility.Singleton):
                     return io_handler.read_data_elements(extension, path)
         return list()
 
-    def write_display_item_with_writer(self, writer: ImportExportHandler, display_item: DisplayItem.DisplayItem, path: pathlib.Path) -> None:
+    def write_display_item_with_writer(self, writer: ImportExportHandler, display_item: DisplayItem.DisplayItem, path: pathlib.Path) -> bool:
+        """Write the display item to the path using the writer. Return whether the item was written.
+
+        This method does not modify the display item and may be called from a thread.
+        """
         extension = path.suffix
         if extension:
             extension = extension[1:]  # remove the leading "."
@@ -174,6 +191,8 @@ class ImportExportManager(metaclass=Utility.Singleton):
             data_metadata = display_item.data_items[0].data_metadata if display_item.data_items else None
             if extension in writer.extensions and data_metadata and writer.can_write(data_metadata, extension):
                 writer.write_display_item(display_item, path, extension)
+                return True
+        return False
 
     def write_display_item(self, display_item: DisplayItem.DisplayItem, path: pathlib.Path) -> None:
         extension = path.suffix
@@ -191,7 +210,8 @@ class ImportExportManager(metaclass=Utility.Singleton):
 # create a new data item with a data element.
 # data element is a dict which can be processed into a data item
 # when this method returns, the data item has not been added to a document. therefore, the
-# data is still loaded into memory, but with a data ref count of zero.
+# data is still loaded into memory, but with a data ref count of zero. chunked data is not
+# loaded; the data item writes the chunks into its storage when it is added to a document.
 def create_data_item_from_data_element(data_element: DataElementType,
                                        data_file_path: typing.Optional[pathlib.Path] = None) -> DataItem.DataItem:
     uuid_str = data_element.get("uuid")
@@ -199,9 +219,15 @@ def create_data_item_from_data_element(data_element: DataElementType,
     large_format = data_element.get("large_format")
     if large_format is None:
         data = data_element.get("data")
-        large_format = len(data.shape) > 2 and data.dtype != numpy.uint8 if data is not None else False
+        chunked_data = get_data_element_chunks(data_element) if data is not None else None
+        data_shape, data_dtype = chunked_data[0:2] if chunked_data else (data.shape, data.dtype) if data is not None else ((), None)
+        large_format = len(data_shape) > 2 and data_dtype != numpy.uint8 if data is not None else False
     data_item = DataItem.DataItem(item_uuid=uuid_, large_format=large_format)
-    update_data_item_from_data_element(data_item, data_element, data_file_path)
+    try:
+        update_data_item_from_data_element(data_item, data_element, data_file_path)
+    except Exception:
+        data_item.close()
+        raise
     return data_item
 
 
@@ -221,6 +247,12 @@ def update_data_item_from_data_element(data_item: DataItem.DataItem, data_elemen
 def update_data_item_from_data_element_1(data_item: DataItem.DataItem, data_element: DataElementType,
                                          data_file_path: typing.Optional[pathlib.Path] = None) -> None:
     assert data_item
+    chunked_data = get_data_element_chunks(data_element)
+    if chunked_data is not None:
+        # convert without the data; the chunks are written into the data item below.
+        data_element = dict(data_element)
+        data_element["data"] = iter(())
+        data_element["data_shape"], data_element["data_dtype"] = chunked_data[0:2]
     with data_item.data_item_changes(), data_item.data_source_changes():
         # file path
         # master data
@@ -235,22 +267,27 @@ def update_data_item_from_data_element_1(data_item: DataItem.DataItem, data_elem
         data_shape_data_dtype = data_and_metadata.data_shape_and_dtype
         assert data_shape_data_dtype is not None
         is_same_shape = data_item.data_shape == data_shape_data_dtype[0] and data_item.data_dtype == data_shape_data_dtype[1] and data_item.is_sequence == is_sequence and data_item.collection_dimension_count == collection_dimension_count and data_item.datum_dimension_count == datum_dimension_count
-        if is_same_shape:
-            data = data_and_metadata.data
-            assert data is not None
-            with data_item.data_ref() as data_ref:
-                sub_area = data_element.get("sub_area")
-                master_data = data_ref.master_data
-                if master_data is not None:
-                    if sub_area is not None:
-                        top = sub_area[0][0]
-                        bottom = sub_area[0][0] + sub_area[1][0]
-                        left = sub_area[0][1]
-                        right = sub_area[0][1] + sub_area[1][1]
-                        master_data[top:bottom, left:right] = data[top:bottom, left:right]
-                    else:
-                        master_data[:] = data[:]
-                data_ref.data_updated()  # trigger change notifications
+        if is_same_shape or chunked_data is not None:
+            if chunked_data is not None:
+                # write the chunks into the data reserved in storage. if the data item is not stored yet, it keeps
+                # the chunks until it is stored.
+                data_item.set_data_chunks(data_shape=data_shape_data_dtype[0], data_dtype=data_shape_data_dtype[1], data_descriptor=data_and_metadata.data_descriptor, chunks=chunked_data[2])
+            else:
+                data = data_and_metadata.data
+                assert data is not None
+                with data_item.data_ref() as data_ref:
+                    sub_area = data_element.get("sub_area")
+                    master_data = data_ref.master_data
+                    if master_data is not None:
+                        if sub_area is not None:
+                            top = sub_area[0][0]
+                            bottom = sub_area[0][0] + sub_area[1][0]
+                            left = sub_area[0][1]
+                            right = sub_area[0][1] + sub_area[1][1]
+                            master_data[top:bottom, left:right] = data[top:bottom, left:right]
+                        else:
+                            master_data[:] = data[:]
+                    data_ref.data_updated()  # trigger change notifications
             if dimensional_calibrations is not None:
                 for dimension, dimensional_calibration in enumerate(dimensional_calibrations):
                     data_item.set_dimensional_calibration(dimension, dimensional_calibration)
@@ -291,6 +328,34 @@ def update_data_item_from_data_element_1(data_item: DataItem.DataItem, data_elem
         # extra_high_tension
 
 
+# the approximate number of bytes in each chunk read from array-like data element data.
+DATA_ELEMENT_CHUNK_SIZE = 64 * 1024 * 1024
+
+
+def get_data_element_chunks(data_element: DataElementType) -> typing.Optional[typing.Tuple[DataAndMetadata.ShapeType, numpy.dtype[typing.Any], typing.Iterator[_DataArrayType]]]:
+    """Return the shape, dtype, and chunks of the data element data if it is not an array; otherwise return None.
+
+    The data can be an array-like object with shape, dtype, and slicing, in which case the chunks are slices along the
+    first axis. The data can also be an iterable of arrays which are consecutive chunks along the first axis, in which
+    case the data element must also include the data_shape and data_dtype of the full data.
+
+    Numpy arrays and h5py datasets are used directly and are not chunked.
+    """
+    data = data_element.get("data")
+    if data is None or isinstance(data, (numpy.ndarray, h5py.Dataset)):
+        return None
+    if hasattr(data, "shape") and hasattr(data, "dtype") and hasattr(data, "__getitem__"):
+        data_shape = tuple(data.shape)
+        data_dtype = numpy.dtype(data.dtype)
+        if len(data_shape) == 0:
+            return None
+        rows_per_chunk = max(1, DATA_ELEMENT_CHUNK_SIZE // max(1, data_dtype.itemsize * int(numpy.prod(data_shape[1:], dtype=numpy.int64))))
+        return data_shape, data_dtype, (numpy.asarray(data[i:i + rows_per_chunk]) for i in range(0, data_shape[0], rows_per_chunk))
+    if "data_shape" in data_element and "data_dtype" in data_element:
+        return tuple(data_element["data_shape"]), numpy.dtype(data_element["data_dtype"]), iter(data)
+    return None
+
+
 def convert_data_element_to_data_and_metadata(data_element: DataElementType) -> DataAndMetadata.DataAndMetadata:
     # NOTE: takes ownership of data_element['data']
     version = data_element["version"] if "version" in data_element else 1
@@ -304,7 +369,8 @@ def convert_data_element_to_data_and_metadata_1(data_element: DataElementType) -
     """Convert a data element to xdata. No data copying occurs.
 
     The data element can have the following keys:
-        data (required)
+        data (required; array, or array-like or chunks as described in get_data_element_chunks, which are assembled
+            into an array when the xdata data is first used)
         is_sequence, collection_dimension_count, datum_dimension_count (optional description of the data)
         spatial_calibrations (optional list of spatial calibration dicts, scale, offset, units)
         intensity_calibration (optional intensity calibration dict, scale, offset, units)
@@ -316,7 +382,12 @@ def convert_data_element_to_data_and_metadata_1(data_element: DataElementType) -
     """
     # data. takes ownership.
     data = data_element["data"]
-    dimensional_shape = Image.dimensional_shape_from_data(data)
+    chunked_data = get_data_element_chunks(data_element)
+    if chunked_data is not None:
+        data_shape, data_dtype = chunked_data[0:2]
+        dimensional_shape = Image.dimensional_shape_from_shape_and_dtype(data_shape, data_dtype)
+    else:
+        dimensional_shape = Image.dimensional_shape_from_data(data)
     is_sequence = data_element.get("is_sequence", False)
     dimension_count = len(dimensional_shape) if dimensional_shape else 0
     adjusted_dimension_count = dimension_count - (1 if is_sequence else 0)
@@ -382,6 +453,23 @@ def convert_data_element_to_data_and_metadata_1(data_element: DataElementType) -
     utc_datetime = local_datetime - datetime.timedelta(minutes=tz_adjust)  # tz_adjust already contains dst_adjust
     timestamp = utc_datetime
 
+    if chunked_data is not None:
+        chunks = chunked_data[2]
+
+        def assemble_data() -> _DataArrayType:
+            assembled_data = numpy.empty(data_shape, data_dtype)
+            DataItem.write_data_chunks(assembled_data, chunks)
+            return assembled_data
+
+        return DataAndMetadata.DataAndMetadata(assemble_data, (data_shape, data_dtype),
+                                               intensity_calibration=intensity_calibration,
+                                               dimensional_calibrations=dimensional_calibrations,
+                                               metadata=metadata,
+                                               timestamp=timestamp,
+                                               data_descriptor=data_descriptor,
+                                               timezone=timezone,
+                                               timezone_offset=tz_value)
+
     return DataAndMetadata.new_data_and_metadata(data,
                                                  intensity_calibration=intensity_calibration,
                                                  dimensional_calibrations=dimensional_calibrations,
@@ -494,32 +582,37 @@ def read_image_from_file(filename: pathlib.Path) -> _DataArrayType:
         return numpy.zeros((20, 20, 4), numpy.uint8)
     image = imageio.imread(filename)
     if image is not None:
-        image_u8 = imageio.core.image_as_uint(image)
-        if len(image_u8.shape) == 3:
-            rgba_image: numpy.typing.NDArray[numpy.uint8]
-            if image_u8.shape[-1] == 3:
-                rgba_image = numpy.empty(image_u8.shape[:-1] + (4,), numpy.uint8)
-                rgba_image[..., 0] = image_u8[..., 2]
-                rgba_image[..., 1] = image_u8[..., 1]
-                rgba_image[..., 2] = image_u8[..., 0]
-                rgba_image[..., 3] = 255
-            else:
-                assert image_u8.shape[-1] == 4
-                rgba_image = numpy.empty(image_u8.shape[:-1] + (4,), numpy.uint8)
-                rgba_image[..., 0] = image_u8[..., 3]
-                rgba_image[..., 1] = image_u8[..., 2]
-                rgba_image[..., 2] = image_u8[..., 1]
-                rgba_image[..., 3] = image_u8[..., 0]
-            if is_grayscale(rgba_image):
-                rgba_image = Image.convert_to_grayscale(rgba_image)
-        else:
-            assert len(image_u8.shape) == 2
-            rgba_image = image_u8
-        assert rgba_image is not None
-        return rgba_image
+        return convert_image_to_data(image)
     raise IOError()
 
 
+# convert an image read from a file to uint8 bgra data, or to uint8 grayscale data if it is grayscale.
+def convert_image_to_data(image: _DataArrayType) -> _DataArrayType:
+    image_u8 = imageio.core.image_as_uint(image)
+    if len(image_u8.shape) == 3:
+        rgba_image: numpy.typing.NDArray[numpy.uint8]
+        if image_u8.shape[-1] == 3:
+            rgba_image = numpy.empty(image_u8.shape[:-1] + (4,), numpy.uint8)
+            rgba_image[..., 0] = image_u8[..., 2]
+            rgba_image[..., 1] = image_u8[..., 1]
+            rgba_image[..., 2] = image_u8[..., 0]
+            rgba_image[..., 3] = 255
+        else:
+            assert image_u8.shape[-1] == 4
+            rgba_image = numpy.empty(image_u8.shape[:-1] + (4,), numpy.uint8)
+            rgba_image[..., 0] = image_u8[..., 3]
+            rgba_image[..., 1] = image_u8[..., 2]
+            rgba_image[..., 2] = image_u8[..., 1]
+            rgba_image[..., 3] = image_u8[..., 0]
+        if is_grayscale(rgba_image):
+            rgba_image = Image.convert_to_grayscale(rgba_image)
+    else:
+        assert len(image_u8.shape) == 2
+        rgba_image = image_u8
+    assert rgba_image is not None
+    return rgba_image
+
+
 class StandardImportExportHandler(ImportExportHandler):
 
     def __init__(self, io_handler_id: str, name: str, extensions: typing.Sequence[str]) -> None:
@@ -554,16 +647,82 @@ class StandardImportExportHandler(ImportExportHandler):
         assert display_values
         data = display_values.display_rgba  # export the display rather than the data for these types
         assert data is not None
+        data = numpy.copy(data)  # the display values reuse the array for later frames once released
         imageio.imwrite(path, data, extension)
 
 
+# tiff files larger than this are written as BigTIFF.
+BIGTIFF_THRESHOLD = 2**32 - 2**25
+
+
+class TIFFImportExportHandler(ImportExportHandler):
+    """A file import/export handler to read/write multi-page and BigTIFF files.
+
+    Each page is read or written separately so that the file is never held in memory twice. Files with more than one
+    page are read as a sequence of the pages with the shape and dtype of the first page; other pages (thumbnails, for
+    instance) are ignored. The pages of a sequence are returned as data chunks and are read when the data is stored.
+    Color pages are converted like other color images. Grayscale pages keep their dtype.
+
+    Data with 2D datum is written as one page per datum.
+    """
+
+    def __init__(self, io_handler_id: str, name: str, extensions: typing.Sequence[str]) -> None:
+        super().__init__(io_handler_id, name, extensions)
+
+    def read_data_elements(self, extension: str, path: pathlib.Path) -> typing.List[DataElementType]:
+        with tifffile.TiffFile(str(path)) as tiff_file:
+            page_indexes = [index for index, page in enumerate(tiff_file.pages) if page.shape == tiff_file.pages[0].shape and page.dtype == tiff_file.pages[0].dtype]
+            is_color = tiff_file.pages[0].photometric == tifffile.TIFF.PHOTOMETRIC.RGB and tiff_file.pages[0].shape[-1] in (3, 4)
+            # read the first page to determine the shape and dtype of the converted pages.
+            first_page_data = tiff_file.pages[0].asarray()
+            first_page_data = convert_image_to_data(first_page_data) if is_color else first_page_data
+        data_element: DataElementType = dict()
+        data_element["version"] = 1
+        if len(page_indexes) > 1:
+            # the pages are read one at a time as chunks, which are written straight into the data item storage.
+            data_element["data"] = self.__read_pages(path, page_indexes, is_color, first_page_data)
+            data_element["data_shape"] = (len(page_indexes),) + first_page_data.shape
+            data_element["data_dtype"] = first_page_data.dtype
+            data_element["is_sequence"] = True
+            data_element["collection_dimension_count"] = 0
+            data_element["datum_dimension_count"] = 2
+        else:
+            data_element["data"] = first_page_data
+        file_datetime = datetime.datetime.fromtimestamp(os.path.getmtime(path))
+        data_element["datetime_modified"] = Utility.get_datetime_item_from_datetime(file_datetime)
+        return [data_element]
+
+    def __read_pages(self, path: pathlib.Path, page_indexes: typing.Sequence[int], is_color: bool, first_page_data: _DataArrayType) -> typing.Iterator[_DataArrayType]:
+        yield first_page_data[numpy.newaxis]
+        with tifffile.TiffFile(str(path)) as tiff_file:
+            for index in page_indexes[1:]:
+                page_data = tiff_file.pages[index].asarray()
+                page_data = convert_image_to_data(page_data) if is_color else page_data
+                yield page_data[numpy.newaxis]
+
+    def can_write(self, data_metadata: DataAndMetadata.DataMetadata, extension: str) -> bool:
+        return data_metadata.is_datum_2d and not data_metadata.is_data_rgb_type and not data_metadata.is_data_complex_type
+
+    def write_display_item(self, display_item: DisplayItem.DisplayItem, path: pathlib.Path, extension: str) -> None:
+        data_item = display_item.data_item
+        assert data_item
+        data = data_item.data
+        if data is not None:
+            pages = data.reshape((-1,) + data.shape[-2:])
+            with tifffile.TiffWriter(str(path), bigtiff=data.nbytes > BIGTIFF_THRESHOLD) as tiff_writer:
+                # TiffWriter.save was renamed to write in newer versions of tifffile.
+                write_page = getattr(tiff_writer, "write", None) or tiff_writer.save
+                for page in pages:
+                    write_page(page)
+
+
 class CSVImportExportHandler(ImportExportHandler):
 
     def __init__(self, io_handler_id: str, name: str, extensions: typing.Sequence[str]) -> None:
         super().__init__(io_handler_id, name, extensions)
 
     def read_data_elements(self, extension: str, path: pathlib.Path) -> typing.List[DataElementType]:
-        data = numpy.loadtxt(str(path), delimiter=',')  # type: ignore
+        data = read_csv(path)
         if data is not None:
             data_element: DataElementType = dict()
             data_element["data"] = data
@@ -581,6 +740,66 @@ class CSVImportExportHandler(ImportExportHandler):
             numpy.savetxt(path, data, delimiter=', ')  # type: ignore
 
 
+def read_csv(path: pathlib.Path) -> _DataArrayType:
+    """Read comma separated values from path, parsing CSV_CHUNK_ROWS lines at a time.
+
+    The result matches numpy.loadtxt with a comma delimiter. The lines are counted first so that the parsed chunks are
+    written into one preallocated array; only one chunk of lines is held as text at once.
+    """
+    with open(path, "rb") as bf:
+        # count the line endings plus a possibly unterminated last line. comments and blank lines make this an upper
+        # bound on the number of rows.
+        line_count = sum(block.count(b"\n") for block in iter(lambda: bf.read(1 << 20), b"")) + 1
+    data: typing.Optional[_DataArrayType] = None
+    row = 0
+    with open(path, "r") as f:
+        while True:
+            lines = list(itertools.islice(f, CSV_CHUNK_ROWS))
+            if not lines:
+                break
+            chunk = numpy.loadtxt(lines, delimiter=',', ndmin=2)  # type: ignore
+            if chunk.size:
+                if data is None:
+                    data = numpy.empty((line_count, chunk.shape[1]), dtype=chunk.dtype)
+                data[row:row + chunk.shape[0]] = chunk
+                row += chunk.shape[0]
+    if data is None:
+        return numpy.loadtxt(str(path), delimiter=',')  # type: ignore
+    # shrinking in place releases the rows reserved for comments and blank lines without copying the data.
+    data.resize((row, data.shape[1]), refcheck=False)
+    return numpy.squeeze(data)
+
+
+def write_csv_table(f: typing.TextIO, data_list: typing.Sequence[_DataArrayType], delimiter: str = ", ") -> None:
+    """Write the columns in data_list to f as delimited rows, CSV_CHUNK_ROWS rows at a time.
+
+    Each chunk is written with numpy.savetxt. Rows past the end of a shorter column are written in separate segments in
+    which that column is left empty. Values are formatted with str, as Python formats them.
+    """
+    lengths = sorted({len(data) for data in data_list})
+    start = 0
+    for end in lengths:
+        # the columns at least end rows long are present in every row of the segment from start to end.
+        present = [len(data) >= end for data in data_list]
+        fmt = delimiter.join("%s" if is_present else "" for is_present in present)
+        for chunk_start in range(start, end, CSV_CHUNK_ROWS):
+            chunk_stop = min(chunk_start + CSV_CHUNK_ROWS, end)
+            # object columns hold Python scalars so each value keeps its own type and formatting.
+            columns = [data[chunk_start:chunk_stop].astype(object) for data, is_present in zip(data_list, present) if is_present]
+            numpy.savetxt(f, numpy.column_stack(columns), fmt=fmt)  # type: ignore
+        start = end
+
+
+def calibrated_column(calibration: Calibration.Calibration, data: _DataArrayType) -> _DataArrayType:
+    """Return data converted with calibration, allocating at most one new array."""
+    dtype = numpy.result_type(data, calibration.scale, calibration.offset)
+    if calibration.offset == 0 and calibration.scale == 1 and data.dtype == dtype:
+        return data
+    column = numpy.multiply(data, calibration.scale, dtype=dtype)
+    column += calibration.offset
+    return column
+
+
 def build_table(display_item: DisplayItem.DisplayItem) -> typing.Tuple[typing.List[str], typing.List[_DataArrayType]]:
     data_items = display_item.data_items
     assert all([data_item.is_data_1d for data_item in data_items])
@@ -603,7 +822,7 @@ def build_table(display_item: DisplayItem.DisplayItem) -> typing.Tuple[typing.Li
             assert xdata
             data = xdata.data
             assert data is not None
-            data_list.append(xdata.intensity_calibration.convert_array_to_calibrated_value(data))
+            data_list.append(calibrated_column(xdata.intensity_calibration, data))
             label = display_item.get_display_layer_property(index, "label") or f"Data {index}"
             label = label + f" ({xdata.intensity_calibration.units or 'None'})"
             headers.append(label)
@@ -620,7 +839,7 @@ def build_table(display_item: DisplayItem.DisplayItem) -> typing.Tuple[typing.Li
             data = xdata.data
             assert data is not None
             data_list.append(make_x_data(xdata.dimensional_calibrations[0], xdata.data_shape[0]))
-            data_list.append(xdata.intensity_calibration.convert_array_to_calibrated_value(data))
+            data_list.append(calibrated_column(xdata.intensity_calibration, data))
             label = display_item.get_display_layer_property(index, "label") or f"Data {index}"
             x_label = "X " + label + f" ({xdata.dimensional_calibrations[0].units or 'pixel'})"
             y_label = "Y " + label + f" ({xdata.intensity_calibration.units or 'None'})"
@@ -645,18 +864,39 @@ class CSV1ImportExportHandler(ImportExportHandler):
     def write_display_item(self, display_item: DisplayItem.DisplayItem, path: pathlib.Path, extension: str) -> None:
         headers, data_list = build_table(display_item)
 
-        newline = "\n"
         delimiter = ", "
-        format_ = "{}" # We need to stick with an empty format string here, otherwise we will have problems with the
-                       # fill value of zip_longest
-        row_template = delimiter.join([format_] * len(data_list))
-        row_template += newline
-        header_template = "# " + row_template
 
         with open(path, "w+") as f:
-            f.write(header_template.format(*headers))
-            for row in itertools.zip_longest(*data_list, fillvalue=""):
-                f.write(row_template.format(*row))
+            f.write("# " + delimiter.join(headers) + "\n")
+            write_csv_table(f, data_list, delimiter)
+
+
+# ndata exports with at least this much data are written with zip64 records.
+NDATA_ZIP64_THRESHOLD = 0xFFFFFFFF - 65536
+
+
+def memmap_stored_npy(path: pathlib.Path, zip_info: zipfile.ZipInfo) -> typing.Optional[_DataArrayType]:
+    """Memory map the uncompressed npy member described by zip_info in the zip file at path.
+
+    The array is mapped copy-on-write so modifying it does not modify the file. Return None if the member cannot be
+    mapped, for instance if its dtype contains Python objects.
+    """
+    with open(path, "rb") as fp:
+        fp.seek(zip_info.header_offset)
+        local_file_header = fp.read(30)
+        name_len, extra_len = struct.unpack("<2H", local_file_header[26:30])
+        fp.seek(zip_info.header_offset + 30 + name_len + extra_len)
+        version = numpy.lib.format.read_magic(fp)  # type: ignore
+        if version == (1, 0):
+            shape, fortran_order, dtype = numpy.lib.format.read_array_header_1_0(fp)  # type: ignore
+        elif version == (2, 0):
+            shape, fortran_order, dtype = numpy.lib.format.read_array_header_2_0(fp)  # type: ignore
+        else:
+            return None
+        if dtype.hasobject:
+            return None
+        offset = fp.tell()
+    return typing.cast(_DataArrayType, numpy.memmap(path, dtype=dtype, mode="c", offset=offset, shape=shape, order="F" if fortran_order else "C"))
 
 
 class NDataImportExportHandler(ImportExportHandler):
@@ -665,16 +905,20 @@ class NDataImportExportHandler(ImportExportHandler):
         super().__init__(io_handler_id, name, extensions)
 
     def read_data_elements(self, extension: str, path: pathlib.Path) -> typing.List[DataElementType]:
-        zip_file = zipfile.ZipFile(path, 'r')
-        namelist = zip_file.namelist()
-        if "metadata.json" in namelist and "data.npy" in namelist:
-            metadata = json.loads(zip_file.read("metadata.json").decode("utf-8"))
-            data_bytes = zip_file.read("data.npy")
-            data = numpy.load(io.BytesIO(data_bytes))  # type: ignore
-            if data is not None:
-                data_element = metadata
-                data_element["data"] = data
-                return [data_element]
+        with zipfile.ZipFile(path, 'r') as zip_file:
+            namelist = zip_file.namelist()
+            if "metadata.json" in namelist and "data.npy" in namelist:
+                metadata = json.loads(zip_file.read("metadata.json").decode("utf-8"))
+                data_info = zip_file.getinfo("data.npy")
+                data = memmap_stored_npy(path, data_info) if data_info.compress_type == zipfile.ZIP_STORED else None
+                if data is None:
+                    # compressed members are decompressed while streaming them into the array.
+                    with zip_file.open(data_info) as fp:
+                        data = numpy.lib.format.read_array(fp)  # type: ignore
+                if data is not None:
+                    data_element = metadata
+                    data_element["data"] = data
+                    return [data_element]
         return list()
 
     def can_write(self, data_metadata: DataAndMetadata.DataMetadata, extension: str) -> bool:
@@ -686,19 +930,15 @@ class NDataImportExportHandler(ImportExportHandler):
         data_element = create_data_element_from_data_item(data_item, include_data=False)
         data = data_item.data
         if data is not None:
-            root = str(path.parent)
-            metadata_path = root + "_metadata.json"
-            data_path = root + "_data.npy"
-            try:
-                with open(metadata_path, "w") as fp:
-                    json.dump(data_element, fp)
-                numpy.save(data_path, data)  # type: ignore
-                zip_file = zipfile.ZipFile(path, 'w')
-                zip_file.write(metadata_path, "metadata.json")
-                zip_file.write(data_path, "data.npy")
-            finally:
-                os.remove(metadata_path)
-                os.remove(data_path)
+            # stream the data and metadata directly into the zip file.
+            if data.nbytes < NDATA_ZIP64_THRESHOLD:
+                NDataHandler.write_zip(str(path), data, data_element)
+            else:
+                # the ndata writer does not write zip64 records, which are required for members of 4 GB or more.
+                with zipfile.ZipFile(path, "w", allowZip64=True) as zip_file:
+                    with zip_file.open("data.npy", "w", force_zip64=True) as fp:
+                        NDataHandler.write_npy(typing.cast(typing.BinaryIO, fp), data)
+                    zip_file.writestr("metadata.json", json.dumps(data_element))
 
 
 class NumPyImportExportHandler(ImportExportHandler):
@@ -717,7 +957,7 @@ class NumPyImportExportHandler(ImportExportHandler):
         super().__init__(io_handler_id, name, extensions)
 
     def read_data_elements(self, extension: str, path: pathlib.Path) -> typing.List[DataElementType]:
-        data = numpy.load(str(path))  # type: ignore
+        data = numpy.load(str(path), mmap_mode="c")  # type: ignore
         metadata_path = path.with_suffix(".json")
         if metadata_path.exists():
             with open(metadata_path) as f:
@@ -751,15 +991,144 @@ class NumPyImportExportHandler(ImportExportHandler):
                 raise
 
 
+# the approximate number of bytes copied at once when exporting to HDF5.
+HDF5_WRITE_BLOCK_SIZE = 64 * 1024 * 1024
+
+
+class HDF5ImportExportHandler(ImportExportHandler):
+    """A file import/export handler to read/write HDF5 files.
+
+    Each numeric dataset in the file is read as a data item. The data of large format data items is not read into
+    memory; the data items are backed by the datasets until they are stored. The file is closed once none of its
+    datasets back a data item, or right away if all the data was read into memory.
+
+    The file is written using the layout of HDF5Handler: a dataset named 'data' with the data element, excluding the
+    data, stored as JSON in its 'properties' attribute. Data items stored by HDF5Handler can be read, too. Attributes
+    of datasets from other sources are stored in the 'hdf5' metadata.
+
+    The data is written in chunks and is compressed using the compression filter, if any.
+    """
+
+    def __init__(self, io_handler_id: str, name: str, extensions: typing.Sequence[str], compression: typing.Optional[str] = None) -> None:
+        super().__init__(io_handler_id, name, extensions)
+        self.compression = compression
+
+    def read_data_elements(self, extension: str, path: pathlib.Path) -> typing.List[DataElementType]:
+        fp = h5py.File(path, "r")
+        datasets: typing.List[typing.Any] = list()
+        lazy_datasets: typing.List[typing.Any] = list()
+
+        def visit(name: str, item: typing.Any) -> None:
+            if isinstance(item, h5py.Dataset) and item.ndim > 0 and item.dtype.kind in "biufc":
+                datasets.append(item)
+
+        data_elements: typing.List[DataElementType] = list()
+        try:
+            fp.visititems(visit)
+            for dataset in datasets:
+                data_element = read_hdf5_dataset_properties(dataset)
+                if not "title" in data_element and len(datasets) > 1:
+                    data_element["title"] = path.stem + dataset.name
+                # large format data items are stored in HDF5 and are copied from the dataset in blocks. others are
+                # small enough to be read into memory.
+                large_format = data_element.get("large_format", dataset.ndim > 2 and dataset.dtype != numpy.uint8)
+                if large_format:
+                    data_element["data"] = dataset
+                    lazy_datasets.append(dataset)
+                else:
+                    data_element["data"] = dataset[()]
+                data_elements.append(data_element)
+        except Exception:
+            fp.close()
+            raise
+        if lazy_datasets:
+            # the data items of the lazy datasets are backed by them until the data items are stored, which copies the
+            # data into their own storage, or closed. the file is closed when the last lazy dataset is released.
+            lazy_dataset_count = [len(lazy_datasets)]
+
+            def release_dataset() -> None:
+                lazy_dataset_count[0] -= 1
+                if lazy_dataset_count[0] == 0:
+                    fp.close()
+
+            for dataset in lazy_datasets:
+                weakref.finalize(dataset, release_dataset)
+        else:
+            fp.close()
+        return data_elements
+
+    def can_write(self, data_metadata: DataAndMetadata.DataMetadata, extension: str) -> bool:
+        return True
+
+    def write_display_item(self, display_item: DisplayItem.DisplayItem, path: pathlib.Path, extension: str) -> None:
+        data_item = display_item.data_item
+        assert data_item
+        data_element = create_data_element_from_data_item(data_item, include_data=False)
+        data = data_item.data
+        if data is not None:
+            with h5py.File(path, "w") as fp:
+                chunks = HDF5Handler.get_write_chunk_shape_for_data(data.shape, data.dtype)
+                dataset = fp.create_dataset("data", shape=data.shape, dtype=data.dtype, chunks=chunks or (True if self.compression and data.size else None), compression=self.compression)
+                if data.ndim == 0 or data.shape[0] == 0:
+                    dataset[()] = data
+                else:
+                    rows_per_block = max(1, HDF5_WRITE_BLOCK_SIZE // max(1, data[0:1].nbytes))
+                    for i in range(0, data.shape[0], rows_per_block):
+                        dataset[i:i + rows_per_block] = data[i:i + rows_per_block]
+                dataset.attrs["properties"] = json.dumps(Utility.clean_dict(data_element))
+
+
+def read_hdf5_dataset_properties(dataset: typing.Any) -> DataElementType:
+    """Return a data element, without the data, from the attributes of the HDF5 dataset.
+
+    Data elements written by HDF5ImportExportHandler and data items written by HDF5Handler are stored as JSON in the
+    'properties' attribute. Other attributes are stored in the 'hdf5' metadata.
+    """
+    data_element: DataElementType = dict()
+    json_properties = dataset.attrs.get("properties")
+    properties = None
+    if isinstance(json_properties, (str, bytes)):
+        try:
+            properties = json.loads(json_properties)
+        except ValueError:
+            pass
+    if isinstance(properties, dict) and properties.get("type") == "data-item":
+        # a data item stored by HDF5Handler
+        for key in ("title", "is_sequence", "collection_dimension_count", "datum_dimension_count", "intensity_calibration", "metadata"):
+            if key in properties:
+                data_element[key] = properties[key]
+        if "dimensional_calibrations" in properties:
+            data_element["spatial_calibrations"] = properties["dimensional_calibrations"]
+    elif isinstance(properties, dict):
+        # a data element written by HDF5ImportExportHandler. the file may be imported into the same project it was
+        # exported from, so the data item gets a new uuid.
+        data_element.update(properties)
+        data_element.pop("uuid", None)
+    else:
+        attributes: typing.Dict[str, typing.Any] = dict()
+        for key, value in dataset.attrs.items():
+            if isinstance(value, bytes):
+                value = value.decode("utf-8", errors="replace")
+            elif isinstance(value, (numpy.ndarray, numpy.generic)):
+                value = value.tolist()
+            attributes[key] = value
+        attributes = Utility.clean_dict(attributes)
+        if attributes:
+            data_element["metadata"] = {"hdf5": attributes}
+    return data_element
+
+
 # Register the intrinsic I/O handlers.
 ImportExportManager().register_io_handler(StandardImportExportHandler("jpeg-io-handler", "JPEG", ["jpg", "jpeg"]))
 ImportExportManager().register_io_handler(StandardImportExportHandler("png-io-handler", "PNG", ["png"]))
 ImportExportManager().register_io_handler(StandardImportExportHandler("gif-io-handler", "GIF", ["gif"]))
 ImportExportManager().register_io_handler(StandardImportExportHandler("bmp-io-handler", "BMP", ["bmp"]))
-# ImportExportManager().register_io_handler(StandardImportExportHandler("tiff-io-handler", "TIFF", ["tif", "tiff"]))
+ImportExportManager().register_io_handler(TIFFImportExportHandler("tiff-io-handler", "TIFF", ["tif", "tiff"]))
 # ImportExportManager().register_io_handler(StandardImportExportHandler("cr2-io-handler", "CR2", ["cr2"]))
 # ImportExportManager().register_io_handler(StandardImportExportHandler("nef-io-handler", "NEF", ["nef"]))
 ImportExportManager().register_io_handler(CSVImportExportHandler("csv-io-handler", "CSV Raw", ["csv"]))
 ImportExportManager().register_io_handler(CSV1ImportExportHandler("csv1-io-handler", "CSV 1D", ["csv"]))
 ImportExportManager().register_io_handler(NDataImportExportHandler("ndata1-io-handler", "NData 1", ["ndata1"]))
 ImportExportManager().register_io_handler(NumPyImportExportHandler("numpy-io-handler", "Raw NumPy", ["npy"]))
+ImportExportManager().register_io_handler(HDF5ImportExportHandler("hdf5-io-handler", "HDF5", ["h5", "hdf5"]))
+ImportExportManager().register_io_handler(HDF5ImportExportHandler("hdf5-gzip-io-handler", "HDF5 (Compressed)", ["h5", "hdf5"], compression="gzip"))
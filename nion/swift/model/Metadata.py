@@ -1,3 +1,4 @@
+import copy
 import typing
 
 # standardized metadata paths, mapping to properties
@@ -83,6 +84,12 @@ key_map = {
 }
 
 
+def _get_metadata_view(metadata_source: typing.Any, name: str) -> typing.Any:
+    # prefer the read-only view (no copy) if the metadata source provides one.
+    view = getattr(metadata_source, name + "_view", None)
+    return view if view is not None else getattr(metadata_source, name, metadata_source)
+
+
 def has_metadata_value(metadata_source: typing.Any, key: str) -> bool:
     """Return whether the metadata value for the given key exists.
 
@@ -97,7 +104,7 @@ def has_metadata_value(metadata_source: typing.Any, key: str) -> bool:
     """
     desc = session_key_map.get(key)
     if desc is not None:
-        d = getattr(metadata_source, "session_metadata", metadata_source)
+        d = _get_metadata_view(metadata_source, "session_metadata")
         for path in desc["paths"]:
             path_components = path.split(".")
             for k in path_components[:-1]:
@@ -106,7 +113,7 @@ def has_metadata_value(metadata_source: typing.Any, key: str) -> bool:
                 return path_components[-1] in d
     desc = key_map.get(key)
     if desc is not None:
-        d = getattr(metadata_source, "metadata", metadata_source)
+        d = _get_metadata_view(metadata_source, "metadata")
         for path in desc["paths"]:
             path_components = path.split(".")
             for k in path_components[:-1]:
@@ -131,21 +138,21 @@ def get_metadata_value(metadata_source: typing.Any, key: str) -> typing.Any:
     desc = session_key_map.get(key)
     if desc is not None:
         for path in desc["paths"]:
-            v = getattr(metadata_source, "session_metadata", metadata_source)
+            v = _get_metadata_view(metadata_source, "session_metadata")
             path_components = path.split(".")
             for k in path_components:
                 v =  v.get(k) if v is not None else None
             if v is not None:
-                return v
+                return copy.deepcopy(v)  # nested values are returned as modifiable copies
     desc = key_map.get(key)
     if desc is not None:
-        v = getattr(metadata_source, "metadata", metadata_source)
+        v = _get_metadata_view(metadata_source, "metadata")
         for path in desc["paths"]:
             path_components = path.split(".")
             for k in path_components:
                 v =  v.get(k) if v is not None else None
             if v is not None:
-                return v
+                return copy.deepcopy(v)  # nested values are returned as modifiable copies
     return None
 
 
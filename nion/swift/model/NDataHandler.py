@@ -17,6 +17,7 @@ import struct
 import threading
 import time
 import typing
+import zlib
 
 # local libraries
 from nion.swift.model import StorageHandler
@@ -26,6 +27,33 @@ from nion.utils import Geometry
 PersistentDictType = typing.Dict[str, typing.Any]
 _NDArray = numpy.typing.NDArray[typing.Any]
 
+# local file entries from parse_zip: name, data position, data length, crc32, compression method, uncompressed length.
+_LocalFileType = typing.Tuple[bytes, int, int, int, int, int]
+
+# directory entries written by write_zip_fp: local file offset, name, data length, crc32, and optionally the
+# uncompressed length and compression method when the member is compressed.
+_DirDataType = typing.Tuple[typing.Any, ...]
+
+# supported zip compression methods for members.
+ZIP_STORED = 0
+ZIP_DEFLATED = 8
+
+# deflate compression level; favor speed since data items can be large.
+DEFLATE_LEVEL = 1
+
+_INFLATE_CHUNK_SIZE = 1024 * 1024
+
+# the approximate number of bytes of array data converted and written at once by write_npy.
+_WRITE_CHUNK_SIZE = 16 * 1024 * 1024
+
+# the fields of the local file header and central directory header following the signature. unused fields are
+# skipped using pad bytes so each header is parsed with a single unpack.
+_LOCAL_FILE_HEADER_STRUCT = struct.Struct('<2x2H4xIII2H')  # flags, compression, crc32, lengths, name and extra lengths
+
+# general purpose flag bit indicating the crc32 and lengths follow the member data in a data descriptor.
+_DATA_DESCRIPTOR_FLAG = 0x08
+_DIRECTORY_HEADER_STRUCT = struct.Struct('<24x3H8xI')  # name, extra, and comment lengths, local file offset
+
 
 # http://en.wikipedia.org/wiki/Zip_(file_format)
 # http://www.pkware.com/documents/casestudies/APPNOTE.TXT
@@ -55,36 +83,205 @@ def write_local_file(fp: typing.BinaryIO, name_bytes: bytes, writer: typing.Call
         :param writer: a function taking an fp parameter to do the writing, returns crc32
         :param dt: the datetime to write to the archive
     """
+    crc32_pos = write_local_file_header(fp, name_bytes, ZIP_STORED, dt)
+    data_start_pos = fp.tell()
+    crc32 = writer(fp)
+    data_end_pos = fp.tell()
+    data_len = data_end_pos - data_start_pos
+    fp.seek(crc32_pos)
+    fp.write(struct.pack('I', crc32))       # crc32
+    fp.write(struct.pack('I', data_len))    # compressed length
+    fp.write(struct.pack('I', data_len))    # uncompressed length
+    fp.seek(data_end_pos)
+    return data_len, crc32
+
+
+def write_compressed_local_file(fp: typing.BinaryIO, name_bytes: bytes, writer: typing.Callable[[typing.BinaryIO], typing.Any],
+                                dt: datetime.datetime, compression: int) -> typing.Tuple[int, int, int]:
+    """
+        Writes a compressed zip file local file header structure at the current file position.
+
+        Returns data_len, crc32, uncompressed_len for the data.
+
+        :param fp: the file point to which to write the header
+        :param name: the name of the file
+        :param writer: a function taking a write-only fp parameter to do the writing of the uncompressed data
+        :param dt: the datetime to write to the archive
+        :param compression: the compression method; only ZIP_DEFLATED is supported
+    """
+    assert compression == ZIP_DEFLATED
+    crc32_pos = write_local_file_header(fp, name_bytes, compression, dt)
+    data_start_pos = fp.tell()
+    deflate_fp = DeflateWriter(fp)
+    writer(typing.cast(typing.BinaryIO, deflate_fp))
+    deflate_fp.finish()
+    data_end_pos = fp.tell()
+    data_len = data_end_pos - data_start_pos
+    fp.seek(crc32_pos)
+    fp.write(struct.pack('I', deflate_fp.crc32))             # crc32
+    fp.write(struct.pack('I', data_len))                     # compressed length
+    fp.write(struct.pack('I', deflate_fp.uncompressed_len))  # uncompressed length
+    fp.seek(data_end_pos)
+    return data_len, deflate_fp.crc32, deflate_fp.uncompressed_len
+
+
+def write_npy_header(fp: typing.BinaryIO, shape: typing.Tuple[int, ...], dtype: numpy.typing.DTypeLike, fortran_order: bool = False) -> bytes:
+    """
+        Writes a npy header for an array with shape and dtype at the current file position.
+
+        Returns the header bytes.
+    """
+    header_io = io.BytesIO()
+    header_dict = {"descr": numpy.lib.format.dtype_to_descr(numpy.dtype(dtype)), "fortran_order": fortran_order, "shape": tuple(shape)}
+    try:
+        numpy.lib.format.write_array_header_1_0(header_io, header_dict)
+    except ValueError:
+        numpy.lib.format.write_array_header_2_0(header_io, header_dict)
+    header_data = header_io.getvalue()
+    fp.write(header_data)
+    return header_data
+
+
+def write_npy(fp: typing.BinaryIO, data: _NDArray) -> int:
+    """
+        Writes data in npy format at the current file position in a single pass over the data.
+
+        Returns the crc32 of the written bytes.
+
+        The output is the same as numpy.save. The data is written in chunks so that the
+        crc32 is calculated while writing and so that non-contiguous data is never copied
+        in full.
+    """
+    fortran_order = data.flags.f_contiguous and not data.flags.c_contiguous
+    crc32 = binascii.crc32(write_npy_header(fp, data.shape, data.dtype, fortran_order))
+    # like numpy.save, fortran ordered data is written as its transpose in c order.
+    data_c = data.T if fortran_order else data
+    data_c = data_c.reshape(1) if data_c.ndim == 0 else data_c
+    if data_c.shape[0] > 0:
+        rows_per_chunk = max(1, _WRITE_CHUNK_SIZE // max(1, data_c[0:1].nbytes))
+        for i in range(0, data_c.shape[0], rows_per_chunk):
+            chunk = numpy.ascontiguousarray(data_c[i:i + rows_per_chunk])
+            crc32 = binascii.crc32(chunk.data, crc32)
+            fp.write(chunk.data)
+    return crc32 & 0xFFFFFFFF
+
+
+def write_local_file_header(fp: typing.BinaryIO, name_bytes: bytes, compression: int, dt: datetime.datetime) -> int:
+    """
+        Writes a zip file local file header with placeholders for the crc32 and lengths.
+
+        Returns the position of the crc32 placeholder, which is followed by the compressed and uncompressed lengths.
+    """
     fp.write(struct.pack('I', 0x04034b50))  # local file header
-    fp.write(struct.pack('H', 10))          # extract version (default)
+    fp.write(struct.pack('H', 20 if compression else 10))  # extract version (default)
     fp.write(struct.pack('H', 0))           # general purpose bits
-    fp.write(struct.pack('H', 0))           # compression method
+    fp.write(struct.pack('H', compression))  # compression method
     msdos_date = int(dt.year - 1980) << 9 | int(dt.month) << 5 | int(dt.day)
     msdos_time = int(dt.hour) << 11 | int(dt.minute) << 5 | int(dt.second)
     fp.write(struct.pack('H', msdos_time))  # extract version (default)
     fp.write(struct.pack('H', msdos_date))  # extract version (default)
     crc32_pos = fp.tell()
     fp.write(struct.pack('I', 0))           # crc32 placeholder
-    data_len_pos = fp.tell()
     fp.write(struct.pack('I', 0))           # compressed length placeholder
     fp.write(struct.pack('I', 0))           # uncompressed length placeholder
     fp.write(struct.pack('H', len(name_bytes)))   # name length
     fp.write(struct.pack('H', 0))           # extra length
     fp.write(name_bytes)
-    data_start_pos = fp.tell()
-    crc32 = writer(fp)
-    data_end_pos = fp.tell()
-    data_len = data_end_pos - data_start_pos
-    fp.seek(crc32_pos)
-    fp.write(struct.pack('I', crc32))       # crc32
-    fp.seek(data_len_pos)
-    fp.write(struct.pack('I', data_len))    # compressed length placeholder
-    fp.write(struct.pack('I', data_len))    # uncompressed length placeholder
-    fp.seek(data_end_pos)
-    return data_len, crc32
+    return crc32_pos
 
 
-def write_directory_data(fp: typing.BinaryIO, offset: int, name_bytes: bytes, data_len: int, crc32: int, dt: datetime.datetime) -> None:
+class DeflateWriter:
+    """
+        A write-only file-like object which deflates what is written into fp.
+
+        Tracks the crc32 and length of the uncompressed data.
+    """
+
+    def __init__(self, fp: typing.BinaryIO) -> None:
+        self.__fp = fp
+        self.__compressor = zlib.compressobj(DEFLATE_LEVEL, zlib.DEFLATED, -zlib.MAX_WBITS)
+        self.crc32 = 0
+        self.uncompressed_len = 0
+
+    def write(self, b: typing.Any) -> int:
+        b = memoryview(b).cast("B")
+        self.crc32 = binascii.crc32(b, self.crc32) & 0xFFFFFFFF
+        self.uncompressed_len += b.nbytes
+        self.__fp.write(self.__compressor.compress(b))
+        return b.nbytes
+
+    def finish(self) -> None:
+        self.__fp.write(self.__compressor.flush())
+
+
+class InflateReader:
+    """
+        A read-only file-like object which streams the inflated contents of a deflated member of fp.
+    """
+
+    def __init__(self, fp: typing.BinaryIO, data_pos: int, data_len: int) -> None:
+        self.__fp = fp
+        self.__pos = data_pos
+        self.__remaining = data_len
+        self.__decompressor = zlib.decompressobj(-zlib.MAX_WBITS)
+
+    def read(self, size: int = -1) -> bytes:
+        # inflate no more than the requested size. compressed data the decompressor has not consumed yet is kept as
+        # its unconsumed tail and inflated by the next read, so a highly compressible chunk is never inflated at once.
+        result = bytearray()
+        while size < 0 or len(result) < size:
+            chunk = self.__decompressor.unconsumed_tail
+            if not chunk and self.__remaining > 0:
+                self.__fp.seek(self.__pos)
+                chunk = self.__fp.read(min(self.__remaining, _INFLATE_CHUNK_SIZE))
+                if not chunk:
+                    raise IOError("Unexpected end of compressed data.")
+                self.__pos += len(chunk)
+                self.__remaining -= len(chunk)
+            inflated = self.__decompressor.decompress(chunk, size - len(result) if size >= 0 else 0)
+            if not inflated and not chunk:
+                break
+            result += inflated
+        return bytes(result)
+
+
+def _gf2_matrix_times(mat: typing.Sequence[int], vec: int) -> int:
+    result = 0
+    index = 0
+    while vec:
+        if vec & 1:
+            result ^= mat[index]
+        vec >>= 1
+        index += 1
+    return result
+
+
+def _gf2_matrix_square(mat: typing.Sequence[int]) -> typing.List[int]:
+    return [_gf2_matrix_times(mat, mat[n]) for n in range(32)]
+
+
+def crc32_extend_zeros(crc32: int, length: int) -> int:
+    """
+        Return the crc32 of data with the given crc32 followed by length zero bytes.
+
+        Runs in logarithmic time so reserved data does not need to be read or written
+        to compute its crc32. Uses the same operator squaring technique as zlib's crc32_combine.
+    """
+    register = crc32 ^ 0xFFFFFFFF
+    odd = [0xEDB88320] + [1 << n for n in range(31)]  # operator for one zero bit
+    even = _gf2_matrix_square(odd)  # operator for two zero bits
+    odd = _gf2_matrix_square(even)  # operator for four zero bits
+    while length:
+        even = _gf2_matrix_square(odd)  # operator for the next power of two zero bytes
+        if length & 1:
+            register = _gf2_matrix_times(even, register)
+        length >>= 1
+        odd, even = even, odd
+    return register ^ 0xFFFFFFFF
+
+
+def write_directory_data(fp: typing.BinaryIO, offset: int, name_bytes: bytes, data_len: int, crc32: int, dt: datetime.datetime,
+                         uncompressed_len: typing.Optional[int] = None, compression: int = ZIP_STORED) -> None:
     """
         Write a zip fie directory entry at the current file position
 
@@ -94,19 +291,22 @@ def write_directory_data(fp: typing.BinaryIO, offset: int, name_bytes: bytes, da
         :param data_len: the length of data that will be written to the archive
         :param crc32: the crc32 of the data to be written
         :param dt: the datetime to write to the archive
+        :param uncompressed_len: the uncompressed length of the data, if different from data_len
+        :param compression: the compression method of the data
     """
+    uncompressed_len = uncompressed_len if uncompressed_len is not None else data_len
     fp.write(struct.pack('I', 0x02014b50))  # central directory header
-    fp.write(struct.pack('H', 10))          # made by version (default)
-    fp.write(struct.pack('H', 10))          # extract version (default)
+    fp.write(struct.pack('H', 20 if compression else 10))  # made by version (default)
+    fp.write(struct.pack('H', 20 if compression else 10))  # extract version (default)
     fp.write(struct.pack('H', 0))           # general purpose bits
-    fp.write(struct.pack('H', 0))           # compression method
+    fp.write(struct.pack('H', compression))  # compression method
     msdos_date = int(dt.year - 1980) << 9 | int(dt.month) << 5 | int(dt.day)
     msdos_time = int(dt.hour) << 11 | int(dt.minute) << 5 | int(dt.second)
     fp.write(struct.pack('H', msdos_time))  # extract version (default)
     fp.write(struct.pack('H', msdos_date))  # extract version (default)
     fp.write(struct.pack('I', crc32))       # crc32
     fp.write(struct.pack('I', data_len))    # compressed length
-    fp.write(struct.pack('I', data_len))    # uncompressed length
+    fp.write(struct.pack('I', uncompressed_len))  # uncompressed length
     fp.write(struct.pack('H', len(name_bytes)))   # name length
     fp.write(struct.pack('H', 0))           # extra length
     fp.write(struct.pack('H', 0))           # comments length
@@ -137,7 +337,8 @@ def write_end_of_directory(fp: typing.BinaryIO, dir_size: int, dir_offset: int,
 
 
 def write_zip_fp(fp: typing.BinaryIO, data: typing.Optional[_NDArray], properties: PersistentDictType,
-                 dir_data_list: typing.Optional[typing.List[typing.Tuple[int, bytes, int, int]]] = None) -> None:
+                 dir_data_list: typing.Optional[typing.List[_DirDataType]] = None, compression: int = ZIP_STORED,
+                 reserve_shape_and_dtype: typing.Optional[typing.Tuple[typing.Tuple[int, ...], numpy.typing.DTypeLike]] = None) -> None:
     """
         Write custom zip file of data and properties to fp
 
@@ -145,6 +346,12 @@ def write_zip_fp(fp: typing.BinaryIO, data: typing.Optional[_NDArray], propertie
         :param data: the data to write to the file; may be None
         :param properties: the properties to write to the file; may be None
         :param dir_data_list: optional list of directory header information structures
+        :param compression: the compression method for the data; the properties are always stored uncompressed
+        :param reserve_shape_and_dtype: optional shape and dtype of zero data to reserve when data is None
+
+        If reserve_shape_and_dtype is specified, the data file is written as a numpy
+        header followed by unwritten space, which reads as zeros and which is sparse
+        on file systems that support it. The data is always stored uncompressed.
 
         If dir_data_list is specified, data should be None and properties should
         be specified. Then the existing data structure will be left alone and only
@@ -156,24 +363,29 @@ def write_zip_fp(fp: typing.BinaryIO, data: typing.Optional[_NDArray], propertie
         The properties param must not change during this method. Callers should
         take care to ensure this does not happen.
     """
-    assert data is not None or properties is not None
-    # dir_data_list has the format: local file record offset, name, data length, crc32
+    assert data is not None or properties is not None or reserve_shape_and_dtype is not None
+    # dir_data_list has the format: local file record offset, name, data length, crc32, and optionally the
+    # uncompressed length and compression method.
     dir_data_list = list() if dir_data_list is None else dir_data_list
     dt = datetime.datetime.now()
-    if data is not None:
+    if data is None and reserve_shape_and_dtype is not None:
         offset_data = fp.tell()
-        def write_data(fp: typing.BinaryIO) -> int:
-            numpy_start_pos = fp.tell()
-            numpy.save(fp, data)  # type: ignore
-            numpy_end_pos = fp.tell()
-            fp.seek(numpy_start_pos)
-            assert data is not None
-            data_c = numpy.require(data, dtype=data.dtype, requirements=["C_CONTIGUOUS"])
-            header_data = fp.read((numpy_end_pos - numpy_start_pos) - data_c.nbytes)  # read the header
-            data_crc32 = binascii.crc32(data_c.data, binascii.crc32(header_data)) & 0xFFFFFFFF
-            fp.seek(numpy_end_pos)
-            return data_crc32
-        data_len, crc32 = write_local_file(fp, b"data.npy", write_data, dt)
+        reserve_shape, reserve_dtype = reserve_shape_and_dtype
+        def reserve_data(fp: typing.BinaryIO) -> int:
+            dtype = numpy.dtype(reserve_dtype)
+            header_data = write_npy_header(fp, reserve_shape, dtype)
+            data_nbytes = int(numpy.prod(reserve_shape, dtype=numpy.int64)) * dtype.itemsize
+            fp.seek(data_nbytes, os.SEEK_CUR)  # leave a hole; following writes extend the file
+            return crc32_extend_zeros(binascii.crc32(header_data), data_nbytes)
+        data_len, crc32 = write_local_file(fp, b"data.npy", reserve_data, dt)
+        dir_data_list.append((offset_data, b"data.npy", data_len, crc32))
+    elif data is not None and compression != ZIP_STORED:
+        offset_data = fp.tell()
+        data_len, crc32, uncompressed_len = write_compressed_local_file(fp, b"data.npy", lambda fp: write_npy(fp, data), dt, compression)
+        dir_data_list.append((offset_data, b"data.npy", data_len, crc32, uncompressed_len, compression))
+    elif data is not None:
+        offset_data = fp.tell()
+        data_len, crc32 = write_local_file(fp, b"data.npy", lambda fp: write_npy(fp, data), dt)
         dir_data_list.append((offset_data, b"data.npy", data_len, crc32))
     if properties is not None:
         json_str = str()
@@ -201,20 +413,23 @@ def write_zip_fp(fp: typing.BinaryIO, data: typing.Optional[_NDArray], propertie
         json_len, json_crc32 = write_local_file(fp, b"metadata.json", write_json, dt)
         dir_data_list.append((offset_json, b"metadata.json", json_len, json_crc32))
     dir_offset = fp.tell()
-    for offset, name_bytes, data_len, crc32 in dir_data_list:
-        write_directory_data(fp, offset, name_bytes, data_len, crc32, dt)
+    for dir_data in dir_data_list:
+        write_directory_data(fp, *dir_data[:4], dt, *dir_data[4:])
     dir_size = fp.tell() - dir_offset
     write_end_of_directory(fp, dir_size, dir_offset, len(dir_data_list))
     fp.truncate()
 
 
-def write_zip(file_path: str, data: typing.Optional[_NDArray], properties: PersistentDictType) -> None:
+def write_zip(file_path: str, data: typing.Optional[_NDArray], properties: PersistentDictType, compression: int = ZIP_STORED,
+              reserve_shape_and_dtype: typing.Optional[typing.Tuple[typing.Tuple[int, ...], numpy.typing.DTypeLike]] = None) -> None:
     """
         Write custom zip file to the file path
 
         :param file_path: the file to which to write the zip file
         :param data: the data to write to the file; may be None
         :param properties: the properties to write to the file; may be None
+        :param compression: the compression method for the data
+        :param reserve_shape_and_dtype: optional shape and dtype of zero data to reserve when data is None
 
         The properties param must not change during this method. Callers should
         take care to ensure this does not happen.
@@ -222,10 +437,10 @@ def write_zip(file_path: str, data: typing.Optional[_NDArray], properties: Persi
         See write_zip_fp.
     """
     with open(file_path, "w+b") as fp:
-        write_zip_fp(fp, data, properties)
+        write_zip_fp(fp, data, properties, compression=compression, reserve_shape_and_dtype=reserve_shape_and_dtype)
 
 
-def parse_zip(fp: typing.BinaryIO) -> typing.Tuple[typing.Dict[int, typing.Tuple[bytes, int, int, int]], typing.Dict[bytes, typing.Tuple[int, int]], typing.Optional[typing.Tuple[int, int]]]:
+def parse_zip(fp: typing.BinaryIO) -> typing.Tuple[typing.Dict[int, _LocalFileType], typing.Dict[bytes, typing.Tuple[int, int]], typing.Optional[typing.Tuple[int, int]]]:
     """
         Parse the zip file headers at fp
 
@@ -233,7 +448,8 @@ def parse_zip(fp: typing.BinaryIO) -> typing.Tuple[typing.Dict[int, typing.Tuple
         :return: A tuple of local files, directory headers, and end of central directory
 
         The local files are dictionary where the keys are the local file offset and the
-        values are each a tuple consisting of the name, data position, data length, and crc32.
+        values are each a tuple consisting of the name, data position, data length, crc32,
+        compression method, and uncompressed data length.
 
         The directory headers are a dictionary where the keys are the names of the files
         and the values are a tuple consisting of the directory header position, and the
@@ -242,41 +458,35 @@ def parse_zip(fp: typing.BinaryIO) -> typing.Tuple[typing.Dict[int, typing.Tuple
         The end of central directory is a tuple consisting of the location of the end of
         central directory header and the location of the first directory header.
 
+        Members with data descriptors (general purpose flag bit 3) are not supported and raise
+        IOError; files written by this module never use them.
+
         This method will seek to location 0 of fp and leave fp at end of file.
     """
-    local_files: typing.Dict[int, typing.Tuple[bytes, int, int, int]] = dict()
+    local_files: typing.Dict[int, _LocalFileType] = dict()
     dir_files: typing.Dict[bytes, typing.Tuple[int, int]] = dict()
     eocd: typing.Optional[typing.Tuple[int, int]] = None
     fp.seek(0)
     while True:
         pos = fp.tell()
-        signature = struct.unpack('I', fp.read(4))[0]
+        signature = struct.unpack('<I', fp.read(4))[0]
         if signature == 0x04034b50:
-            fp.seek(pos + 14)
-            crc32 = struct.unpack('I', fp.read(4))[0]
-            fp.seek(pos + 18)
-            data_len = struct.unpack('I', fp.read(4))[0]
-            fp.seek(pos + 26)
-            name_len = struct.unpack('H', fp.read(2))[0]
-            extra_len = struct.unpack('H', fp.read(2))[0]
+            (flags, compression, crc32, data_len, uncompressed_len, name_len, extra_len) = _LOCAL_FILE_HEADER_STRUCT.unpack(fp.read(_LOCAL_FILE_HEADER_STRUCT.size))
+            if flags & _DATA_DESCRIPTOR_FLAG:
+                # the lengths in the local file header are zero and the member cannot be skipped without them.
+                raise IOError("Zip members with data descriptors are not supported.")
             name_bytes = fp.read(name_len)
-            fp.seek(extra_len, os.SEEK_CUR)
-            data_pos = fp.tell()
-            fp.seek(data_len, os.SEEK_CUR)
-            local_files[pos] = (name_bytes, data_pos, data_len, crc32)
+            data_pos = pos + 30 + name_len + extra_len
+            fp.seek(data_pos + data_len)
+            local_files[pos] = (name_bytes, data_pos, data_len, crc32, compression, uncompressed_len)
         elif signature == 0x02014b50:
-            fp.seek(pos + 28)
-            name_len = struct.unpack('H', fp.read(2))[0]
-            extra_len = struct.unpack('H', fp.read(2))[0]
-            comment_len = struct.unpack('H', fp.read(2))[0]
-            fp.seek(pos + 42)
-            pos2 = struct.unpack('I', fp.read(4))[0]
+            (name_len, extra_len, comment_len, pos2) = _DIRECTORY_HEADER_STRUCT.unpack(fp.read(_DIRECTORY_HEADER_STRUCT.size))
             name_bytes = fp.read(name_len)
             fp.seek(pos + 46 + name_len + extra_len + comment_len)
             dir_files[name_bytes] = (pos, pos2)
         elif signature == 0x06054b50:
             fp.seek(pos + 16)
-            pos2 = struct.unpack('I', fp.read(4))[0]
+            pos2 = struct.unpack('<I', fp.read(4))[0]
             eocd = (pos, pos2)
             break
         else:
@@ -284,7 +494,7 @@ def parse_zip(fp: typing.BinaryIO) -> typing.Tuple[typing.Dict[int, typing.Tuple
     return local_files, dir_files, eocd
 
 
-def read_data(fp: typing.BinaryIO, local_files: typing.Dict[int, typing.Tuple[bytes, int, int, int]], dir_files: typing.Dict[bytes, typing.Tuple[int, int]], name_bytes: bytes) -> typing.Optional[_NDArray]:
+def read_data(fp: typing.BinaryIO, local_files: typing.Dict[int, _LocalFileType], dir_files: typing.Dict[bytes, typing.Tuple[int, int]], name_bytes: bytes) -> typing.Optional[_NDArray]:
     """
         Read a numpy data array from the zip file
 
@@ -299,14 +509,19 @@ def read_data(fp: typing.BinaryIO, local_files: typing.Dict[int, typing.Tuple[by
 
         The local_files and dir_files should be passed from
         the results of parse_zip.
+
+        Deflated data is decompressed while streaming it into the array.
     """
     if name_bytes in dir_files:
-        fp.seek(local_files[dir_files[name_bytes][1]][1])
+        local_file = local_files[dir_files[name_bytes][1]]
+        if local_file[4] == ZIP_DEFLATED:
+            return typing.cast(_NDArray, numpy.lib.format.read_array(InflateReader(fp, local_file[1], local_file[2])))  # type: ignore
+        fp.seek(local_file[1])
         return numpy.load(fp)  # type: ignore
     return None
 
 
-def read_json(fp: typing.BinaryIO, local_files: typing.Dict[int, typing.Tuple[bytes, int, int, int]], dir_files: typing.Dict[bytes, typing.Tuple[int, int]], name_bytes: bytes) -> PersistentDictType:
+def read_json(fp: typing.BinaryIO, local_files: typing.Dict[int, _LocalFileType], dir_files: typing.Dict[bytes, typing.Tuple[int, int]], name_bytes: bytes) -> PersistentDictType:
     """
         Read json properties from the zip file
 
@@ -327,6 +542,8 @@ def read_json(fp: typing.BinaryIO, local_files: typing.Dict[int, typing.Tuple[by
         json_len = local_files[dir_files[name_bytes][1]][2]
         fp.seek(json_pos)
         json_properties = fp.read(json_len)
+        if local_files[dir_files[name_bytes][1]][4] == ZIP_DEFLATED:
+            json_properties = zlib.decompress(json_properties, -zlib.MAX_WBITS)
         return typing.cast(PersistentDictType, json.loads(json_properties.decode("utf-8")))
     return dict()
 
@@ -339,30 +556,40 @@ def rewrite_zip(file_path: str, properties: PersistentDictType) -> None:
         :param properties: the updated properties to write to the zip file
 
         This method will attempt to keep the data file within the zip
-        file intact without rewriting it. However, if the data file is not the
-        first item in the zip file, this method will rewrite it.
+        file intact without rewriting it. If the metadata file follows the data
+        file, it is overwritten in place. Otherwise the new metadata file is
+        appended after the data file and the old one is left as unused space.
+        The unused space is compacted by rewriting the data file once it is
+        larger than the data file itself.
 
         The properties param must not change during this method. Callers should
         take care to ensure this does not happen.
     """
     with open(file_path, "r+b") as fp:
         local_files, dir_files, eocd = parse_zip(fp)
-        # check to make sure directory has two files, named data.npy and metadata.json, and that data.npy is first
-        # TODO: check compression, etc.
-        if len(dir_files) == 2 and b"data.npy" in dir_files and b"metadata.json" in dir_files and dir_files[b"data.npy"][1] == 0:
-            fp.seek(dir_files[b"metadata.json"][1])
-            dir_data_list = list()
+        # check to make sure directory has two files, named data.npy and metadata.json
+        if len(dir_files) == 2 and b"data.npy" in dir_files and b"metadata.json" in dir_files:
             local_file_pos = dir_files[b"data.npy"][1]
             local_file = local_files[local_file_pos]
-            dir_data_list.append((local_file_pos, b"data.npy", local_file[2], local_file[3]))
-            write_zip_fp(fp, None, properties, dir_data_list)
-        else:
-            data = None
-            if b"data.npy" in dir_files:
-                fp.seek(local_files[dir_files[b"data.npy"][1]][1])
-                data = numpy.load(fp)  # type: ignore
-            fp.seek(0)
-            write_zip_fp(fp, data, properties)
+            metadata_local_file_pos = dir_files[b"metadata.json"][1]
+            if metadata_local_file_pos > local_file_pos:
+                metadata_pos = metadata_local_file_pos
+            else:
+                metadata_pos = max(other_local_file[1] + other_local_file[2] for other_local_file in local_files.values())
+            unused_len = metadata_pos - (local_file[1] + local_file[2] - local_file_pos)
+            if unused_len <= local_file[2]:
+                fp.seek(metadata_pos)
+                dir_data_list: typing.List[_DirDataType] = list()
+                dir_data_list.append((local_file_pos, b"data.npy", local_file[2], local_file[3], local_file[5], local_file[4]))
+                write_zip_fp(fp, None, properties, dir_data_list)
+                return
+        data = None
+        compression = ZIP_STORED
+        if b"data.npy" in dir_files:
+            compression = local_files[dir_files[b"data.npy"][1]][4]
+            data = read_data(fp, local_files, dir_files, b"data.npy")
+        fp.seek(0)
+        write_zip_fp(fp, data, properties, compression=compression)
 
 
 class NDataHandler(StorageHandler.StorageHandler):
@@ -370,10 +597,14 @@ class NDataHandler(StorageHandler.StorageHandler):
         A handler object for ndata files.
 
         ndata files are a zip file consisting of data.npy file and a metadata.json file.
-        Both files must be uncompressed.
+        Both files may be stored or deflated. The data is written deflated if compression is
+        set to ZIP_DEFLATED on the handler; if compression is None, the data keeps the compression
+        of the existing data, or uses default_compression for new files. The metadata is always
+        written uncompressed.
 
         The handler will read zip files where the metadata.json file is the first of the
-        two files; however it will always make sure data is the first file upon writing.
+        two files; however it will always make sure data is the first file when writing data.
+        Writing only properties does not move the data; see rewrite_zip.
 
         The handler is meant to be fully independent so that it can easily be plugged into
         earlier versions of Swift as it evolves.
@@ -384,9 +615,15 @@ class NDataHandler(StorageHandler.StorageHandler):
     """
     count = 0  # useful for detecting leaks in tests
 
+    default_compression = ZIP_STORED
+
     def __init__(self, file_path: typing.Union[str, pathlib.Path]) -> None:
         self.__file_path = str(file_path)
         self.__lock = threading.RLock()
+        self.compression: typing.Optional[int] = None
+        # cache of the parsed zip headers, keyed by the file size and modification time. invalidated on write.
+        self.__zip_index: typing.Optional[typing.Tuple[typing.Dict[int, _LocalFileType], typing.Dict[bytes, typing.Tuple[int, int]], typing.Optional[typing.Tuple[int, int]]]] = None
+        self.__zip_index_key: typing.Optional[typing.Tuple[int, int]] = None
         NDataHandler.count += 1
 
     def close(self) -> None:
@@ -404,6 +641,27 @@ class NDataHandler(StorageHandler.StorageHandler):
     def is_valid(self) -> bool:
         return True
 
+    def __parse_zip(self, fp: typing.BinaryIO) -> typing.Tuple[typing.Dict[int, _LocalFileType], typing.Dict[bytes, typing.Tuple[int, int]], typing.Optional[typing.Tuple[int, int]]]:
+        stat = os.fstat(fp.fileno())
+        zip_index_key = (stat.st_size, stat.st_mtime_ns)
+        if self.__zip_index is None or self.__zip_index_key != zip_index_key:
+            self.__zip_index = parse_zip(fp)
+            self.__zip_index_key = zip_index_key
+        return self.__zip_index
+
+    def __get_data_compression(self) -> int:
+        # return the compression of the existing data or the default compression if there is no data.
+        if os.path.exists(self.__file_path):
+            with open(self.__file_path, "rb") as fp:
+                local_files, dir_files, eocd = self.__parse_zip(fp)
+                if b"data.npy" in dir_files:
+                    return local_files[dir_files[b"data.npy"][1]][4]
+        return NDataHandler.default_compression
+
+    def __invalidate_zip_index(self) -> None:
+        self.__zip_index = None
+        self.__zip_index_key = None
+
     @classmethod
     def is_matching(cls, file_path: str) -> bool:
         """
@@ -416,9 +674,10 @@ class NDataHandler(StorageHandler.StorageHandler):
                     contains_data = b"data.npy" in dir_files
                     contains_metadata = b"metadata.json" in dir_files
                     file_count = contains_data + contains_metadata  # use fact that True is 1, False is 0
-                    # TODO: make sure ndata isn't compressed, or handle it
                     if len(dir_files) != file_count or file_count == 0:
                         return False
+                    if any(local_file[4] not in (ZIP_STORED, ZIP_DEFLATED) for local_file in local_files.values()):
+                        return False
                     return True
             except Exception as e:
                 logging.error("Exception parsing ndata file: %s", file_path)
@@ -451,14 +710,33 @@ class NDataHandler(StorageHandler.StorageHandler):
             make_directory_if_needed(os.path.dirname(absolute_file_path))
             properties = self.read_properties() if os.path.exists(absolute_file_path) else dict()
             if properties is not None:
-                write_zip(absolute_file_path, data, properties)
+                compression = self.compression if self.compression is not None else self.__get_data_compression()
+                self.__invalidate_zip_index()
+                write_zip(absolute_file_path, data, properties, compression=compression)
             # convert to utc time.
             tz_minutes = Utility.local_utcoffset_minutes(file_datetime)
             timestamp = calendar.timegm(file_datetime.timetuple()) - tz_minutes * 60
             os.utime(absolute_file_path, (time.time(), timestamp))
 
     def reserve_data(self, data_shape: typing.Tuple[int, ...], data_dtype: numpy.typing.DTypeLike, file_datetime: datetime.datetime) -> None:
-        self.write_data(numpy.zeros(data_shape, data_dtype), file_datetime)
+        """
+            Reserve zero data in the ndata file specified by reference without writing the zeros.
+
+            :param data_shape: the shape of the data to reserve
+            :param data_dtype: the dtype of the data to reserve
+            :param file_datetime: the datetime for the file
+        """
+        with self.__lock:
+            absolute_file_path = self.__file_path
+            make_directory_if_needed(os.path.dirname(absolute_file_path))
+            properties = self.read_properties() if os.path.exists(absolute_file_path) else dict()
+            if properties is not None:
+                self.__invalidate_zip_index()
+                write_zip(absolute_file_path, None, properties, reserve_shape_and_dtype=(data_shape, data_dtype))
+            # convert to utc time.
+            tz_minutes = Utility.local_utcoffset_minutes(file_datetime)
+            timestamp = calendar.timegm(file_datetime.timetuple()) - tz_minutes * 60
+            os.utime(absolute_file_path, (time.time(), timestamp))
 
     def write_properties(self, properties: PersistentDictType, file_datetime: datetime.datetime) -> None:
         """
@@ -476,6 +754,7 @@ class NDataHandler(StorageHandler.StorageHandler):
             #logging.debug("WRITE properties %s for %s", absolute_file_path, key)
             make_directory_if_needed(os.path.dirname(absolute_file_path))
             exists = os.path.exists(absolute_file_path)
+            self.__invalidate_zip_index()
             if exists:
                 rewrite_zip(absolute_file_path, Utility.clean_dict(properties))
             else:
@@ -495,7 +774,7 @@ class NDataHandler(StorageHandler.StorageHandler):
         with self.__lock:
             absolute_file_path = self.__file_path
             with open(absolute_file_path, "rb") as fp:
-                local_files, dir_files, eocd = parse_zip(fp)
+                local_files, dir_files, eocd = self.__parse_zip(fp)
                 properties = read_json(fp, local_files, dir_files, b"metadata.json")
             return properties
 
@@ -510,7 +789,7 @@ class NDataHandler(StorageHandler.StorageHandler):
             absolute_file_path = self.__file_path
             #logging.debug("READ data file %s", absolute_file_path)
             with open(absolute_file_path, "rb") as fp:
-                local_files, dir_files, eocd = parse_zip(fp)
+                local_files, dir_files, eocd = self.__parse_zip(fp)
                 return read_data(fp, local_files, dir_files, b"data.npy")
 
     def remove(self) -> None:
@@ -522,5 +801,6 @@ class NDataHandler(StorageHandler.StorageHandler):
         with self.__lock:
             absolute_file_path = self.__file_path
             #logging.debug("DELETE data file %s", absolute_file_path)
+            self.__invalidate_zip_index()
             if os.path.isfile(absolute_file_path):
                 os.remove(absolute_file_path)
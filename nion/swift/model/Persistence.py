@@ -43,6 +43,8 @@ _PropertyReadFn = typing.Callable[["PersistentProperty", PersistentDictType], ty
 _PropertyWriterFn = typing.Callable[["PersistentProperty", PersistentDictType, typing.Any], None]
 _PropertyConverterType = Converter.ConverterLike[typing.Any, typing.Any]  # Utility.CleanValue?
 _PersistentObjectFactoryFn = typing.Callable[[typing.Callable[[str], str]], typing.Optional["PersistentObject"]]
+_PropertyConvertGetFn = typing.Callable[[Utility.DirtyValue], Utility.CleanValue]
+_PropertyConvertSetFn = typing.Callable[[Utility.CleanValue], Utility.DirtyValue]
 
 class PersistentProperty:
 
@@ -71,8 +73,8 @@ class PersistentProperty:
         self.converter = converter
         self.reader = reader
         self.writer = writer
-        self.convert_get_fn = typing.cast(typing.Callable[[Utility.DirtyValue], Utility.CleanValue], converter.convert if converter else copy.deepcopy)  # optimization
-        self.convert_set_fn = typing.cast(typing.Callable[[Utility.CleanValue], Utility.DirtyValue], converter.convert_back if converter else lambda value: value)  # optimization
+        self.convert_get_fn = typing.cast(_PropertyConvertGetFn, converter.convert if converter else copy.deepcopy)  # optimization
+        self.convert_set_fn = typing.cast(_PropertyConvertSetFn, converter.convert_back if converter else lambda value: value)  # optimization
         self.changed = changed
 
     def close(self) -> None:
@@ -98,6 +100,11 @@ class PersistentProperty:
     def json_value(self) -> Utility.CleanValue:
         return self.convert_get_fn(self.value)
 
+    @property
+    def value_view(self) -> typing.Any:
+        # a read-only view of the value, avoiding the copy made by json_value.
+        return Utility.make_read_only_view(self.value)
+
     @json_value.setter
     def json_value(self, json_value: Utility.CleanValue) -> None:
         self.set_value(self.convert_set_fn(json_value))
@@ -155,6 +162,10 @@ class PersistentPropertySpecial(PersistentProperty):
     def value(self, value: typing.Any) -> None:
         self.__value = value
 
+    @property
+    def value_view(self) -> typing.Any:
+        return Utility.make_read_only_view(self.__value)
+
 
 class PersistentItem:
 
@@ -984,6 +995,11 @@ class PersistentObject(Observable.Observable):
         property = self.__properties.get(name)
         return property.value if property else default
 
+    def _get_persistent_property_value_view(self, name: str, default: typing.Any = None) -> typing.Any:
+        """ Subclasses can call this to get a read-only view of a hidden property without copying it. """
+        property = self.__properties.get(name)
+        return property.value_view if property else default
+
     def _set_persistent_property_value(self, name: str, value: typing.Any) -> None:
         """ Subclasses can call this to set a hidden property. """
         property = self.__properties[name]
@@ -11,8 +11,10 @@ their output takes (scalar or not).
 from __future__ import annotations
 
 # standard libraries
+import concurrent.futures
 import functools
 import gettext
+import os
 import typing
 
 # third party libraries
@@ -32,6 +34,7 @@ if typing.TYPE_CHECKING:
 PersistentDictType = typing.Dict[str, typing.Any]
 _ImageDataType = DataAndMetadata._ImageDataType
 _ProcessingResult = typing.Union[DataAndMetadata.DataAndMetadata, DataAndMetadata.ScalarAndMetadata, None]
+_MapFunction = typing.Callable[[_ImageDataType], _ImageDataType]
 
 _ = gettext.gettext
 
@@ -43,6 +46,12 @@ class ProcessingComputation:
         self.__data: typing.Optional[_ImageDataType] = None
         self.__xdata: typing.Optional[_ProcessingResult] = None
 
+    # the maximum number of worker threads used when applying a vectorized mapping over the navigation axes.
+    max_mapping_workers = min(4, os.cpu_count() or 1)
+
+    # the approximate size (in bytes) of each block; smaller collections are processed on the calling thread.
+    mapping_block_bytes = 64 * 1024 * 1024
+
     def execute(self, **kwargs: typing.Any) -> None:
         # let the processing component do the processing and store result in the xdata field.
         # TODO: handle multiple sources (broadcasting)
@@ -53,12 +62,11 @@ class ProcessingComputation:
             xdata = data_source.xdata
             assert xdata
             self.__xdata = None
+            if self.__execute_vectorized(data_source, xdata, **kwargs):
+                return
             indexes = numpy.ndindex(xdata.navigation_dimension_shape)  # type: ignore
             for index in indexes:
-                index_data_source = DataItem.DataSource(data_source._display_data_channel, data_source.graphic._graphic if data_source.graphic else None, xdata[index])
-                index_kw_args = {next(iter(kwargs.keys())): index_data_source}
-                for k, v in list(kwargs.items())[1:]:
-                    index_kw_args[k] = v
+                index_kw_args = self.__make_index_kw_args(data_source, xdata, index, **kwargs)
                 processed_data = self.processing_component.process(**index_kw_args)
                 if isinstance(processed_data, DataAndMetadata.DataAndMetadata):
                     # handle array data
@@ -85,6 +93,48 @@ class ProcessingComputation:
         elif not self.processing_component.is_scalar:
             self.__xdata = self.processing_component.process(**kwargs)
 
+    def __make_index_kw_args(self, data_source: Facade.DataSource, xdata: DataAndMetadata.DataAndMetadata, index: typing.Tuple[int, ...], **kwargs: typing.Any) -> typing.Dict[str, typing.Any]:
+        index_data_source = DataItem.DataSource(data_source._display_data_channel, data_source.graphic._graphic if data_source.graphic else None, xdata[index])
+        index_kw_args: typing.Dict[str, typing.Any] = {next(iter(kwargs.keys())): index_data_source}
+        for k, v in list(kwargs.items())[1:]:
+            index_kw_args[k] = v
+        return index_kw_args
+
+    def __execute_vectorized(self, data_source: Facade.DataSource, xdata: DataAndMetadata.DataAndMetadata, **kwargs: typing.Any) -> bool:
+        # apply the processing to all navigation indexes at once if the processing component supports it. the first
+        # index is processed normally to determine the dtype, shape, and calibrations of the result; then the data for
+        # all indexes is processed by the block function, split into blocks along the first navigation axis.
+        # returns False if the processing component does not support vectorized mapping for these arguments.
+        navigation_shape = tuple(xdata.navigation_dimension_shape)
+        if not navigation_shape or 0 in navigation_shape:
+            return False
+        index_kw_args = self.__make_index_kw_args(data_source, xdata, (0,) * len(navigation_shape), **kwargs)
+        map_fn = self.processing_component.process_mapped(**index_kw_args)
+        if not map_fn:
+            return False
+        processed_data = self.processing_component.process(**index_kw_args)
+        if isinstance(processed_data, DataAndMetadata.DataAndMetadata):
+            index_xdata = processed_data
+            data = numpy.empty(navigation_shape + tuple(index_xdata.datum_dimension_shape), dtype=index_xdata.data_dtype)
+            self.__xdata = DataAndMetadata.new_data_and_metadata(
+                data, index_xdata.intensity_calibration,
+                tuple(xdata.navigation_dimensional_calibrations) + tuple(index_xdata.datum_dimensional_calibrations),
+                None, None, DataAndMetadata.DataDescriptor(xdata.is_sequence, xdata.collection_dimension_count, index_xdata.datum_dimension_count))
+        elif isinstance(processed_data, DataAndMetadata.ScalarAndMetadata):
+            index_scalar = processed_data
+            data = numpy.empty(navigation_shape, dtype=type(index_scalar.value))
+            self.__xdata = DataAndMetadata.new_data_and_metadata(
+                data, index_scalar.calibration,
+                tuple(xdata.navigation_dimensional_calibrations),
+                None, None, DataAndMetadata.DataDescriptor(xdata.is_sequence, 0, xdata.collection_dimension_count))
+        else:
+            return False
+        self.__data = data
+        src_data = xdata.data
+        assert src_data is not None
+        map_blocks(map_fn, src_data, data, self.max_mapping_workers, self.mapping_block_bytes)
+        return True
+
     def commit(self) -> None:
         # store the xdata into the target. this is guaranteed to run on the main thread.
         if self.__xdata:
@@ -107,6 +157,68 @@ class ProcessingBase:
 
     def process(self, *, src: DataItem.DataSource, **kwargs: typing.Any) -> _ProcessingResult: ...
 
+    def process_mapped(self, *, src: DataItem.DataSource, **kwargs: typing.Any) -> typing.Optional[_MapFunction]:
+        """Return a function to process a block of datums at once, or None to process each index individually.
+
+        The src data source represents a single index of the collection. The returned function is passed an array
+        whose leading axes are navigation axes and whose trailing axes are the datum axes of src; it returns the
+        processed block with the same leading axes. The function may be called concurrently from worker threads.
+        """
+        return None
+
+
+def map_blocks(map_fn: _MapFunction, src_data: _ImageDataType, dst_data: _ImageDataType, max_workers: int, block_bytes: int) -> None:
+    """Apply map_fn to src_data and store the results in dst_data, splitting into blocks along the first axis.
+
+    Blocks are processed on up to max_workers worker threads when src_data is larger than block_bytes. With a single
+    worker, the blocks are processed in turn so that temporary arrays made by map_fn stay bounded by the block size.
+    """
+    block_count = min(src_data.shape[0], max(1, int(src_data.nbytes // max(block_bytes, 1))))
+    if block_count > 1:
+        slices = [slice(int(b[0]), int(b[-1]) + 1) for b in numpy.array_split(numpy.arange(src_data.shape[0]), block_count)]
+
+        def process_block(s: slice) -> None:
+            dst_data[s] = map_fn(src_data[s])
+
+        if max_workers > 1:
+            with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+                for future in [executor.submit(process_block, s) for s in slices]:
+                    future.result()
+        else:
+            for s in slices:
+                process_block(s)
+    else:
+        dst_data[...] = map_fn(src_data)
+
+
+def get_masked_sum_function(src: DataItem.DataSource, scale: float) -> typing.Optional[_MapFunction]:
+    """Return a function to sum each datum in a block after applying the mask from src, or None if not supported.
+
+    Matches the sum over src.filtered_xdata for each datum, multiplied by scale. Complex and RGB data are not
+    supported since their filtered data is not a simple product of the mask and the data.
+    """
+    src_xdata = src.xdata
+    if not src_xdata or not src_xdata.is_data_scalar_type or src_xdata.is_data_complex_type:
+        return None
+    datum_axes = tuple(range(-src_xdata.datum_dimension_count, 0))
+    filter_xdata = src.filter_xdata
+    mask = filter_xdata.data if filter_xdata else None
+    if mask is not None and not numpy.all(mask):
+        mask_data = mask
+
+        def masked_sum(data: _ImageDataType) -> _ImageDataType:
+            # the mask is usually boolean; match floating point data so that the sum is done in the input dtype
+            # rather than on a float64 copy of the block.
+            block_mask_data = mask_data.astype(data.dtype, copy=False) if numpy.issubdtype(data.dtype, numpy.floating) else mask_data
+            return numpy.tensordot(data, block_mask_data, axes=(datum_axes, tuple(range(block_mask_data.ndim)))) * scale  # type: ignore
+
+        return masked_sum
+
+    def unmasked_sum(data: _ImageDataType) -> _ImageDataType:
+        return numpy.sum(data, axis=datum_axes) * scale  # type: ignore
+
+    return unmasked_sum
+
 
 class ProcessingFFT(ProcessingBase):
     def __init__(self, **kwargs: typing.Any) -> None:
@@ -161,21 +273,28 @@ class ProcessingGaussianWindow(ProcessingBase):
         ]
         self.is_mappable = True
 
-    def process(self, *, src: DataItem.DataSource, **kwargs: typing.Any) -> _ProcessingResult:
-        sigma = kwargs.get("sigma", 1.0)
-        src_xdata = src.xdata
+    def __get_window(self, src_xdata: typing.Optional[DataAndMetadata.DataAndMetadata], sigma: float) -> typing.Optional[_ImageDataType]:
         if src_xdata and src_xdata.datum_dimension_count == 1:
             w = src_xdata.datum_dimension_shape[0]
-            return src_xdata * scipy.signal.gaussian(src_xdata.datum_dimension_shape[0], std=w / 2)  # type: ignore
+            return scipy.signal.windows.gaussian(src_xdata.datum_dimension_shape[0], std=w / 2)  # type: ignore
         elif src_xdata and src_xdata.datum_dimension_count == 2:
             # uses circularly rotated approach of generating 2D filter from 1D
             h, w = src_xdata.datum_dimension_shape
             y, x = numpy.meshgrid(numpy.linspace(-h / 2, h / 2, h), numpy.linspace(-w / 2, w / 2, w))  # type: ignore
             s = 1 / (min(w, h) * sigma)
             r = numpy.sqrt(y * y + x * x) * s
-            return src_xdata * numpy.exp(-0.5 * r * r)  # type: ignore
+            return numpy.exp(-0.5 * r * r)  # type: ignore
         return None
 
+    def process(self, *, src: DataItem.DataSource, **kwargs: typing.Any) -> _ProcessingResult:
+        src_xdata = src.xdata
+        window = self.__get_window(src_xdata, kwargs.get("sigma", 1.0))
+        return src_xdata * window if src_xdata and window is not None else None
+
+    def process_mapped(self, *, src: DataItem.DataSource, **kwargs: typing.Any) -> typing.Optional[_MapFunction]:
+        window = self.__get_window(src.xdata, kwargs.get("sigma", 1.0))
+        return functools.partial(numpy.multiply, window) if window is not None else None
+
 
 class ProcessingHammingWindow(ProcessingBase):
     def __init__(self, **kwargs: typing.Any) -> None:
@@ -188,18 +307,26 @@ class ProcessingHammingWindow(ProcessingBase):
         ]
         self.is_mappable = True
 
-    def process(self, *, src: DataItem.DataSource, **kwargs: typing.Any) -> _ProcessingResult:
-        src_xdata = src.xdata
+    def __get_window(self, src_xdata: typing.Optional[DataAndMetadata.DataAndMetadata]) -> typing.Optional[_ImageDataType]:
         if src_xdata and src_xdata.datum_dimension_count == 1:
-            return src_xdata * scipy.signal.hamming(src_xdata.datum_dimension_shape[0])  # type: ignore
+            return scipy.signal.windows.hamming(src_xdata.datum_dimension_shape[0])  # type: ignore
         elif src_xdata and src_xdata.datum_dimension_count == 2:
             # uses outer product approach of generating 2D filter from 1D
             h, w = src_xdata.datum_dimension_shape
-            w0 = numpy.reshape(scipy.signal.hamming(w), (1, w))  # type: ignore
-            w1 = numpy.reshape(scipy.signal.hamming(h), (h, 1))  # type: ignore
-            return src_xdata * w0 * w1
+            w0 = numpy.reshape(scipy.signal.windows.hamming(w), (1, w))  # type: ignore
+            w1 = numpy.reshape(scipy.signal.windows.hamming(h), (h, 1))  # type: ignore
+            return w0 * w1  # type: ignore
         return None
 
+    def process(self, *, src: DataItem.DataSource, **kwargs: typing.Any) -> _ProcessingResult:
+        src_xdata = src.xdata
+        window = self.__get_window(src_xdata)
+        return src_xdata * window if src_xdata and window is not None else None
+
+    def process_mapped(self, *, src: DataItem.DataSource, **kwargs: typing.Any) -> typing.Optional[_MapFunction]:
+        window = self.__get_window(src.xdata)
+        return functools.partial(numpy.multiply, window) if window is not None else None
+
 
 class ProcessingHannWindow(ProcessingBase):
     def __init__(self, **kwargs: typing.Any) -> None:
@@ -212,18 +339,26 @@ class ProcessingHannWindow(ProcessingBase):
         ]
         self.is_mappable = True
 
-    def process(self, *, src: DataItem.DataSource, **kwargs: typing.Any) -> _ProcessingResult:
-        src_xdata = src.xdata
-        if src_xdata and  src_xdata.datum_dimension_count == 1:
-            return src_xdata * scipy.signal.hann(src_xdata.datum_dimension_shape[0])  # type: ignore
+    def __get_window(self, src_xdata: typing.Optional[DataAndMetadata.DataAndMetadata]) -> typing.Optional[_ImageDataType]:
+        if src_xdata and src_xdata.datum_dimension_count == 1:
+            return scipy.signal.windows.hann(src_xdata.datum_dimension_shape[0])  # type: ignore
         elif src_xdata and src_xdata.datum_dimension_count == 2:
             # uses outer product approach of generating 2D filter from 1D
             h, w = src_xdata.datum_dimension_shape
-            w0 = numpy.reshape(scipy.signal.hann(w), (1, w))  # type: ignore
-            w1 = numpy.reshape(scipy.signal.hann(h), (h, 1))  # type: ignore
-            return src_xdata * w0 * w1
+            w0 = numpy.reshape(scipy.signal.windows.hann(w), (1, w))  # type: ignore
+            w1 = numpy.reshape(scipy.signal.windows.hann(h), (h, 1))  # type: ignore
+            return w0 * w1  # type: ignore
         return None
 
+    def process(self, *, src: DataItem.DataSource, **kwargs: typing.Any) -> _ProcessingResult:
+        src_xdata = src.xdata
+        window = self.__get_window(src_xdata)
+        return src_xdata * window if src_xdata and window is not None else None
+
+    def process_mapped(self, *, src: DataItem.DataSource, **kwargs: typing.Any) -> typing.Optional[_MapFunction]:
+        window = self.__get_window(src.xdata)
+        return functools.partial(numpy.multiply, window) if window is not None else None
+
 
 class ProcessingMappedSum(ProcessingBase):
     def __init__(self, **kwargs: typing.Any) -> None:
@@ -244,6 +379,9 @@ class ProcessingMappedSum(ProcessingBase):
             return DataAndMetadata.ScalarAndMetadata.from_value(numpy.sum(filtered_xdata), filtered_xdata.intensity_calibration)  # type: ignore
         return None
 
+    def process_mapped(self, *, src: DataItem.DataSource, **kwargs: typing.Any) -> typing.Optional[_MapFunction]:
+        return get_masked_sum_function(src, 1.0)
+
 
 class ProcessingMappedAverage(ProcessingBase):
     def __init__(self, **kwargs: typing.Any) -> None:
@@ -264,6 +402,10 @@ class ProcessingMappedAverage(ProcessingBase):
             return DataAndMetadata.ScalarAndMetadata.from_value(numpy.average(filtered_xdata), filtered_xdata.intensity_calibration)  # type: ignore
         return None
 
+    def process_mapped(self, *, src: DataItem.DataSource, **kwargs: typing.Any) -> typing.Optional[_MapFunction]:
+        src_xdata = src.xdata
+        return get_masked_sum_function(src, 1.0 / numpy.prod(src_xdata.datum_dimension_shape, dtype=numpy.int64)) if src_xdata else None
+
 
 # Registry.register_component(ProcessingFFT(), {"processing-component"})
 # Registry.register_component(ProcessingIFFT(), {"processing-component"})
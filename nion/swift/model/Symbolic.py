@@ -1418,6 +1418,7 @@ class Computation(Persistence.PersistentObject):
         self.__result_base_item_inserted_event_listeners: typing.List[Event.EventListener] = list()
         self.__result_base_item_removed_event_listeners: typing.List[Event.EventListener] = list()
         self.last_evaluate_data_time = 0.0
+        self.last_evaluate_duration = 0.0
         self.needs_update = expression is not None
         self.computation_mutated_event = Event.Event()
         self.computation_output_changed_event = Event.Event()
@@ -1776,6 +1777,7 @@ class Computation(Persistence.PersistentObject):
         needs_update = self.needs_update
         self.needs_update = False
         if needs_update:
+            start_time = time.perf_counter()
             kwargs, is_resolved = self.__resolve_inputs(api)
             if is_resolved:
                 processing_id = self.processing_id
@@ -1799,6 +1801,7 @@ class Computation(Persistence.PersistentObject):
                 error_text = "Missing parameters."
             self._evaluation_count_for_test += 1
             self.last_evaluate_data_time = time.perf_counter()
+            self.last_evaluate_duration = self.last_evaluate_data_time - start_time
         return compute_obj, error_text
 
     def evaluate_with_target(self, api: typing.Any, target: typing.Any) -> typing.Optional[str]:
@@ -1807,6 +1810,7 @@ class Computation(Persistence.PersistentObject):
         needs_update = self.needs_update
         self.needs_update = False
         if needs_update:
+            start_time = time.perf_counter()
             variables = dict()
             for variable in self.variables:
                 bound_object = variable.bound_item
@@ -1824,6 +1828,7 @@ class Computation(Persistence.PersistentObject):
 
             self._evaluation_count_for_test += 1
             self.last_evaluate_data_time = time.perf_counter()
+            self.last_evaluate_duration = self.last_evaluate_data_time - start_time
         return error_text
 
     def __execute_code(self, api: typing.Any, expression: str, target: typing.Any, variables: typing.Dict[str, typing.Any]) -> typing.Optional[str]:
@@ -4,6 +4,7 @@ from __future__ import annotations
 import asyncio
 import collections
 import contextlib
+import copy
 import datetime
 import functools
 import logging
@@ -233,6 +234,91 @@ def clean_item_no_list(i: DirtyValue) -> CleanValue:
     return None
 
 
+class ReadOnlyDictView(typing.Mapping[str, typing.Any]):
+    """A read-only view of a dict, sharing the structure of the dict instead of copying it.
+
+    Nested dicts and lists are returned as views too. Use copy.deepcopy to get a mutable dict.
+    """
+
+    def __init__(self, d: typing.Mapping[str, typing.Any]) -> None:
+        self.__d = d
+
+    def __getitem__(self, key: str) -> typing.Any:
+        return make_read_only_view(self.__d[key])
+
+    def __iter__(self) -> typing.Iterator[str]:
+        return iter(self.__d)
+
+    def __len__(self) -> int:
+        return len(self.__d)
+
+    def __eq__(self, other: typing.Any) -> bool:
+        if isinstance(other, (ReadOnlyDictView, ReadOnlyListView)):
+            other = other._value
+        return bool(self.__d == other)
+
+    def __ne__(self, other: typing.Any) -> bool:
+        return not self.__eq__(other)
+
+    def __repr__(self) -> str:
+        return repr(self.__d)
+
+    def __deepcopy__(self, memo: typing.Dict[typing.Any, typing.Any]) -> typing.Dict[str, typing.Any]:
+        return copy.deepcopy(dict(self.__d), memo)
+
+    @property
+    def _value(self) -> typing.Mapping[str, typing.Any]:
+        return self.__d
+
+
+class ReadOnlyListView(typing.Sequence[typing.Any]):
+    """A read-only view of a list or tuple. See ReadOnlyDictView."""
+
+    def __init__(self, l: typing.Sequence[typing.Any]) -> None:
+        self.__l = l
+
+    @typing.overload
+    def __getitem__(self, index: int) -> typing.Any: ...
+
+    @typing.overload
+    def __getitem__(self, index: slice) -> typing.Sequence[typing.Any]: ...
+
+    def __getitem__(self, index: typing.Union[int, slice]) -> typing.Any:
+        if isinstance(index, slice):
+            return ReadOnlyListView(self.__l[index])
+        return make_read_only_view(self.__l[index])
+
+    def __len__(self) -> int:
+        return len(self.__l)
+
+    def __eq__(self, other: typing.Any) -> bool:
+        if isinstance(other, (ReadOnlyDictView, ReadOnlyListView)):
+            other = other._value
+        return bool(self.__l == other)
+
+    def __ne__(self, other: typing.Any) -> bool:
+        return not self.__eq__(other)
+
+    def __repr__(self) -> str:
+        return repr(self.__l)
+
+    def __deepcopy__(self, memo: typing.Dict[typing.Any, typing.Any]) -> typing.Sequence[typing.Any]:
+        return copy.deepcopy(self.__l, memo)
+
+    @property
+    def _value(self) -> typing.Sequence[typing.Any]:
+        return self.__l
+
+
+def make_read_only_view(value: typing.Any) -> typing.Any:
+    """Return a read-only view of value if it is a dict or list; otherwise return value (immutable) unchanged."""
+    if isinstance(value, dict):
+        return ReadOnlyDictView(value)
+    if isinstance(value, (list, tuple)):
+        return ReadOnlyListView(value)
+    return value
+
+
 def parse_version(version: str, count: int = 3, max_count: typing.Optional[int] = None) -> typing.List[int]:
     max_count = max_count if max_count is not None else count
     version_components = [int(version_component) for version_component in version.split(".")]
@@ -269,11 +355,14 @@ class AtomicFileWriter:
     def __init__(self, filepath: pathlib.Path):
         self.__filepath = filepath
         self.__temp_filepath = self.__filepath.with_suffix(".temp")
-        self.__fp: typing.Optional[typing.TextIO] = None
+        self.__fp: typing.Optional[typing.IO[typing.Any]] = None
+
+    def _open(self, filepath: pathlib.Path) -> typing.IO[typing.Any]:
+        return filepath.open("w")
 
     def __enter__(self) -> typing.TextIO:
-        self.__fp = self.__temp_filepath.open("w")
-        return self.__fp
+        self.__fp = self._open(self.__temp_filepath)
+        return typing.cast(typing.TextIO, self.__fp)
 
     def __exit__(self, exception_type: typing.Optional[typing.Type[Exception]], value: typing.Optional[Exception], traceback: typing.Optional[types.TracebackType]) -> None:
         assert self.__fp
@@ -301,6 +390,15 @@ class AtomicFileWriter:
                 raise
 
 
+class AtomicBinaryFileWriter(AtomicFileWriter):
+
+    def _open(self, filepath: pathlib.Path) -> typing.IO[typing.Any]:
+        return filepath.open("wb")
+
+    def __enter__(self) -> typing.BinaryIO:  # type: ignore[override]
+        return typing.cast(typing.BinaryIO, super().__enter__())
+
+
 def fps_tick(fps_id: str) -> str:
     v = globals().setdefault("__fps_" + fps_id, [0, 0.0, None, 0.0, None, []])
     v[0] += 1
@@ -457,6 +457,34 @@ class TestDataItemClass(unittest.TestCase):
         data_item_copy.close()
         data_item.close()
 
+    def test_snapshot_and_copy_share_stored_data_until_modified(self):
+        with TestContext.create_memory_context() as test_context:
+            document_model = test_context.create_document_model()
+            data_item = DataItem.DataItem()
+            document_model.append_data_item(data_item)
+            # partial updates allocate the data within the data item, like acquisition
+            xdata = DataAndMetadata.new_data_and_metadata(numpy.zeros((8, 8), numpy.uint32))
+            data_item.set_data_and_metadata_partial(xdata.data_metadata, xdata, [slice(0, 8)], [slice(0, 8)])
+            with data_item.data_ref():
+                data_item_snapshot = data_item.snapshot()
+                data_item_copy = copy.deepcopy(data_item)
+                with contextlib.closing(data_item_snapshot), contextlib.closing(data_item_copy):
+                    self.assertTrue(numpy.shares_memory(data_item.data, data_item_snapshot.data))
+                    self.assertTrue(numpy.shares_memory(data_item.data, data_item_copy.data))
+                    # a partial update to the original must not change the snapshot
+                    update_data = numpy.ones((8, 8), numpy.uint32)
+                    data_item.set_data_and_metadata_partial(data_item.data_metadata, DataAndMetadata.new_data_and_metadata(update_data), [slice(0, 2)], [slice(0, 2)])
+                    self.assertEqual(1, data_item.data[0, 0])
+                    self.assertEqual(0, data_item_snapshot.data[0, 0])
+                    self.assertEqual(0, data_item_copy.data[0, 0])
+                    # modifying the snapshot through its data ref must not change the copy
+                    with data_item_snapshot.data_ref() as data_ref:
+                        data_ref.data[4, 4] = 2
+                        data_ref.data_updated()
+                    self.assertEqual(2, data_item_snapshot.data[4, 4])
+                    self.assertEqual(0, data_item_copy.data[4, 4])
+                    self.assertEqual(0, data_item.data[4, 4])
+
     def test_copy_and_snapshot_should_copy_internal_title_caption_description(self):
         with TestContext.create_memory_context() as test_context:
             document_model = test_context.create_document_model()
@@ -1364,6 +1392,27 @@ class TestDataItemClass(unittest.TestCase):
             inverted_display_item = document_model.get_display_item_for_data_item(data_item_inverted)
             self.assertIsInstance(inverted_display_item.data_item.metadata, dict)
 
+    def test_metadata_view_is_read_only_and_metadata_values_are_copies(self):
+        with TestContext.create_memory_context() as test_context:
+            document_model = test_context.create_document_model()
+            data_item = DataItem.DataItem(numpy.ones((8, 8), numpy.double))
+            document_model.append_data_item(data_item)
+            data_item.metadata = {"hardware_source": {"hardware_source_id": "camera"}, "instrument": {"high_tension": 200000}, "list": [1, {"a": 2}]}
+            metadata_view = data_item.metadata_view
+            self.assertEqual(data_item.metadata, metadata_view)
+            self.assertEqual(2, metadata_view["list"][1]["a"])
+            with self.assertRaises(TypeError):
+                metadata_view["list"][1]["a"] = 3  # type: ignore
+            # deep copy of the view is a mutable dict independent of the data item
+            metadata = copy.deepcopy(metadata_view)
+            metadata["hardware_source"]["hardware_source_id"] = "scan"
+            self.assertEqual("camera", data_item.metadata_view["hardware_source"]["hardware_source_id"])
+            self.assertEqual("camera", data_item.get_metadata_value("stem.hardware_source.id"))
+            self.assertTrue(data_item.has_metadata_value("stem.high_tension"))
+            self.assertEqual(200000, data_item.get_metadata_value("stem.high_tension"))
+            data_item.set_metadata_value("stem.high_tension", 100000)
+            self.assertEqual(100000, data_item.get_metadata_value("stem.high_tension"))
+
     def test_data_item_recorder_records_intensity_calibration_changes(self):
         with TestContext.create_memory_context() as test_context:
             document_model = test_context.create_document_model()
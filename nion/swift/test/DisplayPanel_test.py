@@ -1,6 +1,7 @@
 # standard libraries
 import contextlib
 import logging
+import threading
 import typing
 import unittest
 import uuid
@@ -1469,6 +1470,66 @@ class TestDisplayPanelClass(unittest.TestCase):
             display_item.display_type = "image"
             self.assertIsNotNone(display_panel.display_canvas_item._display_values)
 
+    def test_display_2d_prepares_large_display_values_on_thread_and_keeps_previous_bitmap_until_prepared(self):
+        with TestContext.create_memory_context() as test_context:
+            document_controller = test_context.create_document_controller()
+            document_model = document_controller.document_model
+            display_panel = document_controller.selected_display_panel
+            data_item = DataItem.DataItem(numpy.zeros((1024, 1024), numpy.uint16))
+            document_model.append_data_item(data_item)
+            display_item = document_model.get_display_item_for_data_item(data_item)
+            display_panel.set_display_panel_display_item(display_item)
+            header_height = display_panel.header_canvas_item.header_height
+            display_panel.root_container.layout_immediate(Geometry.IntSize(1000 + header_height, 1000))
+            display_canvas_item = display_panel.display_canvas_item
+            preparer = display_canvas_item._display_values_preparer
+            self.assertTrue(preparer.wait(10.0))
+            # the first frame is always displayed
+            display_canvas_item.prepare_display()
+            first_rgba = display_canvas_item._bitmap_canvas_item.rgba_bitmap_data
+            self.assertIsNotNone(first_rgba)
+            # the next frame is prepared on the thread and then displayed
+            data_item.set_data(numpy.arange(1024 * 1024, dtype=numpy.uint16).reshape(1024, 1024))
+            display_values = display_canvas_item._display_values
+            self.assertTrue(preparer.wait(10.0))
+            self.assertFalse(preparer.is_preparing(display_values))
+            display_canvas_item.prepare_display()
+            rgba = display_canvas_item._bitmap_canvas_item.rgba_bitmap_data
+            self.assertIsNot(first_rgba, rgba)
+            self.assertTrue(numpy.array_equal(display_values.display_rgba, rgba))
+            # the bitmap is a copy, since the display values reuse their arrays for later frames
+            self.assertFalse(numpy.shares_memory(display_values.display_rgba, rgba))
+
+    def test_display_values_preparer_drops_stale_display_values(self):
+        preparer = ImageCanvasItem.DisplayValuesPreparer()
+        try:
+            prepared = list()
+            blocked = threading.Event()
+            release = threading.Event()
+
+            class BlockingDisplayValues:
+                def prepare_display(self, is_cancelled):
+                    blocked.set()
+                    release.wait(10.0)
+                    return True
+
+            class DisplayValues:
+                def prepare_display(self, is_cancelled):
+                    return True
+
+            preparer.on_prepared = prepared.append
+            display_values_list = [BlockingDisplayValues(), DisplayValues(), DisplayValues()]
+            preparer.submit(display_values_list[0])
+            self.assertTrue(blocked.wait(10.0))
+            preparer.submit(display_values_list[1])
+            preparer.submit(display_values_list[2])
+            self.assertTrue(preparer.is_preparing(display_values_list[2]))
+            release.set()
+            self.assertTrue(preparer.wait(10.0))
+            self.assertEqual([display_values_list[0], display_values_list[2]], prepared)
+        finally:
+            preparer.close()
+
     def test_display_2d_update_with_no_data(self):
         with TestContext.create_memory_context() as test_context:
             document_controller = test_context.create_document_controller()
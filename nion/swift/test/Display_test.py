@@ -13,7 +13,9 @@ from nion.data import Calibration
 from nion.data import DataAndMetadata
 from nion.swift import Application
 from nion.swift import Facade
+from nion.swift.model import ColorMaps
 from nion.swift.model import DataItem
+from nion.swift.model import DisplayItem
 from nion.swift.model import Graphics
 from nion.swift.model import Symbolic
 from nion.swift.model import Utility
@@ -82,6 +84,41 @@ class TestDisplayClass(unittest.TestCase):
             display_data_channel.display_limits = (2.0, 3.0)
             self.assertEqual(display_data_channel.get_calculated_display_values(True).display_range, (2.0, 3.0))
 
+    def test_data_range_estimate_on_large_data_is_within_data_range_and_has_error_bound(self):
+        data = numpy.random.uniform(-10, 10, (200, 100))
+        data[17, 13] = 100
+        xdata = DataAndMetadata.new_data_and_metadata(data)
+        data_range_estimate_threshold = DisplayItem.DATA_RANGE_ESTIMATE_THRESHOLD
+        data_range_estimate_sample_count = DisplayItem.DATA_RANGE_ESTIMATE_SAMPLE_COUNT
+        DisplayItem.DATA_RANGE_ESTIMATE_THRESHOLD = 1000
+        DisplayItem.DATA_RANGE_ESTIMATE_SAMPLE_COUNT = 500
+        try:
+            for mode in ("strided", "random"):
+                display_values = DisplayItem.DisplayValues(xdata, 0, None, 0, 1, None, None, None, 0.0, 1.0, list(), data_range_estimate_mode=mode)
+                estimated_data_range = display_values.estimated_data_range
+                self.assertGreaterEqual(estimated_data_range[0], numpy.amin(data))
+                self.assertLessEqual(estimated_data_range[1], numpy.amax(data))
+                self.assertLess(estimated_data_range[0], -9)
+                self.assertGreater(estimated_data_range[1], 9)
+                self.assertGreater(display_values.estimated_data_range_error_bound, 0.0)
+                self.assertLess(display_values.estimated_data_range_error_bound, 0.1)
+                # the estimate is only used for the auto display range; the data range stays exact.
+                self.assertEqual(estimated_data_range, display_values.display_range)
+                self.assertEqual((numpy.amin(data), numpy.amax(data)), display_values.data_range)
+            display_values = DisplayItem.DisplayValues(xdata, 0, None, 0, 1, None, None, None, 0.0, 1.0, list())
+            self.assertEqual((numpy.amin(data), numpy.amax(data)), display_values.estimated_data_range)
+            self.assertEqual(0.0, display_values.estimated_data_range_error_bound)
+        finally:
+            DisplayItem.DATA_RANGE_ESTIMATE_THRESHOLD = data_range_estimate_threshold
+            DisplayItem.DATA_RANGE_ESTIMATE_SAMPLE_COUNT = data_range_estimate_sample_count
+
+    def test_display_range_on_complex_data_is_deterministic(self):
+        data = numpy.random.randn(64, 64) + 1j * numpy.random.randn(64, 64)
+        xdata = DataAndMetadata.new_data_and_metadata(data)
+        display_ranges = [DisplayItem.DisplayValues(xdata, 0, None, 0, 1, None, None, None, 0.0, 1.0, list()).display_range for i in range(3)]
+        self.assertEqual(display_ranges[0], display_ranges[1])
+        self.assertEqual(display_ranges[0], display_ranges[2])
+
     def test_display_range_with_zero_display_limits_range_and_adjustment_succeeds(self):
         with TestContext.create_memory_context() as test_context:
             document_model = test_context.create_document_model()
@@ -104,6 +141,119 @@ class TestDisplayClass(unittest.TestCase):
             display_data_channel.adjustments = [{"type": "equalized", "uuid": str(uuid.uuid4())}]
             self.assertIsNotNone(display_data_channel.get_calculated_display_values(True).adjusted_data_and_metadata)
 
+    def test_gamma_and_log_adjustments_match_direct_calculation(self):
+        with TestContext.create_memory_context() as test_context:
+            document_model = test_context.create_document_model()
+            data = numpy.random.uniform(0, 1000, (64, 48)).astype(numpy.uint16)
+            data_item = DataItem.DataItem(data)
+            document_model.append_data_item(data_item)
+            display_item = document_model.get_display_item_for_data_item(data_item)
+            display_data_channel = display_item.display_data_channels[0]
+            display_data_channel.display_limits = (100, 900)
+            normalized = numpy.clip((data.astype(float) - 100) / 800, 0.0, 1.0)
+            display_data_channel.adjustments = [{"type": "gamma", "gamma": 0.5, "uuid": str(uuid.uuid4())}]
+            adjusted_data = display_data_channel.get_calculated_display_values(True).adjusted_data_and_metadata.data
+            self.assertEqual(data.shape, adjusted_data.shape)
+            self.assertTrue(numpy.allclose(numpy.power(normalized, 0.5), adjusted_data, atol=0.01))
+            display_data_channel.adjustments = [{"type": "log", "uuid": str(uuid.uuid4())}]
+            adjusted_data = display_data_channel.get_calculated_display_values(True).adjusted_data_and_metadata.data
+            self.assertTrue(numpy.allclose(numpy.log2(1 + 800 * normalized) / numpy.log2(1 + 800), adjusted_data, atol=0.01))
+
+    def test_integer_display_rgba_through_lookup_table_matches_float_calculation(self):
+        data = numpy.random.default_rng(0).integers(0, 65536, (320, 256)).astype(numpy.uint16)
+        color_map_data = ColorMaps.get_color_map_data_by_id("magma")
+        for adjustments in ([], [{"type": "gamma", "gamma": 0.5}]):
+            for dtype in (numpy.uint16, numpy.uint8):
+                with self.subTest(adjustments=adjustments, dtype=dtype):
+                    display_values = DisplayItem.DisplayValues(DataAndMetadata.new_data_and_metadata(data.astype(dtype)), 0, None, 0, 1, (100.5, 200.5), None, color_map_data, 0.1, 1.5, adjustments)
+                    float_display_values = DisplayItem.DisplayValues(DataAndMetadata.new_data_and_metadata(data.astype(dtype).astype(numpy.float64)), 0, None, 0, 1, (100.5, 200.5), None, color_map_data, 0.1, 1.5, adjustments)
+                    self.assertTrue(numpy.array_equal(float_display_values.display_rgba, display_values.display_rgba))
+                    self.assertTrue(numpy.array_equal(float_display_values.normalized_data_and_metadata.data, display_values.normalized_data_and_metadata.data))
+        # consecutive frames with the same display range and color map share the lookup table
+        lookup_table = ColorMaps.get_integer_rgba_lookup_table(numpy.uint16, (100.0, 200.0), color_map_data)
+        self.assertIs(lookup_table, ColorMaps.get_integer_rgba_lookup_table(numpy.uint16, (100.0, 200.0), color_map_data))
+        self.assertIsNot(lookup_table, ColorMaps.get_integer_rgba_lookup_table(numpy.uint16, (100.0, 201.0), color_map_data))
+
+    def test_display_buffer_pool_reuses_only_released_buffers(self):
+        buffer_pool = DisplayItem.DisplayBufferPool(buffer_count=2)
+        buffer = buffer_pool.get_buffer("rgba", (4, 4), numpy.uint32)
+        self.assertIsNot(buffer, buffer_pool.get_buffer("rgba", (4, 4), numpy.uint32))
+        buffer_pool.release_buffer("rgba", buffer)
+        self.assertIs(buffer, buffer_pool.get_buffer("rgba", (4, 4), numpy.uint32))
+        # a released buffer is handed out once
+        self.assertIsNot(buffer, buffer_pool.get_buffer("rgba", (4, 4), numpy.uint32))
+        # buffers are matched by name, shape, and dtype
+        buffer_pool.release_buffer("rgba", buffer)
+        self.assertIsNot(buffer, buffer_pool.get_buffer("normalized", (4, 4), numpy.uint32))
+        self.assertIsNot(buffer, buffer_pool.get_buffer("rgba", (4, 5), numpy.uint32))
+        self.assertIsNot(buffer, buffer_pool.get_buffer("rgba", (4, 4), numpy.float32))
+
+    def test_display_values_of_consecutive_frames_reuse_released_buffers(self):
+        with TestContext.create_memory_context() as test_context:
+            document_model = test_context.create_document_model()
+            rng = numpy.random.default_rng(0)
+            data_item = DataItem.DataItem(numpy.zeros((512, 256), numpy.uint16))
+            document_model.append_data_item(data_item)
+            display_item = document_model.get_display_item_for_data_item(data_item)
+            display_data_channel = display_item.display_data_channels[0]
+            display_data_channel.display_limits = (100, 60000)
+            display_values_list = list()
+            display_rgba_list = list()
+            display_rgba_copy_list = list()
+            for i in range(6):
+                data = rng.integers(0, 65536, (512, 256)).astype(numpy.uint16)
+                data_item.set_data(data)
+                display_values = display_data_channel.get_calculated_display_values()
+                display_rgba = display_values.display_rgba
+                expected_display_values = DisplayItem.DisplayValues(DataAndMetadata.new_data_and_metadata(data), 0, None, 0, 1, (100, 60000), None, None, 0.0, 1.0, list())
+                self.assertTrue(numpy.array_equal(expected_display_values.display_rgba, display_rgba))
+                display_values.finalize()
+                display_values_list.append(display_values)
+                display_rgba_list.append(display_rgba)
+                display_rgba_copy_list.append(numpy.copy(display_rgba))
+            # the buffers of display values older than the last finalized ones are reused by later frames.
+            generations = DisplayItem.DISPLAY_BUFFER_GENERATIONS
+            self.assertIs(display_rgba_list[0], display_rgba_list[generations + 1])
+            # the buffers of the last finalized display values are not reused.
+            for i in range(len(display_rgba_list) - generations, len(display_rgba_list)):
+                self.assertTrue(numpy.array_equal(display_rgba_copy_list[i], display_rgba_list[i]))
+            # released display values recalculate into new arrays.
+            display_rgba = display_values_list[0].display_rgba
+            self.assertFalse(any(display_rgba is d for d in display_rgba_list))
+            expected_display_values = DisplayItem.DisplayValues(display_values_list[0].data_and_metadata, 0, None, 0, 1, (100, 60000), None, None, 0.0, 1.0, list())
+            self.assertTrue(numpy.array_equal(expected_display_values.display_rgba, display_rgba))
+
+    def test_data_source_display_arrays_are_copies_of_reused_buffers(self):
+        with TestContext.create_memory_context() as test_context:
+            document_model = test_context.create_document_model()
+            data_item = DataItem.DataItem(numpy.random.randn(16, 16).astype(numpy.float32))
+            document_model.append_data_item(data_item)
+            display_item = document_model.get_display_item_for_data_item(data_item)
+            display_data_channel = display_item.display_data_channels[0]
+            display_data_channel.adjustments = [{"type": "gamma", "gamma": 0.5, "uuid": str(uuid.uuid4())}]
+            display_values = display_data_channel.get_calculated_display_values()
+            data_source = DataItem.DataSource(display_data_channel, None, None)
+            adjusted_xdata = data_source.adjusted_xdata
+            self.assertTrue(numpy.array_equal(display_values.adjusted_data_and_metadata.data, adjusted_xdata.data))
+            self.assertFalse(numpy.shares_memory(display_values.adjusted_data_and_metadata.data, adjusted_xdata.data))
+            self.assertFalse(numpy.shares_memory(display_values.normalized_data_and_metadata.data, data_source.normalized_xdata.data))
+            self.assertFalse(numpy.shares_memory(display_values.display_rgba, data_source.display_rgba.data))
+
+    def test_equalized_adjustment_on_large_data_produces_uniform_distribution(self):
+        with TestContext.create_memory_context() as test_context:
+            document_model = test_context.create_document_model()
+            data = numpy.random.exponential(100.0, (1024, 1024)).astype(numpy.float32)
+            data_item = DataItem.DataItem(data)
+            document_model.append_data_item(data_item)
+            display_item = document_model.get_display_item_for_data_item(data_item)
+            display_data_channel = display_item.display_data_channels[0]
+            display_data_channel.adjustments = [{"type": "equalized", "uuid": str(uuid.uuid4())}]
+            adjusted_data = display_data_channel.get_calculated_display_values(True).adjusted_data_and_metadata.data
+            self.assertEqual(data.shape, adjusted_data.shape)
+            self.assertEqual(numpy.float32, adjusted_data.dtype)
+            self.assertAlmostEqual(0.5, float(numpy.median(adjusted_data)), delta=0.05)
+            self.assertAlmostEqual(0.25, float(numpy.percentile(adjusted_data, 25)), delta=0.05)
+
     def test_display_produces_valid_preview_when_viewing_3d_data_set(self):
         with TestContext.create_memory_context() as test_context:
             document_model = test_context.create_document_model()
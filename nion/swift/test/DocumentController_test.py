@@ -2,6 +2,10 @@
 import contextlib
 import gc
 import logging
+import pathlib
+import tempfile
+import threading
+import time
 import unittest
 import weakref
 
@@ -12,12 +16,14 @@ import numpy
 from nion.swift import Application
 from nion.swift import DocumentController
 from nion.swift import DisplayPanel
+from nion.swift import ExportDialog
 from nion.swift import Facade
 from nion.swift.model import DataGroup
 from nion.swift.model import DataItem
 from nion.swift.model import DisplayItem
 from nion.swift.model import DocumentModel
 from nion.swift.model import Graphics
+from nion.swift.model import ImportExportManager
 from nion.swift.model import Symbolic
 from nion.swift.test import TestContext
 from nion.ui import TestUI
@@ -221,6 +227,134 @@ class TestDocumentControllerClass(unittest.TestCase):
             self.assertEqual(document_model.data_items.index(new_data_items[0]), 3)
             self.assertEqual(data_group.display_items.index(document_model.get_display_item_for_data_item(new_data_items[0])), 2)
 
+    def test_receive_files_threaded_inserts_batches_in_order_at_index(self):
+        with TestContext.create_memory_context() as test_context:
+            document_controller = test_context.create_document_controller()
+            document_model = document_controller.document_model
+            for i in range(2):
+                document_model.append_data_item(DataItem.DataItem(numpy.zeros((8, 8), numpy.uint32)))
+            display_panel = document_controller.selected_display_panel
+            received_data_items = list()
+            shown_display_items = list()
+            done_event = threading.Event()
+
+            def completion_fn(data_items):
+                received_data_items.extend(data_items)
+                done_event.set()
+
+            set_display_panel_display_item = display_panel.set_display_panel_display_item
+
+            def record_display_panel_display_item(display_item, *args, **kwargs):
+                shown_display_items.append(display_item)
+                set_display_panel_display_item(display_item, *args, **kwargs)
+
+            display_panel.set_display_panel_display_item = record_display_panel_display_item
+            old_batch_size = DocumentController.IMPORT_BATCH_SIZE
+            DocumentController.IMPORT_BATCH_SIZE = 2
+            try:
+                document_controller.receive_files([":/app/scroll_gem.png"] * 5, index=1, threaded=True, completion_fn=completion_fn, display_panel=display_panel)
+                start_time = time.time()
+                while not done_event.is_set() and time.time() - start_time < 10.0:
+                    document_controller.periodic()
+                    time.sleep(0.01)
+            finally:
+                DocumentController.IMPORT_BATCH_SIZE = old_batch_size
+            self.assertTrue(done_event.is_set())
+            self.assertEqual(7, len(document_model.data_items))
+            self.assertEqual(received_data_items, list(document_model.data_items[1:6]))
+            # the display panel is set once, to the last item, after all batches are inserted
+            self.assertEqual([document_model.get_display_item_for_data_item(received_data_items[-1])], shown_display_items)
+            # the batches are merged into a single undoable insert
+            document_controller.handle_undo()
+            self.assertEqual(2, len(document_model.data_items))
+            self.assertFalse(document_controller._undo_stack.can_undo)
+            document_controller.handle_redo()
+            self.assertEqual(7, len(document_model.data_items))
+
+    def test_receive_files_threaded_into_data_group_merges_batches_into_one_undo(self):
+        with TestContext.create_memory_context() as test_context:
+            document_controller = test_context.create_document_controller()
+            document_model = document_controller.document_model
+            data_group = DataGroup.DataGroup()
+            document_model.append_data_group(data_group)
+            done_event = threading.Event()
+            old_batch_size = DocumentController.IMPORT_BATCH_SIZE
+            DocumentController.IMPORT_BATCH_SIZE = 2
+            try:
+                document_controller.receive_files([":/app/scroll_gem.png"] * 5, data_group=data_group, index=0, threaded=True, completion_fn=lambda data_items: done_event.set())
+                start_time = time.time()
+                while not done_event.is_set() and time.time() - start_time < 10.0:
+                    document_controller.periodic()
+                    time.sleep(0.01)
+            finally:
+                DocumentController.IMPORT_BATCH_SIZE = old_batch_size
+            self.assertTrue(done_event.is_set())
+            self.assertEqual(5, len(data_group.display_items))
+            document_controller.handle_undo()
+            self.assertEqual(0, len(data_group.display_items))
+            self.assertEqual(0, len(document_model.data_items))
+            self.assertFalse(document_controller._undo_stack.can_undo)
+            document_controller.handle_redo()
+            self.assertEqual(5, len(data_group.display_items))
+            self.assertEqual(5, len(document_model.data_items))
+
+    def test_export_display_items_writes_files_and_skips_them_when_cancelled(self):
+        with TestContext.create_memory_context() as test_context, tempfile.TemporaryDirectory() as temp_dir:
+            document_controller = test_context.create_document_controller()
+            document_model = document_controller.document_model
+            display_item_paths = list()
+            for i in range(3):
+                data_item = DataItem.DataItem(numpy.full((8, 8), i, numpy.float32))
+                document_model.append_data_item(data_item)
+                display_item_paths.append((document_model.get_display_item_for_data_item(data_item), pathlib.Path(temp_dir) / f"{i}.npy"))
+            writer = ImportExportManager.ImportExportManager().get_writer_by_id("numpy-io-handler")
+            ExportDialog.export_display_items(document_controller, writer, display_item_paths, threaded=False)
+            for i, (display_item, path) in enumerate(display_item_paths):
+                self.assertTrue(numpy.array_equal(numpy.full((8, 8), i, numpy.float32), numpy.load(str(path))))
+                path.unlink()
+            # cancel the export as soon as its task is created
+            with contextlib.closing(document_controller.task_created_event.listen(lambda task: task.request_cancel())):
+                ExportDialog.export_display_items(document_controller, writer, display_item_paths, threaded=False)
+            self.assertFalse(any(path.exists() for display_item, path in display_item_paths))
+
+    def test_closing_document_controller_cancels_and_waits_for_threaded_export(self):
+        class SlowWriter(ImportExportManager.ImportExportHandler):
+            def __init__(self):
+                super().__init__("slow-io-handler", "Slow", ["slow"])
+                self.started_event = threading.Event()
+                self.written_paths = list()
+
+            def can_write(self, data_metadata, extension):
+                return True
+
+            def write_display_item(self, display_item, path, extension):
+                self.started_event.set()
+                time.sleep(0.05)
+                self.written_paths.append(path)
+
+        with TestContext.create_memory_context() as test_context:
+            document_controller = test_context.create_document_controller(auto_close=False)
+            document_model = document_controller.document_model
+            display_item_paths = list()
+            for i in range(8):
+                data_item = DataItem.DataItem(numpy.zeros((8, 8), numpy.float32))
+                document_model.append_data_item(data_item)
+                display_item_paths.append((document_model.get_display_item_for_data_item(data_item), pathlib.Path(f"{i}.slow")))
+            writer = SlowWriter()
+            tasks = list()
+            old_export_worker_count = ExportDialog.EXPORT_WORKER_COUNT
+            ExportDialog.EXPORT_WORKER_COUNT = 1
+            try:
+                with contextlib.closing(document_controller.task_created_event.listen(tasks.append)):
+                    ExportDialog.export_display_items(document_controller, writer, display_item_paths)
+                self.assertTrue(writer.started_event.wait(10.0))
+                document_controller.close()
+            finally:
+                ExportDialog.EXPORT_WORKER_COUNT = old_export_worker_count
+            self.assertTrue(tasks[0].is_cancel_requested)
+            self.assertFalse(tasks[0].in_progress)
+            self.assertLess(len(writer.written_paths), len(display_item_paths))
+
     def test_remove_graphic_removes_it_from_data_item(self):
         with TestContext.create_memory_context() as test_context:
             document_controller = test_context.create_document_controller()
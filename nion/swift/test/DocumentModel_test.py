@@ -2382,6 +2382,29 @@ class TestDocumentModelClass(unittest.TestCase):
             self.assertEqual(document_model._get_pending_data_item_updates_count(), 0)
             document_model.perform_data_item_updates()
 
+    def test_pending_data_item_updates_are_applied_in_order_within_time_budget(self):
+        with TestContext.create_memory_context() as test_context:
+            document_model = test_context.create_document_model()
+            data_items = [DataItem.DataItem(numpy.zeros((2, 2))) for i in range(3)]
+            for data_item in data_items:
+                document_model.append_data_item(data_item)
+            for data_item in data_items:
+                document_model._queue_data_item_update(data_item, DataAndMetadata.new_data_and_metadata(numpy.zeros((3, 3))))
+            # queueing again replaces the pending data without adding another pending update
+            document_model._queue_data_item_update(data_items[0], DataAndMetadata.new_data_and_metadata(numpy.zeros((4, 4))))
+            self.assertEqual(3, document_model._get_pending_data_item_updates_count())
+            # a zero budget applies exactly one update per call, oldest first
+            self.assertTrue(document_model.perform_data_item_updates(0.0))
+            self.assertEqual((4, 4), data_items[0].data_shape)
+            self.assertEqual((2, 2), data_items[1].data_shape)
+            self.assertEqual(2, document_model._get_pending_data_item_updates_count())
+            self.assertTrue(document_model.perform_data_item_updates(0.0))
+            self.assertEqual((3, 3), data_items[1].data_shape)
+            self.assertEqual((2, 2), data_items[2].data_shape)
+            self.assertFalse(document_model.perform_data_item_updates())
+            self.assertEqual((3, 3), data_items[2].data_shape)
+            self.assertEqual(0, document_model._get_pending_data_item_updates_count())
+
     def test_mapped_and_unmapped_processing_complete_without_error(self):
         with create_memory_profile_context() as profile_context:
             document_model = profile_context.create_document_model(auto_close=False)
@@ -1,14 +1,19 @@
 # standard libraries
 import contextlib
 import datetime
+import gc
+import io
 import json
 import logging
 import os
 import pathlib
+import tempfile
 import unittest
 import uuid
+import zipfile
 
 # third party libraries
+import h5py
 import numpy
 
 # local libraries
@@ -94,6 +99,126 @@ class TestImportExportManagerClass(unittest.TestCase):
             finally:
                 os.remove(file_path)
 
+    def test_ndata_export_streams_valid_zip_without_temporary_files(self):
+        with TestContext.create_memory_context() as test_context, tempfile.TemporaryDirectory() as temp_dir:
+            document_model = test_context.create_document_model()
+            handler = ImportExportManager.NDataImportExportHandler("ndata1-io-handler", "ndata", ["ndata"])
+            data = numpy.asfortranarray(numpy.arange(48, dtype=numpy.float32).reshape((6, 8)))
+            data_item = DataItem.DataItem(data)
+            data_item.title = "exported"
+            document_model.append_data_item(data_item)
+            display_item = document_model.get_display_item_for_data_item(data_item)
+            old_threshold = ImportExportManager.NDATA_ZIP64_THRESHOLD
+            try:
+                for threshold in (old_threshold, 0):
+                    ImportExportManager.NDATA_ZIP64_THRESHOLD = threshold
+                    file_path = pathlib.Path(temp_dir) / "file.ndata"
+                    handler.write_display_item(display_item, file_path, "ndata")
+                    self.assertEqual(["file.ndata"], os.listdir(temp_dir))
+                    with zipfile.ZipFile(file_path) as zip_file:
+                        self.assertIsNone(zip_file.testzip())
+                    data_elements = handler.read_data_elements("ndata", file_path)
+                    self.assertTrue(numpy.array_equal(data, data_elements[0]["data"]))
+                    self.assertEqual("exported", data_elements[0]["title"])
+                    file_path.unlink()
+            finally:
+                ImportExportManager.NDATA_ZIP64_THRESHOLD = old_threshold
+
+    def test_hdf5_export_then_import_keeps_large_data_in_dataset(self):
+        with TestContext.create_memory_context() as test_context, tempfile.TemporaryDirectory() as temp_dir:
+            document_model = test_context.create_document_model()
+            data = numpy.random.rand(4, 5, 6, 7).astype(numpy.float32)
+            data_item = DataItem.DataItem(data, large_format=True)
+            data_item.title = "exported"
+            data_item.set_dimensional_calibration(3, Calibration.Calibration(1.0, 2.0, "nm"))
+            document_model.append_data_item(data_item)
+            display_item = document_model.get_display_item_for_data_item(data_item)
+            for io_handler_id in ("hdf5-io-handler", "hdf5-gzip-io-handler"):
+                handler = ImportExportManager.ImportExportManager().get_writer_by_id(io_handler_id)
+                file_path = pathlib.Path(temp_dir) / f"{io_handler_id}.h5"
+                handler.write_display_item(display_item, file_path, "h5")
+                with h5py.File(file_path, "r") as fp:
+                    self.assertEqual(handler.compression, fp["data"].compression)
+                data_items = ImportExportManager.ImportExportManager().read_data_items(file_path)
+                self.assertEqual(1, len(data_items))
+                self.assertIsInstance(data_items[0].data, h5py.Dataset)
+                self.assertTrue(numpy.array_equal(data, data_items[0].data[()]))
+                self.assertEqual("exported", data_items[0].title)
+                self.assertEqual(Calibration.Calibration(1.0, 2.0, "nm"), data_items[0].dimensional_calibrations[3])
+                self.assertNotEqual(data_item.uuid, data_items[0].uuid)
+                # the file stays open while the dataset backs the data item
+                with self.assertRaises(OSError):
+                    h5py.File(file_path, "w")
+                document_model.append_data_item(data_items[0])
+                self.assertTrue(numpy.array_equal(data, data_items[0].data))
+                # storing the data item releases the dataset and closes the file
+                gc.collect()
+                h5py.File(file_path, "w").close()
+
+    def test_hdf5_import_reads_each_dataset_with_its_attributes(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            file_path = pathlib.Path(temp_dir) / "file.h5"
+            with h5py.File(file_path, "w") as fp:
+                dataset = fp.create_dataset("group/image", data=numpy.ones((3, 4)))
+                dataset.attrs["exposure"] = 0.5
+                dataset.attrs["detector"] = b"camera"
+                fp.create_dataset("spectrum", data=numpy.zeros(8))
+            data_items = ImportExportManager.ImportExportManager().read_data_items(file_path)
+            try:
+                # all the data is read into memory, so the file is closed
+                with h5py.File(file_path, "a"):
+                    pass
+                self.assertEqual(["file/group/image", "file/spectrum"], sorted(data_item.title for data_item in data_items))
+                data_item = [data_item for data_item in data_items if data_item.title == "file/group/image"][0]
+                self.assertEqual({"exposure": 0.5, "detector": "camera"}, data_item.metadata["hdf5"])
+                self.assertTrue(numpy.array_equal(numpy.ones((3, 4)), data_item.data))
+            finally:
+                for data_item in data_items:
+                    data_item.close()
+
+    def test_tiff_export_then_import_sequence_page_by_page(self):
+        with TestContext.create_memory_context() as test_context, tempfile.TemporaryDirectory() as temp_dir:
+            document_model = test_context.create_document_model()
+            data = numpy.random.randint(0, 60000, (5, 6, 7)).astype(numpy.uint16)
+            xdata = DataAndMetadata.new_data_and_metadata(data, data_descriptor=DataAndMetadata.DataDescriptor(True, 0, 2))
+            data_item = DataItem.new_data_item(xdata)
+            document_model.append_data_item(data_item)
+            display_item = document_model.get_display_item_for_data_item(data_item)
+            handler = ImportExportManager.ImportExportManager().get_writer_by_id("tiff-io-handler")
+            self.assertTrue(handler.can_write(data_item.data_metadata, "tif"))
+            file_path = pathlib.Path(temp_dir) / "file.tif"
+            handler.write_display_item(display_item, file_path, "tif")
+            data_items = ImportExportManager.ImportExportManager().read_data_items(file_path)
+            try:
+                self.assertEqual(1, len(data_items))
+                self.assertTrue(data_items[0].is_sequence)
+                self.assertEqual(2, data_items[0].datum_dimension_count)
+                self.assertEqual(numpy.uint16, data_items[0].data.dtype)
+                self.assertTrue(numpy.array_equal(data, data_items[0].data))
+            finally:
+                for data_item in data_items:
+                    data_item.close()
+
+    def test_tiff_import_of_sequence_returns_pages_as_data_chunks(self):
+        with TestContext.create_memory_context() as test_context, tempfile.TemporaryDirectory() as temp_dir:
+            document_model = test_context.create_document_model()
+            data = numpy.random.randint(0, 60000, (5, 6, 7)).astype(numpy.uint16)
+            xdata = DataAndMetadata.new_data_and_metadata(data, data_descriptor=DataAndMetadata.DataDescriptor(True, 0, 2))
+            data_item = DataItem.new_data_item(xdata)
+            document_model.append_data_item(data_item)
+            display_item = document_model.get_display_item_for_data_item(data_item)
+            handler = ImportExportManager.ImportExportManager().get_writer_by_id("tiff-io-handler")
+            file_path = pathlib.Path(temp_dir) / "file.tif"
+            handler.write_display_item(display_item, file_path, "tif")
+            data_elements = handler.read_data_elements("tif", file_path)
+            self.assertEqual(1, len(data_elements))
+            self.assertNotIsInstance(data_elements[0]["data"], numpy.ndarray)
+            self.assertEqual(data.shape, data_elements[0]["data_shape"])
+            self.assertEqual(numpy.uint16, data_elements[0]["data_dtype"])
+            chunks = list(data_elements[0]["data"])
+            self.assertEqual(5, len(chunks))
+            self.assertTrue(numpy.array_equal(data, numpy.concatenate(chunks)))
+
     def test_npy_write_to_then_read_from_temp_file(self):
         with TestContext.create_memory_context() as test_context:
             document_model = test_context.create_document_model()
@@ -114,6 +239,42 @@ class TestImportExportManagerClass(unittest.TestCase):
                 os.remove(file_path_npy)
                 os.remove(file_path_json)
 
+    def test_ndata_and_npy_import_memory_maps_uncompressed_data(self):
+        current_working_directory = os.getcwd()
+        file_path = pathlib.Path(current_working_directory) / "__file.ndata"
+        file_path_npy = pathlib.Path(current_working_directory) / "__file.npy"
+        data = numpy.arange(64, dtype=numpy.float32).reshape((8, 8))
+        data_bytes = io.BytesIO()
+        numpy.save(data_bytes, data)
+        handler = ImportExportManager.NDataImportExportHandler("ndata1-io-handler", "ndata", ["ndata"])
+        npy_handler = ImportExportManager.NumPyImportExportHandler("numpy-io-handler", "npy", ["npy"])
+        try:
+            for compression in (zipfile.ZIP_STORED, zipfile.ZIP_DEFLATED):
+                with zipfile.ZipFile(file_path, "w", compression) as zip_file:
+                    zip_file.writestr("metadata.json", json.dumps({"version": 1}))
+                    zip_file.writestr("data.npy", data_bytes.getvalue())
+                data_elements = handler.read_data_elements("ndata", file_path)
+                self.assertEqual(1, len(data_elements))
+                self.assertTrue(numpy.array_equal(data, data_elements[0]["data"]))
+                self.assertEqual(compression == zipfile.ZIP_STORED, isinstance(data_elements[0]["data"], numpy.memmap))
+                # modifying the imported data must not modify the file
+                data_elements[0]["data"][0, 0] = -1
+                reread_data_elements = handler.read_data_elements("ndata", file_path)
+                self.assertTrue(numpy.array_equal(data, reread_data_elements[0]["data"]))
+                # release the memory maps before the file is rewritten or removed; open memory maps prevent both on
+                # some platforms (Windows).
+                del data_elements, reread_data_elements
+            numpy.save(file_path_npy, data)
+            data_elements = npy_handler.read_data_elements("npy", file_path_npy)
+            self.assertIsInstance(data_elements[0]["data"], numpy.memmap)
+            self.assertTrue(numpy.array_equal(data, data_elements[0]["data"]))
+            del data_elements
+        finally:
+            if file_path.exists():
+                file_path.unlink()
+            if file_path_npy.exists():
+                file_path_npy.unlink()
+
     def test_get_writers_for_empty_data_item_returns_valid_list(self):
         data_item = DataItem.DataItem()
         with contextlib.closing(data_item):
@@ -177,6 +338,59 @@ class TestImportExportManagerClass(unittest.TestCase):
             self.assertEqual(data_item.xdata.collection_dimension_count, 0)
             self.assertEqual(data_item.xdata.datum_dimension_count, 2)
 
+    def test_creating_data_item_from_data_element_with_data_chunks_writes_each_chunk(self):
+        data = numpy.random.rand(10, 4, 5, 6).astype(numpy.float32)
+        chunks = (data[i:i + 3] for i in range(0, 10, 3))
+        data_element = {"data": chunks, "data_shape": data.shape, "data_dtype": "float32", "title": "chunked"}
+        data_item = ImportExportManager.create_data_item_from_data_element(data_element)
+        with contextlib.closing(data_item):
+            self.assertTrue(data_item.large_format)
+            self.assertEqual("chunked", data_item.title)
+            self.assertFalse(data_item.data_and_metadata.data_if_loaded)
+            self.assertEqual(data.shape, data_item.data_shape)
+            self.assertTrue(numpy.array_equal(data, data_item.data))
+        data_item = ImportExportManager.create_data_item_from_data_element({"data": iter([data[0:3]]), "data_shape": data.shape, "data_dtype": "float32"})
+        with contextlib.closing(data_item):
+            with self.assertRaises(ValueError):
+                data_item.data
+
+    def test_converting_data_element_with_data_chunks_assembles_them_when_used(self):
+        data = numpy.random.rand(10, 4, 5, 6).astype(numpy.float32)
+        chunks = (data[i:i + 3] for i in range(0, 10, 3))
+        xdata = ImportExportManager.convert_data_element_to_data_and_metadata({"data": chunks, "data_shape": data.shape, "data_dtype": "float32"})
+        self.assertFalse(xdata.data_if_loaded)
+        self.assertEqual(data.shape, xdata.data_shape)
+        self.assertEqual(2, xdata.collection_dimension_count)
+        self.assertTrue(numpy.array_equal(data, xdata.data))
+
+    def test_updating_stored_data_item_from_array_like_data_element_copies_it_in_chunks(self):
+        class ArrayLike:
+            def __init__(self, array):
+                self.array = array
+                self.shape = array.shape
+                self.dtype = array.dtype
+                self.slices = list()
+
+            def __getitem__(self, key):
+                self.slices.append(key)
+                return self.array[key]
+
+        with TestContext.create_memory_context() as test_context:
+            document_model = test_context.create_document_model()
+            data_item = DataItem.DataItem(numpy.zeros((2, 2)))
+            document_model.append_data_item(data_item)
+            data = numpy.random.rand(10, 4, 5, 6).astype(numpy.float32)
+            array_like = ArrayLike(data)
+            old_chunk_size = ImportExportManager.DATA_ELEMENT_CHUNK_SIZE
+            ImportExportManager.DATA_ELEMENT_CHUNK_SIZE = data[0:4].nbytes
+            try:
+                ImportExportManager.update_data_item_from_data_element(data_item, {"data": array_like, "spatial_calibrations": [{"scale": 2.0}] * 4})
+            finally:
+                ImportExportManager.DATA_ELEMENT_CHUNK_SIZE = old_chunk_size
+            self.assertEqual([slice(0, 4), slice(4, 8), slice(8, 12)], array_like.slices)
+            self.assertTrue(numpy.array_equal(data, data_item.data))
+            self.assertEqual(2.0, data_item.dimensional_calibrations[0].scale)
+
     def test_data_element_to_extended_data_conversion(self):
         data = numpy.ones((8, 6), int)
         intensity_calibration = Calibration.Calibration(offset=1, scale=1.1, units="one")
@@ -303,6 +517,65 @@ class TestImportExportManagerClass(unittest.TestCase):
             finally:
                 os.remove(file_path)
 
+    def test_csv1_export_and_csv_import_across_multiple_chunks(self):
+        with TestContext.create_memory_context() as test_context:
+            document_model = test_context.create_document_model()
+            data = numpy.random.randn(100)
+            data_item = DataItem.DataItem(data)
+            data_item.dimensional_calibrations = [Calibration.Calibration(offset=1, scale=0.5, units="eV")]
+            document_model.append_data_item(data_item)
+            display_item = document_model.get_display_item_for_data_item(data_item)
+            file_path = pathlib.Path(os.getcwd()) / "__file.csv"
+            old_chunk_rows = ImportExportManager.CSV_CHUNK_ROWS
+            ImportExportManager.CSV_CHUNK_ROWS = 16
+            try:
+                handler = ImportExportManager.CSV1ImportExportHandler("csv1-io-handler", "CSV 1D", ["csv"])
+                handler.write_display_item(display_item, file_path, "csv")
+                lines = file_path.read_text().splitlines()
+                self.assertEqual(101, len(lines))
+                self.assertEqual(f"{1 + 0.5 * 20}, {data[20]}", lines[21])
+                handler = ImportExportManager.CSVImportExportHandler("csv-io-handler", "CSV Raw", ["csv"])
+                data_elements = handler.read_data_elements("csv", file_path)
+                self.assertEqual(1, len(data_elements))
+                self.assertTrue(numpy.array_equal(data, data_elements[0]["data"][:, 1]))
+                self.assertTrue(numpy.allclose(numpy.linspace(1, 50.5, 100), data_elements[0]["data"][:, 0]))
+            finally:
+                ImportExportManager.CSV_CHUNK_ROWS = old_chunk_rows
+                if file_path.exists():
+                    os.remove(file_path)
+
+    def test_csv_table_writes_ragged_columns_across_chunks(self):
+        old_chunk_rows = ImportExportManager.CSV_CHUNK_ROWS
+        ImportExportManager.CSV_CHUNK_ROWS = 4
+        try:
+            data_list = [numpy.arange(10) * 0.5, numpy.arange(6, dtype=numpy.uint32), numpy.arange(3) + 0.25]
+            f = io.StringIO()
+            ImportExportManager.write_csv_table(f, data_list)
+            expected = list()
+            for i in range(10):
+                row = [str(data[i].item()) if i < len(data) else "" for data in data_list]
+                expected.append(", ".join(row) + "\n")
+            self.assertEqual("".join(expected), f.getvalue())
+        finally:
+            ImportExportManager.CSV_CHUNK_ROWS = old_chunk_rows
+
+    def test_csv_import_skips_comments_and_blank_lines_across_chunks(self):
+        file_path = pathlib.Path(os.getcwd()) / "__file.csv"
+        old_chunk_rows = ImportExportManager.CSV_CHUNK_ROWS
+        ImportExportManager.CSV_CHUNK_ROWS = 4
+        try:
+            data = numpy.random.randn(10, 2)
+            lines = ["# x, y"] + [f"{a}, {b}" for a, b in data]
+            lines.insert(5, "")
+            file_path.write_text("\n".join(lines))
+            handler = ImportExportManager.CSVImportExportHandler("csv-io-handler", "CSV Raw", ["csv"])
+            data_elements = handler.read_data_elements("csv", file_path)
+            self.assertTrue(numpy.array_equal(data, data_elements[0]["data"]))
+        finally:
+            ImportExportManager.CSV_CHUNK_ROWS = old_chunk_rows
+            if file_path.exists():
+                os.remove(file_path)
+
     def test_data_item_to_data_element_produces_json_compatible_dict(self):
         data_item = DataItem.DataItem(numpy.zeros((16, 16)))
         with contextlib.closing(data_item):
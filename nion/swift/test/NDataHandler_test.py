@@ -8,7 +8,10 @@ import logging
 import os
 import shutil
 import unittest
+import unittest.mock
 import uuid
+import zipfile
+import zlib
 
 # third party libraries
 import numpy
@@ -114,6 +117,159 @@ class TestNDataHandlerClass(unittest.TestCase):
                 self.assertEqual(dd.dtype, d.dtype)
                 # now rewrite
                 h.write_properties(p, now)
+                # rewrite again with new properties; the data should not move
+                with open(os.path.join(data_dir, "file.ndata"), "rb") as fp:
+                    data_pos = NDataHandler.parse_zip(fp)[1][b"data.npy"][1]
+                for i in range(3):
+                    p["abc"] = i
+                    h.write_properties(p, now)
+                    self.assertEqual(h.read_properties(), p)
+                    self.assertTrue(numpy.array_equal(d, h.read_data()))
+                    with open(os.path.join(data_dir, "file.ndata"), "rb") as fp:
+                        self.assertEqual(data_pos, NDataHandler.parse_zip(fp)[1][b"data.npy"][1])
+                    with zipfile.ZipFile(os.path.join(data_dir, "file.ndata")) as z:
+                        self.assertIsNone(z.testzip())
+                        self.assertEqual({"data.npy", "metadata.json"}, set(z.namelist()))
+                # writing data puts the data first again
+                h.write_data(d, now)
+                with open(os.path.join(data_dir, "file.ndata"), "rb") as fp:
+                    self.assertEqual(0, NDataHandler.parse_zip(fp)[1][b"data.npy"][1])
+                self.assertEqual(h.read_properties(), p)
+        finally:
+            #logging.debug("rmtree %s", data_dir)
+            shutil.rmtree(data_dir)
+
+    def test_ndata_handler_writes_and_reads_compressed_data(self):
+        now = datetime.datetime.now()
+        current_working_directory = os.getcwd()
+        data_dir = os.path.join(current_working_directory, "__Test")
+        Cache.db_make_directory_if_needed(data_dir)
+        try:
+            file_path = os.path.join(data_dir, "abc.ndata")
+            h = NDataHandler.NDataHandler(file_path)
+            with contextlib.closing(h):
+                h.compression = NDataHandler.ZIP_DEFLATED
+                p = {u"abc": 1, u"uuid": str(uuid.uuid4())}
+                data = numpy.zeros((256, 256), dtype=numpy.uint32)
+                data[4, 8] = 7
+                h.write_properties(p, now)
+                h.write_data(data, now)
+                self.assertLess(os.path.getsize(file_path), data.nbytes // 10)
+                self.assertTrue(NDataHandler.NDataHandler.is_matching(file_path))
+                with zipfile.ZipFile(file_path) as z:
+                    self.assertEqual(zipfile.ZIP_DEFLATED, z.getinfo("data.npy").compress_type)
+                    self.assertIsNone(z.testzip())
+                self.assertTrue(numpy.array_equal(data, h.read_data()))
+                # rewriting the properties keeps the compressed data
+                p["abc"] = 2
+                h.write_properties(p, now)
+                self.assertEqual(h.read_properties(), p)
+                self.assertTrue(numpy.array_equal(data, h.read_data()))
+            # a handler without a compression setting keeps the compression of the existing data
+            h = NDataHandler.NDataHandler(file_path)
+            with contextlib.closing(h):
+                h.write_data(data, now)
+                with zipfile.ZipFile(file_path) as z:
+                    self.assertEqual(zipfile.ZIP_DEFLATED, z.getinfo("data.npy").compress_type)
+                self.assertTrue(numpy.array_equal(data, h.read_data()))
+        finally:
+            #logging.debug("rmtree %s", data_dir)
+            shutil.rmtree(data_dir)
+
+    def test_inflate_reader_inflates_no_more_than_requested_size(self):
+        raw = bytes(4 * 1024 * 1024)
+        compressor = zlib.compressobj(9, zlib.DEFLATED, -zlib.MAX_WBITS)
+        deflated = compressor.compress(raw) + compressor.flush()
+        fp = io.BytesIO(b"head" + deflated + b"tail")
+        reader = NDataHandler.InflateReader(fp, 4, len(deflated))
+        self.assertEqual(16, len(reader.read(16)))
+        self.assertEqual(1000, len(reader.read(1000)))
+        remainder = reader.read()
+        self.assertEqual(len(raw) - 1016, len(remainder))
+        self.assertEqual(b"", reader.read(16))
+
+    def test_ndata_handler_rejects_members_with_data_descriptors(self):
+        class UnseekableWriter(io.RawIOBase):
+            def __init__(self, fp):
+                self.fp = fp
+
+            def writable(self):
+                return True
+
+            def write(self, b):
+                return self.fp.write(b)
+
+        current_working_directory = os.getcwd()
+        data_dir = os.path.join(current_working_directory, "__Test")
+        Cache.db_make_directory_if_needed(data_dir)
+        try:
+            file_path = os.path.join(data_dir, "abc.ndata")
+            data_bytes = io.BytesIO()
+            numpy.save(data_bytes, numpy.zeros((8, 8)))
+            # zip files written to an unseekable file use data descriptors for the member crc32 and lengths
+            with open(file_path, "wb") as fp:
+                with zipfile.ZipFile(UnseekableWriter(fp), "w") as z:
+                    z.writestr("data.npy", data_bytes.getvalue())
+                    z.writestr("metadata.json", json.dumps({"uuid": str(uuid.uuid4())}))
+            with zipfile.ZipFile(file_path) as z:
+                self.assertTrue(z.getinfo("data.npy").flag_bits & 0x08)
+            with open(file_path, "rb") as fp:
+                with self.assertRaises(IOError):
+                    NDataHandler.parse_zip(fp)
+            self.assertFalse(NDataHandler.NDataHandler.is_matching(file_path))
+        finally:
+            shutil.rmtree(data_dir)
+
+    def test_ndata_handler_parses_zip_once_until_written(self):
+        now = datetime.datetime.now()
+        current_working_directory = os.getcwd()
+        data_dir = os.path.join(current_working_directory, "__Test")
+        Cache.db_make_directory_if_needed(data_dir)
+        try:
+            h = NDataHandler.NDataHandler(os.path.join(data_dir, "abc.ndata"))
+            with contextlib.closing(h):
+                p = {u"abc": 1, u"uuid": str(uuid.uuid4())}
+                h.write_properties(p, now)
+                h.write_data(numpy.zeros((4, 4), dtype=numpy.float64), now)
+                with unittest.mock.patch.object(NDataHandler, "parse_zip", wraps=NDataHandler.parse_zip) as parse_zip:
+                    for i in range(3):
+                        self.assertEqual(h.read_properties(), p)
+                        self.assertEqual(h.read_data().shape, (4, 4))
+                    self.assertEqual(1, parse_zip.call_count)
+                    # writing invalidates the cached headers
+                    h.write_data(numpy.zeros((8, 8), dtype=numpy.float32), now)
+                    self.assertEqual(h.read_properties(), p)
+                    self.assertEqual(h.read_data().shape, (8, 8))
+                    p["abc"] = 2
+                    h.write_properties(p, now)
+                    self.assertEqual(h.read_properties(), p)
+                    self.assertEqual(h.read_data().shape, (8, 8))
+        finally:
+            #logging.debug("rmtree %s", data_dir)
+            shutil.rmtree(data_dir)
+
+    def test_ndata_handler_reserves_data_without_writing_it(self):
+        now = datetime.datetime.now()
+        current_working_directory = os.getcwd()
+        data_dir = os.path.join(current_working_directory, "__Test")
+        Cache.db_make_directory_if_needed(data_dir)
+        try:
+            file_path = os.path.join(data_dir, "abc.ndata")
+            h = NDataHandler.NDataHandler(file_path)
+            with contextlib.closing(h):
+                p = {u"abc": 1, u"uuid": str(uuid.uuid4())}
+                h.write_properties(p, now)
+                h.reserve_data((64, 32, 32), numpy.float32, now)
+                self.assertEqual(h.read_properties(), p)
+                d = h.read_data()
+                self.assertEqual((64, 32, 32), d.shape)
+                self.assertEqual(numpy.float32, d.dtype)
+                self.assertFalse(numpy.any(d))
+                with zipfile.ZipFile(file_path) as z:
+                    self.assertIsNone(z.testzip())
+                h.write_properties(p, now)
+                self.assertEqual(h.read_properties(), p)
+                self.assertEqual((64, 32, 32), h.read_data().shape)
         finally:
             #logging.debug("rmtree %s", data_dir)
             shutil.rmtree(data_dir)
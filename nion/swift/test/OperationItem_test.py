@@ -14,6 +14,7 @@ from nion.data import DataAndMetadata
 from nion.swift import Facade
 from nion.swift.model import DataItem
 from nion.swift.model import Graphics
+from nion.swift.model import Processing
 from nion.swift.test import TestContext
 from nion.utils import Geometry
 
@@ -1089,6 +1090,79 @@ class TestProcessingClass(unittest.TestCase):
             document_model.get_processing_new("mapped_sum", display_item, display_item.data_item, crop_region)
             document_model.recompute_all()
 
+    def test_mapped_sum_and_average_with_mask_match_per_position_values(self):
+        with TestContext.create_memory_context() as test_context:
+            document_model = test_context.create_document_model()
+            data = numpy.random.randn(6, 5, 8, 8)
+            data_item = DataItem.DataItem(data)
+            document_model.append_data_item(data_item)
+            display_item = document_model.get_display_item_for_data_item(data_item)
+            mask_region = Graphics.RectangleGraphic()
+            mask_region.bounds = Geometry.FloatRect.from_tlhw(0.25, 0.25, 0.5, 0.5)
+            mask_region.role = "mask"
+            display_item.add_graphic(mask_region)
+            sum_data_item = document_model.get_processing_new("mapped_sum", display_item, display_item.data_item)
+            average_data_item = document_model.get_processing_new("mapped_average", display_item, display_item.data_item)
+            document_model.recompute_all()
+            mask = DataItem.create_mask_data(display_item.graphics, (8, 8), Geometry.FloatPoint())
+            self.assertFalse(numpy.all(mask))
+            self.assertEqual((6, 5), sum_data_item.data_shape)
+            self.assertTrue(numpy.allclose(numpy.sum(data * mask, axis=(2, 3)), sum_data_item.data))
+            self.assertTrue(numpy.allclose(numpy.average(data * mask, axis=(2, 3)), average_data_item.data))
+
+    def test_mapped_processing_split_into_blocks_matches_single_block(self):
+        with TestContext.create_memory_context() as test_context:
+            document_model = test_context.create_document_model()
+            data = numpy.random.randn(7, 3, 4, 6)
+            data_item = DataItem.DataItem(data)
+            document_model.append_data_item(data_item)
+            display_item = document_model.get_display_item_for_data_item(data_item)
+            sum_data_item = document_model.get_processing_new("mapped_sum", display_item, display_item.data_item)
+            hamming_data_item = document_model.get_processing_new("hamming_window", display_item, display_item.data_item)
+            document_model.computations[-1].variables[0].value = "mapped"
+            mapping_block_bytes = Processing.ProcessingComputation.mapping_block_bytes
+            max_mapping_workers = Processing.ProcessingComputation.max_mapping_workers
+            Processing.ProcessingComputation.mapping_block_bytes = 64
+            Processing.ProcessingComputation.max_mapping_workers = 3
+            try:
+                document_model.recompute_all()
+            finally:
+                Processing.ProcessingComputation.mapping_block_bytes = mapping_block_bytes
+                Processing.ProcessingComputation.max_mapping_workers = max_mapping_workers
+            self.assertTrue(numpy.allclose(numpy.sum(data, axis=(2, 3)), sum_data_item.data))
+            self.assertEqual(data.shape, hamming_data_item.data_shape)
+            self.assertEqual(2, hamming_data_item.xdata.collection_dimension_count)
+            self.assertEqual(2, hamming_data_item.xdata.datum_dimension_count)
+            for index in numpy.ndindex(data.shape[:2]):
+                expected = Processing.ProcessingHammingWindow().process(src=DataItem.DataSource(display_item.display_data_channel, None, data_item.xdata[index]))
+                self.assertTrue(numpy.allclose(expected.data, hamming_data_item.data[index]))
+
+    def test_mapped_sum_with_single_worker_sums_float_data_in_blocks_and_in_input_dtype(self):
+        with TestContext.create_memory_context() as test_context:
+            document_model = test_context.create_document_model()
+            data = numpy.random.randn(7, 3, 4, 6).astype(numpy.float32)
+            data_item = DataItem.DataItem(data)
+            document_model.append_data_item(data_item)
+            display_item = document_model.get_display_item_for_data_item(data_item)
+            mask_region = Graphics.RectangleGraphic()
+            mask_region.bounds = Geometry.FloatRect.from_tlhw(0.25, 0.25, 0.5, 0.5)
+            mask_region.role = "mask"
+            display_item.add_graphic(mask_region)
+            src = DataItem.DataSource(display_item.display_data_channel, None, data_item.xdata[0, 0])
+            masked_sum = Processing.get_masked_sum_function(src, 1.0)
+            block_shapes = list()
+
+            def map_fn(block):
+                block_shapes.append(block.shape)
+                return masked_sum(block)
+
+            sum_data = numpy.empty((7, 3), numpy.float32)
+            Processing.map_blocks(map_fn, data, sum_data, 1, 3 * 4 * 6 * 4 * 2)
+            self.assertEqual(numpy.float32, masked_sum(data[0:1]).dtype)
+            self.assertEqual([3, 2, 2], [block_shape[0] for block_shape in block_shapes])
+            mask = DataItem.create_mask_data(display_item.graphics, (4, 6), Geometry.FloatPoint())
+            self.assertTrue(numpy.allclose(numpy.sum(data * mask, axis=(2, 3)), sum_data, atol=1e-5))
+
     def test_line_profile_on_sequence_works(self):
         with TestContext.create_memory_context() as test_context:
             document_model = test_context.create_document_model()
@@ -11,7 +11,9 @@ import shutil
 import threading
 import typing
 import unittest
+import unittest.mock
 import uuid
+import zipfile
 
 # third party libraries
 import numpy
@@ -32,9 +34,11 @@ from nion.swift.model import DataItem
 from nion.swift.model import DocumentModel
 from nion.swift.model import FileStorageSystem
 from nion.swift.model import Graphics
+from nion.swift.model import ImportExportManager
 from nion.swift.model import Persistence
 from nion.swift.model import Profile
 from nion.swift.model import Symbolic
+from nion.swift.model import Utility
 from nion.swift.test import TestContext
 from nion.ui import TestUI
 from nion.utils import Geometry
@@ -381,6 +385,31 @@ class TestStorageClass(unittest.TestCase):
             with document_model.ref():
                     self.assertEqual(data_read_count_ref[0], 0)
 
+    def test_reload_data_item_defers_loading_metadata_until_used(self):
+        with create_memory_profile_context() as profile_context:
+            document_model = profile_context.create_document_model(auto_close=False)
+            with document_model.ref():
+                for i in range(2):
+                    data_item = DataItem.DataItem(numpy.zeros((8, 8), numpy.uint32))
+                    data_item.metadata = {"instrument": {"high_tension": 100000 * (i + 1)}}
+                    document_model.append_data_item(data_item)
+            # read it back
+            document_model = profile_context.create_document_model(auto_close=False)
+            with document_model.ref():
+                data_item0, data_item1 = document_model.data_items
+                self.assertFalse(data_item0._is_data_and_metadata_loaded)
+                self.assertEqual((8, 8), data_item0.data_shape)
+                # changing an unrelated property must not lose the metadata
+                data_item1.title = "Title"
+                self.assertEqual(100000, data_item0.get_metadata_value("stem.high_tension"))
+                self.assertTrue(data_item0._is_data_and_metadata_loaded)
+            # read it back again
+            document_model = profile_context.create_document_model(auto_close=False)
+            with document_model.ref():
+                data_item0, data_item1 = document_model.data_items
+                self.assertEqual("Title", data_item1.title)
+                self.assertEqual({"instrument": {"high_tension": 200000}}, data_item1.metadata)
+
     def test_reload_data_item_initializes_display_slice(self):
         with create_memory_profile_context() as profile_context:
             document_model = profile_context.create_document_model(auto_close=False)
@@ -438,6 +467,112 @@ class TestStorageClass(unittest.TestCase):
                 self.assertEqual(data_items_count, len(document_model.data_items))
                 self.assertEqual(data_items_type, type(document_model.data_items))
 
+    def test_save_load_document_to_binary_project_file(self):
+        with create_temp_profile_context() as profile_context:
+            FileStorageSystem.FileProjectStorageSystem.binary_project_format = True
+            try:
+                document_controller = profile_context.create_document_controller(auto_close=False)
+                with contextlib.closing(document_controller):
+                    self.save_document(document_controller)
+                    document_model = document_controller.document_model
+                    data_items_count = len(document_model.data_items)
+                    display_item_titles = [display_item.displayed_title for display_item in document_model.display_items]
+            finally:
+                FileStorageSystem.FileProjectStorageSystem.binary_project_format = False
+            project_path = profile_context.projects_dir / "Project.nsproj"
+            self.assertTrue(FileStorageSystem.is_binary_properties_file(project_path))
+            with project_path.open("rb") as fp:
+                reader = FileStorageSystem.BinaryPropertiesReader(fp.read())
+            self.assertEqual(len(display_item_titles), reader.get_item_count("display_items"))
+            self.assertEqual(FileStorageSystem.PROJECT_VERSION, reader.properties["version"])
+            # the migration reader reads binary files too
+            with contextlib.closing(FileStorageSystem.FileProjectStorageSystem(project_path)) as storage_system:
+                library_properties = storage_system._read_library_properties((project_path, profile_context.projects_dir / "Project Data"))
+            self.assertEqual(reader.read_properties(), library_properties)
+            # read it back; the project stays in the binary format
+            document_controller = profile_context.create_document_controller(auto_close=False)
+            document_model = document_controller.document_model
+            with contextlib.closing(document_controller):
+                self.assertEqual(data_items_count, len(document_model.data_items))
+                self.assertEqual(display_item_titles, [display_item.displayed_title for display_item in document_model.display_items])
+                document_model.display_items[0].title = "Binary"
+            self.assertTrue(FileStorageSystem.is_binary_properties_file(project_path))
+            document_controller = profile_context.create_document_controller(auto_close=False)
+            with contextlib.closing(document_controller):
+                self.assertEqual("Binary", document_controller.document_model.display_items[0].title)
+
+    def test_binary_project_file_defers_items_and_encodes_only_modified_items(self):
+        with create_temp_profile_context() as profile_context:
+            FileStorageSystem.FileProjectStorageSystem.binary_project_format = True
+            try:
+                document_controller = profile_context.create_document_controller(auto_close=False)
+                with contextlib.closing(document_controller):
+                    self.save_document(document_controller)
+                    display_items_count = len(document_controller.document_model.display_items)
+                    data_groups_count = len(document_controller.document_model.data_groups)
+            finally:
+                FileStorageSystem.FileProjectStorageSystem.binary_project_format = False
+            project_path = profile_context.projects_dir / "Project.nsproj"
+            # loading the project properties decodes only the top level properties
+            with contextlib.closing(FileStorageSystem.FileProjectStorageSystem(project_path)) as storage_system:
+                storage_system.load_properties()
+                self.assertNotIn("display_items", storage_system.get_storage_properties())
+                self.assertEqual(FileStorageSystem.PROJECT_VERSION, storage_system.get_storage_properties()["version"])
+                self.assertEqual(display_items_count, len(storage_system.read_properties()["display_items"]))
+            encoded_item_uuids = list()
+            encode_properties_section = FileStorageSystem.encode_properties_section
+
+            def record_encode_properties_section(item_properties):
+                encoded_item_uuids.append(item_properties.get("uuid"))
+                return encode_properties_section(item_properties)
+
+            document_controller = profile_context.create_document_controller(auto_close=False)
+            with contextlib.closing(document_controller):
+                document_model = document_controller.document_model
+                display_item = document_model.display_items[0]
+                FileStorageSystem.encode_properties_section = record_encode_properties_section
+                try:
+                    display_item.graphics[0].label = "Label"
+                    display_item.title = "Title"
+                finally:
+                    FileStorageSystem.encode_properties_section = encode_properties_section
+                self.assertEqual({str(display_item.uuid)}, set(encoded_item_uuids))
+                # the file matches the project properties, including the items written from their previous sections
+                project_properties = Utility.clean_dict(document_model._project.persistent_dict)
+                with project_path.open("rb") as fp:
+                    written_properties = FileStorageSystem.BinaryPropertiesReader(fp.read()).read_properties()
+                for key in ("display_items", "data_groups", "computations", "connections", "data_structures"):
+                    self.assertEqual(project_properties.get(key, list()), written_properties.get(key, list()))
+            document_controller = profile_context.create_document_controller(auto_close=False)
+            with contextlib.closing(document_controller):
+                document_model = document_controller.document_model
+                self.assertEqual("Title", document_model.display_items[0].title)
+                self.assertEqual("Label", document_model.display_items[0].graphics[0].label)
+                self.assertEqual(display_items_count, len(document_model.display_items))
+                self.assertEqual(data_groups_count, len(document_model.data_groups))
+
+    def test_copy_file_durably_copies_contents_and_modification_time(self):
+        with create_temp_profile_context() as profile_context:
+            source_path = profile_context.projects_dir / "source.bin"
+            target_path = profile_context.projects_dir / "target.bin"
+            contents = numpy.random.bytes(1024 * 64)
+            source_path.write_bytes(contents)
+            os.utime(source_path, (1000000000, 1000000000))
+            FileStorageSystem.copy_file_durably(source_path, target_path)
+            self.assertEqual(contents, target_path.read_bytes())
+            self.assertEqual(os.stat(source_path).st_mtime, os.stat(target_path).st_mtime)
+
+    def test_copy_file_durably_removes_plain_copy_with_mismatched_checksum(self):
+        with create_temp_profile_context() as profile_context:
+            source_path = profile_context.projects_dir / "source.bin"
+            target_path = profile_context.projects_dir / "target.bin"
+            source_path.write_bytes(numpy.random.bytes(1024 * 64))
+            with unittest.mock.patch.object(FileStorageSystem, "_reflink_file", return_value=False), \
+                    unittest.mock.patch.object(FileStorageSystem, "_file_checksum", return_value=""):
+                with self.assertRaises(IOError):
+                    FileStorageSystem.copy_file_durably(source_path, target_path)
+            self.assertFalse(target_path.exists())
+
     def test_db_storage(self):
         with create_memory_profile_context() as profile_context:
             document_controller = profile_context.create_document_controller(auto_close=False)
@@ -909,6 +1044,65 @@ class TestStorageClass(unittest.TestCase):
                     dr.data_updated()
                 self.assertTrue(numpy.array_equal(numpy.ones((8, 8)), data_item.data))
 
+    def test_data_item_created_from_data_chunks_writes_them_into_storage_when_inserted(self):
+        data = numpy.random.rand(10, 4, 5, 6).astype(numpy.float32)
+        chunks_read = list()
+
+        def chunks():
+            for i in range(0, 10, 3):
+                chunks_read.append(i)
+                yield data[i:i + 3]
+
+        with create_temp_profile_context() as profile_context:
+            document_model = profile_context.create_document_model(auto_close=False)
+            with document_model.ref():
+                data_item = ImportExportManager.create_data_item_from_data_element({"data": chunks(), "data_shape": data.shape, "data_dtype": "float32"})
+                self.assertEqual(list(), chunks_read)
+                self.assertFalse(data_item.data_and_metadata.data_if_loaded)
+                document_model.append_data_item(data_item)
+                self.assertEqual([0, 3, 6, 9], chunks_read)
+                self.assertFalse(data_item.data_and_metadata.data_if_loaded)
+                self.assertTrue(numpy.array_equal(data, data_item.data))
+            document_model = profile_context.create_document_model(auto_close=False)
+            with document_model.ref():
+                self.assertTrue(numpy.array_equal(data, document_model.data_items[0].data))
+
+    def test_data_item_requesting_compression_stores_compressed_data(self):
+        data = numpy.zeros((64, 64), numpy.float32)
+        with create_temp_profile_context() as profile_context:
+            document_model = profile_context.create_document_model(auto_close=False)
+            with document_model.ref():
+                document_model.append_data_item(DataItem.DataItem(data, compress_data=True))
+                document_model.append_data_item(DataItem.DataItem(data))
+                file_paths = [data_item._test_get_file_path() for data_item in document_model.data_items]
+            compress_types = list()
+            for file_path in file_paths:
+                with zipfile.ZipFile(file_path) as z:
+                    compress_types.append(z.getinfo("data.npy").compress_type)
+            self.assertEqual([zipfile.ZIP_DEFLATED, zipfile.ZIP_STORED], compress_types)
+            document_model = profile_context.create_document_model(auto_close=False)
+            with document_model.ref():
+                for data_item in document_model.data_items:
+                    self.assertTrue(numpy.array_equal(data, data_item.data))
+                    data_item.set_data(data + 1)
+            with zipfile.ZipFile(file_paths[0]) as z:
+                self.assertEqual(zipfile.ZIP_DEFLATED, z.getinfo("data.npy").compress_type)
+
+    def test_reserving_data_leaves_it_unloaded_unless_in_use(self):
+        with create_temp_profile_context() as profile_context:
+            document_model = profile_context.create_document_model(auto_close=False)
+            with document_model.ref():
+                data_item = DataItem.DataItem(numpy.ones((4, 4), numpy.float32))
+                document_model.append_data_item(data_item)
+                data_item.reserve_data(data_shape=(64, 64), data_dtype=numpy.dtype(numpy.float32), data_descriptor=DataAndMetadata.DataDescriptor(False, 0, 2))
+                self.assertFalse(data_item.data_and_metadata.data_if_loaded)
+                self.assertEqual((64, 64), data_item.data_shape)
+                self.assertTrue(numpy.array_equal(numpy.zeros((64, 64)), data_item.data))
+                with data_item.data_ref():
+                    data_item.reserve_data(data_shape=(8, 8), data_dtype=numpy.dtype(numpy.float32), data_descriptor=DataAndMetadata.DataDescriptor(False, 0, 2))
+                    self.assertTrue(data_item.data_and_metadata.data_if_loaded)
+                    self.assertTrue(numpy.array_equal(numpy.zeros((8, 8)), data_item.data))
+
     def test_data_large_format_does_not_rewrite_partial_updates(self):
         with create_temp_profile_context() as profile_context:
             zeros = DataAndMetadata.new_data_and_metadata(numpy.zeros((8, 8), numpy.uint32))
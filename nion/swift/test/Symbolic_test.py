@@ -4,6 +4,7 @@ import copy
 import logging
 import random
 import threading
+import time
 import unittest
 import uuid
 
@@ -1106,6 +1107,35 @@ class TestSymbolicClass(unittest.TestCase):
             document_model.recompute_all()
             self.assertEqual(computation._evaluation_count_for_test - evaluation_count, 1)
 
+    def test_computation_is_throttled_by_measured_duration_and_coalesces_requests(self):
+        with TestContext.create_memory_context() as test_context:
+            document_model = test_context.create_document_model()
+            src_data = ((numpy.abs(numpy.random.randn(12, 8)) + 1) * 10).astype(numpy.uint32)
+            data_item = DataItem.DataItem(src_data)
+            document_model.append_data_item(data_item)
+            computation = document_model.create_computation(Symbolic.xdata_expression("xd.gaussian_blur(a.xdata, s)"))
+            s = computation.create_variable("s", value_type="integral", value=5)
+            computation.create_input_item("a", Symbolic.make_item(data_item))
+            computed_data_item = DataItem.DataItem(src_data.copy())
+            document_model.append_data_item(computed_data_item)
+            document_model.set_data_item_computation(computed_data_item, computation)
+            document_model.recompute_all()
+            computation_min_factor = DocumentModel.DocumentModel.computation_min_factor
+            DocumentModel.DocumentModel.computation_min_factor = 1.0
+            try:
+                # simulate a slow computation; it should not be evaluated again until its measured duration has passed.
+                computation.last_evaluate_duration = 0.1
+                last_evaluate_data_time = computation.last_evaluate_data_time
+                evaluation_count = computation._evaluation_count_for_test
+                s.value = 4
+                s.value = 3
+                document_model.recompute_all()
+                self.assertGreaterEqual(time.perf_counter(), last_evaluate_data_time + 0.1)
+                self.assertEqual(computation._evaluation_count_for_test - evaluation_count, 1)
+                self.assertLess(computation.last_evaluate_duration, 0.1)
+            finally:
+                DocumentModel.DocumentModel.computation_min_factor = computation_min_factor
+
     def test_computation_updates_efficiently_when_variable_added_or_removed(self):
         with TestContext.create_memory_context() as test_context:
             document_model = test_context.create_document_model()